@@ -3,6 +3,7 @@ from app.api.v1.endpoints import departments_router
 from app.api.v1.endpoints.users import router as users_router
 from app.api.v1.endpoints.auth import router as auth_router
 from app.api.v1.endpoints.ward1_monthly_reports import router as ward1_reports_router
+from app.api.v1.endpoints.admin_profiles import router as admin_profiles_router
 
 api_router = APIRouter()
 
@@ -18,6 +19,9 @@ api_router.include_router(users_router)
 # Include Ward 1 monthly reports routes
 api_router.include_router(ward1_reports_router)
 
+# Include admin profiling routes
+api_router.include_router(admin_profiles_router)
+
 # Health check for API v1
 @api_router.get("/health")
 async def api_health_check():
@@ -0,0 +1,48 @@
+"""
+Admin endpoints for browsing request profiles
+"""
+from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi.responses import PlainTextResponse
+from typing import Any, Dict, List
+import logging
+
+from app.core.request_profiler import request_profiler
+from app.utils.auth_dependencies import AuthenticatedUser, require_admin
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/admin/profiles", tags=["Admin Profiling"])
+
+
+def _get_profile_or_404(profile_id: str) -> Dict[str, Any]:
+    profile = request_profiler.store.get(profile_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Profile {profile_id} not found"
+        )
+    return profile
+
+
+@router.get("/")
+async def list_profiles(current_user: AuthenticatedUser = Depends(require_admin)) -> List[Dict[str, Any]]:
+    """
+    List stored request profiles, newest first (without stacks and SQL)
+    """
+    return request_profiler.store.list()
+
+
+@router.get("/{profile_id}")
+async def get_profile(profile_id: str, current_user: AuthenticatedUser = Depends(require_admin)) -> Dict[str, Any]:
+    """
+    Get a request profile with its SQL timeline and folded stacks
+    """
+    return _get_profile_or_404(profile_id)
+
+
+@router.get("/{profile_id}/folded", response_class=PlainTextResponse)
+async def get_profile_folded_stacks(profile_id: str, current_user: AuthenticatedUser = Depends(require_admin)) -> str:
+    """
+    Get the folded stacks of a request profile (input for flamegraph.pl or speedscope)
+    """
+    return _get_profile_or_404(profile_id)["folded_stacks"]
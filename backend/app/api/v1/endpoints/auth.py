@@ -1,23 +1,29 @@
 """
 Authentication endpoints for login, logout, and token management
 """
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from datetime import timedelta
+from datetime import datetime
+from typing import Optional
 import logging
+import math
 
 from app.database.database import get_db
+from app.services.refresh_token_service import RefreshTokenService
 from app.services.user_service import UserService
 from app.utils.jwt_handler import JWTHandler
-from app.utils.auth_dependencies import get_current_user
+from app.utils.auth_dependencies import AuthenticatedUser, get_current_user
+from app.core.rate_limit import login_throttle
+from app.core.token_revocation import revocation_list
 from app.schemas.auth import (
     LoginRequest, 
     LoginResponse, 
     RefreshTokenRequest,
     RefreshTokenResponse,
+    LogoutRequest,
     LogoutResponse
 )
-from app.models.user import User
 from app.core.config import settings
 
 logger = logging.getLogger(__name__)
@@ -28,34 +34,50 @@ router = APIRouter(prefix="/auth", tags=["authentication"])
 @router.post("/login", response_model=LoginResponse)
 async def login(
     login_data: LoginRequest,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
-    Authenticate user and return JWT token
+    Authenticate user and return a JWT access token and a refresh token
     
     - **employee_id**: User's employee ID
     - **password**: User's password
+    
+    Attempts are throttled per client IP and per employee ID (429 with
+    Retry-After), before any password is checked.
     """
     try:
-        # Authenticate user
-        user = UserService.authenticate_user(
+        throttled = login_throttle.check(
+            request.client.host if request.client else None, login_data.employee_id
+        )
+        if throttled is not None:
+            retry_after, reason = throttled
+            logger.warning("Login throttled (%s) for employee ID: %s", reason, login_data.employee_id)
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many login attempts. Please try again later.",
+                headers={"Retry-After": str(max(1, math.ceil(retry_after)))}
+            )
+        
+        # Authenticate user (password hashing runs off the event loop)
+        user = await run_in_threadpool(
+            UserService.authenticate_user,
             db, 
             login_data.employee_id, 
             login_data.password
         )
         
         if not user:
-            logger.warning(f"Login failed for employee ID: {login_data.employee_id}")
+            login_throttle.record_failure(login_data.employee_id)
+            logger.warning("Login failed for employee ID: %s", login_data.employee_id)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid employee ID or password"
             )
         
-        # Create JWT token
-        token_data = JWTHandler.create_user_token_data(user)
-        access_token = JWTHandler.create_access_token(data=token_data)
+        login_throttle.record_success(login_data.employee_id)
         
-        # Prepare user data for response
+        # Prepare user data for response (before the commit below expires the loaded user)
         user_data = {
             "id": user.id,
             "employee_id": user.employee_id,
@@ -65,7 +87,12 @@ async def login(
             "department_name": user.department.name if user.department else None
         }
         
-        logger.info(f"Successful login for user: {user.name} ({user.employee_id})")
+        # Create JWT token, and a refresh token starting a new session
+        token_data = JWTHandler.create_user_token_data(user)
+        access_token = JWTHandler.create_access_token(data=token_data)
+        refresh_token = RefreshTokenService.create_token(db, user.id)
+        
+        logger.info("Successful login for user: %s (%s)", user_data["name"], user_data["employee_id"])
         
         return LoginResponse(
             success=True,
@@ -73,13 +100,15 @@ async def login(
             user=user_data,
             access_token=access_token,
             token_type="bearer",
-            expires_in=settings.access_token_expire_minutes * 60  # Convert to seconds
+            expires_in=settings.access_token_expire_minutes * 60,  # Convert to seconds
+            refresh_token=refresh_token,
+            refresh_expires_in=settings.refresh_token_expire_days * 86400
         )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Login error: {str(e)}")
+        logger.error("Login error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error during login"
@@ -92,46 +121,45 @@ async def refresh_token(
     db: Session = Depends(get_db)
 ):
     """
-    Refresh JWT token
+    Exchange a refresh token for a new access token and refresh token
     
-    - **token**: Current JWT token to refresh
+    - **refresh_token**: Refresh token from login or the previous refresh (single use)
+    
+    Reusing a refresh token ends its session: every token issued from the
+    same login is revoked.
     """
     try:
-        # Verify current token
-        payload = JWTHandler.verify_token(refresh_data.token)
-        if not payload:
-            raise HTTPException(
-                status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid or expired token"
-            )
-        
-        # Get user from database to ensure they still exist
-        user_id = payload.get("user_id")
-        user = UserService.get_user_by_id(db, user_id)
-        if not user:
+        # Rotate the refresh token; the user is re-read, so role and
+        # department changes reach the new access token's claims
+        try:
+            user, new_refresh_token = RefreshTokenService.rotate_token(db, refresh_data.refresh_token)
+        except ValueError as e:
+            logger.warning("Token refresh rejected: %s", e)
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found"
+                detail=str(e)
             )
         
         # Create new token with updated data
         token_data = JWTHandler.create_user_token_data(user)
         new_access_token = JWTHandler.create_access_token(data=token_data)
         
-        logger.info(f"Token refreshed for user: {user.name} ({user.employee_id})")
+        logger.info("Token refreshed for user: %s (%s)", user.name, user.employee_id)
         
         return RefreshTokenResponse(
             success=True,
             message="Token refreshed successfully",
             access_token=new_access_token,
             token_type="bearer",
-            expires_in=settings.access_token_expire_minutes * 60
+            expires_in=settings.access_token_expire_minutes * 60,
+            refresh_token=new_refresh_token,
+            refresh_expires_in=settings.refresh_token_expire_days * 86400
         )
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Token refresh error: {str(e)}")
+        logger.error("Token refresh error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error during token refresh"
@@ -140,16 +168,32 @@ async def refresh_token(
 
 @router.post("/logout", response_model=LogoutResponse)
 async def logout(
-    current_user: User = Depends(get_current_user)
+    logout_data: Optional[LogoutRequest] = None,
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """
-    Logout user (token blacklisting would be implemented here in production)
+    Logout user by revoking the access token until it expires
+    
+    - **refresh_token**: Optional; its session is ended too, so it cannot mint new access tokens
     """
     try:
-        # In a production system, you would blacklist the token here
-        # For now, we'll just log the logout
+        # get_current_user has verified the token; its jti and exp come with the user
+        if current_user.token_id and current_user.expires_at:
+            revocation_list.revoke(
+                db,
+                jti=current_user.token_id,
+                expires_at=datetime.utcfromtimestamp(current_user.expires_at),
+                user_id=current_user.id
+            )
+        else:
+            # Tokens issued before revocation support have no jti; they expire on their own
+            logger.warning("Token without jti for user %s cannot be revoked", current_user.employee_id)
+        
+        if logout_data is not None and logout_data.refresh_token:
+            RefreshTokenService.revoke_token(db, logout_data.refresh_token, current_user.id)
         
-        logger.info(f"User logged out: {current_user.name} ({current_user.employee_id})")
+        logger.info("User logged out: %s (%s)", current_user.name, current_user.employee_id)
         
         return LogoutResponse(
             success=True,
@@ -157,7 +201,7 @@ async def logout(
         )
         
     except Exception as e:
-        logger.error(f"Logout error: {str(e)}")
+        logger.error("Logout error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error during logout"
@@ -166,21 +210,30 @@ async def logout(
 
 @router.get("/me")
 async def get_current_user_info(
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(get_current_user)
 ):
     """
     Get current authenticated user information
     """
     try:
+        # Read the full record; the token claims only carry identity, role and department
+        user = UserService.get_user_by_id(db, current_user.id)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="User not found"
+            )
+        
         user_data = {
-            "id": current_user.id,
-            "employee_id": current_user.employee_id,
-            "name": current_user.name,
-            "role": current_user.role,
-            "department_id": current_user.department_id,
-            "department_name": current_user.department.name if current_user.department else None,
-            "created_at": current_user.created_at.isoformat() if current_user.created_at else None,
-            "updated_at": current_user.updated_at.isoformat() if current_user.updated_at else None
+            "id": user.id,
+            "employee_id": user.employee_id,
+            "name": user.name,
+            "role": user.role,
+            "department_id": user.department_id,
+            "department_name": user.department.name if user.department else None,
+            "created_at": user.created_at.isoformat() if user.created_at else None,
+            "updated_at": user.updated_at.isoformat() if user.updated_at else None
         }
         
         return {
@@ -188,8 +241,10 @@ async def get_current_user_info(
             "user": user_data
         }
         
+    except HTTPException:
+        raise
     except Exception as e:
-        logger.error(f"Get user info error: {str(e)}")
+        logger.error("Get user info error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error"
@@ -1,7 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, Depends, HTTPException, status, Query
 from sqlalchemy.orm import Session
-from app.database.database import get_db
+from app.database.database import get_db, get_read_db
 from app.services.department_service import DepartmentService
+from app.services.reference_data_service import ReferenceDataService
 from app.schemas.department import (
     DepartmentCreate, 
     DepartmentUpdate,
@@ -30,12 +31,12 @@ async def create_department(
     - **status**: Department status (default: Active)
     """
     try:
-        logger.info(f"Creating new department: {department_data.name}")
+        logger.info("Creating new department: %s", department_data.name)
         
-        # Check if department already exists
+        # Check if department already exists (exact, case-insensitive match)
         existing_department = DepartmentService.get_department_by_name(db, department_data.name)
         if existing_department:
-            logger.warning(f"Department '{department_data.name}' already exists")
+            logger.warning("Department '%s' already exists", department_data.name)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Department with name '{department_data.name}' already exists"
@@ -50,14 +51,16 @@ async def create_department(
             department=DepartmentResponse.from_orm(new_department)
         )
         
+    except HTTPException:
+        raise
     except ValueError as ve:
-        logger.error(f"Validation error: {str(ve)}")
+        logger.error("Validation error: %s", ve)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(ve)
         )
     except Exception as e:
-        logger.error(f"Unexpected error creating department: {str(e)}")
+        logger.error("Unexpected error creating department: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while creating department"
@@ -65,21 +68,16 @@ async def create_department(
 
 
 @router.get("/", response_model=DepartmentListResponse)
-async def get_all_departments(db: Session = Depends(get_db)):
+async def get_all_departments(db: Session = Depends(get_read_db)):
     """
     Get all departments
     """
     try:
         logger.info("Retrieving all departments")
-        departments = DepartmentService.get_all_departments(db)
-        
-        return DepartmentListResponse(
-            departments=[DepartmentResponse.from_orm(dept) for dept in departments],
-            total=len(departments)
-        )
+        return ReferenceDataService.get_department_list(db)
         
     except Exception as e:
-        logger.error(f"Error retrieving departments: {str(e)}")
+        logger.error("Error retrieving departments: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while retrieving departments"
@@ -87,35 +85,59 @@ async def get_all_departments(db: Session = Depends(get_db)):
 
 
 @router.get("/active", response_model=List[DepartmentResponse])
-async def get_active_departments(db: Session = Depends(get_db)):
+async def get_active_departments(db: Session = Depends(get_read_db)):
     """
     Get only active departments (for dropdowns, etc.)
     """
     try:
         logger.info("Retrieving active departments")
-        departments = DepartmentService.get_active_departments(db)
-        
-        return [DepartmentResponse.from_orm(dept) for dept in departments]
+        return ReferenceDataService.get_active_departments(db)
         
     except Exception as e:
-        logger.error(f"Error retrieving active departments: {str(e)}")
+        logger.error("Error retrieving active departments: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while retrieving active departments"
         )
 
 
+@router.get("/search/{search_term}", response_model=DepartmentListResponse)
+async def search_departments(
+    search_term: str,
+    limit: int = Query(20, ge=1, le=100, description="Maximum number of departments to return"),
+    db: Session = Depends(get_read_db)
+):
+    """
+    Fuzzy search departments by name
+    """
+    try:
+        logger.info("Searching departments with term: %s", search_term)
+        departments = DepartmentService.search_departments(db, search_term, limit)
+        
+        return DepartmentListResponse(
+            departments=[DepartmentResponse.from_orm(dept) for dept in departments],
+            total=len(departments)
+        )
+        
+    except Exception as e:
+        logger.error("Error searching departments: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error while searching departments"
+        )
+
+
 @router.get("/{department_id}", response_model=DepartmentResponse)
-async def get_department(department_id: int, db: Session = Depends(get_db)):
+async def get_department(department_id: int, db: Session = Depends(get_read_db)):
     """
     Get department by ID
     """
     try:
-        logger.info(f"Retrieving department with ID: {department_id}")
+        logger.info("Retrieving department with ID: %s", department_id)
         department = DepartmentService.get_department_by_id(db, department_id)
         
         if not department:
-            logger.warning(f"Department with ID {department_id} not found")
+            logger.warning("Department with ID %s not found", department_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Department with ID {department_id} not found"
@@ -126,7 +148,7 @@ async def get_department(department_id: int, db: Session = Depends(get_db)):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving department {department_id}: {str(e)}")
+        logger.error("Error retrieving department %s: %s", department_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while retrieving department"
@@ -143,12 +165,12 @@ async def update_department(
     Update department
     """
     try:
-        logger.info(f"Updating department with ID: {department_id}")
+        logger.info("Updating department with ID: %s", department_id)
         
         updated_department = DepartmentService.update_department(db, department_id, department_data)
         
         if not updated_department:
-            logger.warning(f"Department with ID {department_id} not found for update")
+            logger.warning("Department with ID %s not found for update", department_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Department with ID {department_id} not found"
@@ -157,7 +179,7 @@ async def update_department(
         return DepartmentResponse.from_orm(updated_department)
         
     except ValueError as ve:
-        logger.error(f"Validation error: {str(ve)}")
+        logger.error("Validation error: %s", ve)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(ve)
@@ -165,7 +187,7 @@ async def update_department(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating department {department_id}: {str(e)}")
+        logger.error("Error updating department %s: %s", department_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while updating department"
@@ -178,12 +200,12 @@ async def delete_department(department_id: int, db: Session = Depends(get_db)):
     Delete department
     """
     try:
-        logger.info(f"Deleting department with ID: {department_id}")
+        logger.info("Deleting department with ID: %s", department_id)
         
         success = DepartmentService.delete_department(db, department_id)
         
         if not success:
-            logger.warning(f"Department with ID {department_id} not found for deletion")
+            logger.warning("Department with ID %s not found for deletion", department_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"Department with ID {department_id} not found"
@@ -194,7 +216,7 @@ async def delete_department(department_id: int, db: Session = Depends(get_db)):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error deleting department {department_id}: {str(e)}")
+        logger.error("Error deleting department %s: %s", department_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while deleting department"
@@ -1,22 +1,22 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from app.database.database import get_db
-from app.services.user_service import UserService
+from app.database.database import get_db, get_read_db
+from app.services.user_service import BulkCreateConflictError, UserService
 from app.schemas.user import (
     UserCreate, 
     UserUpdate,
     UserPasswordUpdate,
     UserResponse, 
     UserListResponse,
-    CreateUserResponse
+    CreateUserResponse,
+    BulkUserCreate,
+    BulkCreateUsersResponse
 )
 from app.utils.auth_dependencies import (
-    get_current_user, 
-    require_admin, 
-    require_roles,
-    require_management
+    AuthenticatedUser,
+    require_permission
 )
-from app.models.user import User
 from typing import List, Optional
 import logging
 
@@ -29,7 +29,7 @@ router = APIRouter(prefix="/users", tags=["users"])
 async def create_user(
     user_data: UserCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(require_admin)
+    current_user: AuthenticatedUser = Depends(require_permission("user.create"))
 ):
     """
     Create a new system user - ONLY frontend fields
@@ -41,12 +41,12 @@ async def create_user(
     - **department_id**: ID of the department user belongs to
     """
     try:
-        logger.info(f"Creating new user: {user_data.name} ({user_data.employee_id})")
+        logger.info("Creating new user: %s (%s)", user_data.name, user_data.employee_id)
         
         # Check if employee ID already exists
         existing_user = UserService.get_user_by_employee_id(db, user_data.employee_id)
         if existing_user:
-            logger.warning(f"Employee ID '{user_data.employee_id}' already exists")
+            logger.warning("Employee ID '%s' already exists", user_data.employee_id)
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
                 detail=f"Employee ID '{user_data.employee_id}' already exists"
@@ -68,25 +68,69 @@ async def create_user(
         )
         
     except ValueError as ve:
-        logger.error(f"Validation error: {str(ve)}")
+        logger.error("Validation error: %s", ve)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(ve)
         )
     except Exception as e:
-        logger.error(f"Error creating user: {str(e)}")
+        logger.error("Error creating user: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while creating user"
         )
 
 
+@router.post("/bulk", response_model=BulkCreateUsersResponse)
+async def bulk_create_users(
+    bulk_data: BulkUserCreate,
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(require_permission("user.create"))
+):
+    """
+    Create many users at once (e.g. onboarding a department)
+
+    - **users**: List of users with the same fields as POST /users/ (up to 500)
+
+    Each row is validated and reported on separately; valid rows are created
+    even when others are rejected.
+    """
+    try:
+        logger.info("Bulk creating %s users", len(bulk_data.users))
+
+        # Hashing hundreds of passwords takes seconds; keep the event loop free
+        results = await run_in_threadpool(UserService.bulk_create_users, db, bulk_data.users)
+
+        created = sum(1 for result in results if result["success"])
+        failed = len(results) - created
+        return BulkCreateUsersResponse(
+            success=failed == 0,
+            message=f"{created} users created, {failed} rejected",
+            created=created,
+            failed=failed,
+            results=results
+        )
+
+    except BulkCreateConflictError as ce:
+        logger.error("Bulk create conflict: %s", ce)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=str(ce)
+        )
+    except Exception as e:
+        logger.error("Error bulk creating users: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Internal server error while creating users"
+        )
+
+
 @router.get("/", response_model=UserListResponse)
 async def get_all_users(
     skip: int = Query(0, ge=0, description="Number of users to skip"),
     limit: int = Query(50, ge=1, le=100, description="Maximum number of users to return"),
-    db: Session = Depends(get_db),
-    current_user: User = Depends(require_management)
+    db: Session = Depends(get_read_db),
+    current_user: AuthenticatedUser = Depends(require_permission("user.read"))
 ):
     """
     Get all system users with pagination - simplified
@@ -95,14 +139,14 @@ async def get_all_users(
     - **limit**: Maximum number of users to return (1-100)
     """
     try:
-        logger.info(f"Retrieving users: skip={skip}, limit={limit}")
+        logger.info("Retrieving users: skip=%s, limit=%s", skip, limit)
         
         # Test database connection first
         try:
             users = UserService.get_all_users(db, skip=skip, limit=limit)
-            logger.info(f"Successfully retrieved {len(users)} users from database")
+            logger.info("Successfully retrieved %s users from database", len(users))
         except Exception as db_error:
-            logger.error(f"Database error retrieving users: {str(db_error)}")
+            logger.error("Database error retrieving users: %s", db_error)
             raise HTTPException(
                 status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
                 detail=f"Database error: {str(db_error)}"
@@ -125,17 +169,17 @@ async def get_all_users(
                 )
                 user_responses.append(user_response)
             except Exception as user_error:
-                logger.error(f"Error processing user {user.id}: {user_error}")
+                logger.error("Error processing user %s: %s", user.id, user_error)
                 continue
         
         # Get total count for pagination
         try:
             total = len(UserService.get_all_users(db, skip=0, limit=10000))
         except Exception as count_error:
-            logger.warning(f"Error getting total count: {count_error}")
+            logger.warning("Error getting total count: %s", count_error)
             total = len(user_responses)  # Fallback to current count
         
-        logger.info(f"Successfully processed {len(user_responses)} user responses")
+        logger.info("Successfully processed %s user responses", len(user_responses))
         
         return UserListResponse(
             users=user_responses,
@@ -147,7 +191,7 @@ async def get_all_users(
     except HTTPException:
         raise  # Re-raise HTTP exceptions as-is
     except Exception as e:
-        logger.error(f"Unexpected error retrieving users: {str(e)}", exc_info=True)
+        logger.error("Unexpected error retrieving users: %s", e, exc_info=True)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Internal server error while retrieving users: {str(e)}"
@@ -156,16 +200,16 @@ async def get_all_users(
 
 
 @router.get("/{user_id}", response_model=UserResponse)
-async def get_user(user_id: int, db: Session = Depends(get_db)):
+async def get_user(user_id: int, db: Session = Depends(get_read_db)):
     """
     Get user by ID
     """
     try:
-        logger.info(f"Retrieving user with ID: {user_id}")
+        logger.info("Retrieving user with ID: %s", user_id)
         user = UserService.get_user_by_id(db, user_id)
         
         if not user:
-            logger.warning(f"User with ID {user_id} not found")
+            logger.warning("User with ID %s not found", user_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"User with ID {user_id} not found"
@@ -179,7 +223,7 @@ async def get_user(user_id: int, db: Session = Depends(get_db)):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving user {user_id}: {str(e)}")
+        logger.error("Error retrieving user %s: %s", user_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while retrieving user"
@@ -187,16 +231,16 @@ async def get_user(user_id: int, db: Session = Depends(get_db)):
 
 
 @router.get("/employee/{employee_id}", response_model=UserResponse)
-async def get_user_by_employee_id(employee_id: str, db: Session = Depends(get_db)):
+async def get_user_by_employee_id(employee_id: str, db: Session = Depends(get_read_db)):
     """
     Get user by employee ID
     """
     try:
-        logger.info(f"Retrieving user with employee ID: {employee_id}")
+        logger.info("Retrieving user with employee ID: %s", employee_id)
         user = UserService.get_user_by_employee_id(db, employee_id)
         
         if not user:
-            logger.warning(f"User with employee ID {employee_id} not found")
+            logger.warning("User with employee ID %s not found", employee_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"User with employee ID {employee_id} not found"
@@ -210,7 +254,7 @@ async def get_user_by_employee_id(employee_id: str, db: Session = Depends(get_db
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving user by employee ID {employee_id}: {str(e)}")
+        logger.error("Error retrieving user by employee ID %s: %s", employee_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while retrieving user"
@@ -227,12 +271,12 @@ async def update_user(
     Update user information
     """
     try:
-        logger.info(f"Updating user with ID: {user_id}")
+        logger.info("Updating user with ID: %s", user_id)
         
         updated_user = UserService.update_user(db, user_id, user_data)
         
         if not updated_user:
-            logger.warning(f"User with ID {user_id} not found for update")
+            logger.warning("User with ID %s not found for update", user_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"User with ID {user_id} not found"
@@ -244,7 +288,7 @@ async def update_user(
         return user_response
         
     except ValueError as ve:
-        logger.error(f"Validation error: {str(ve)}")
+        logger.error("Validation error: %s", ve)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(ve)
@@ -252,7 +296,7 @@ async def update_user(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error updating user {user_id}: {str(e)}")
+        logger.error("Error updating user %s: %s", user_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while updating user"
@@ -269,12 +313,12 @@ async def update_password(
     Update user password
     """
     try:
-        logger.info(f"Updating password for user ID: {user_id}")
+        logger.info("Updating password for user ID: %s", user_id)
         
         success = UserService.update_password(db, user_id, password_data)
         
         if not success:
-            logger.warning(f"User with ID {user_id} not found for password update")
+            logger.warning("User with ID %s not found for password update", user_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"User with ID {user_id} not found"
@@ -283,13 +327,13 @@ async def update_password(
         return {"success": True, "message": "Password updated successfully"}
         
     except ValueError as ve:
-        logger.error(f"Password update error: {str(ve)}")
+        logger.error("Password update error: %s", ve)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(ve)
         )
     except Exception as e:
-        logger.error(f"Error updating password for user {user_id}: {str(e)}")
+        logger.error("Error updating password for user %s: %s", user_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while updating password"
@@ -302,12 +346,12 @@ async def delete_user(user_id: int, db: Session = Depends(get_db)):
     Deactivate user (soft delete)
     """
     try:
-        logger.info(f"Deactivating user with ID: {user_id}")
+        logger.info("Deactivating user with ID: %s", user_id)
         
         success = UserService.delete_user(db, user_id)
         
         if not success:
-            logger.warning(f"User with ID {user_id} not found for deactivation")
+            logger.warning("User with ID %s not found for deactivation", user_id)
             raise HTTPException(
                 status_code=status.HTTP_404_NOT_FOUND,
                 detail=f"User with ID {user_id} not found"
@@ -318,7 +362,7 @@ async def delete_user(user_id: int, db: Session = Depends(get_db)):
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error deactivating user {user_id}: {str(e)}")
+        logger.error("Error deactivating user %s: %s", user_id, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while deactivating user"
@@ -329,13 +373,13 @@ async def delete_user(user_id: int, db: Session = Depends(get_db)):
 async def search_users(
     search_term: str,
     limit: int = Query(50, ge=1, le=100, description="Maximum number of users to return"),
-    db: Session = Depends(get_db)
+    db: Session = Depends(get_read_db)
 ):
     """
     Search users by name or employee ID
     """
     try:
-        logger.info(f"Searching users with term: {search_term}")
+        logger.info("Searching users with term: %s", search_term)
         
         users = UserService.search_users(db, search_term, limit)
         
@@ -353,7 +397,7 @@ async def search_users(
         )
         
     except Exception as e:
-        logger.error(f"Error searching users: {str(e)}")
+        logger.error("Error searching users: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while searching users"
@@ -361,12 +405,16 @@ async def search_users(
 
 
 @router.get("/department/{department_id}", response_model=UserListResponse)
-async def get_users_by_department(department_id: int, db: Session = Depends(get_db)):
+async def get_users_by_department(
+    department_id: int,
+    db: Session = Depends(get_read_db),
+    current_user: AuthenticatedUser = Depends(require_permission("user.read", department_param="department_id"))
+):
     """
-    Get all users in a specific department
+    Get all users in a specific department (staff may list their own department)
     """
     try:
-        logger.info(f"Retrieving users for department ID: {department_id}")
+        logger.info("Retrieving users for department ID: %s", department_id)
         
         users = UserService.get_users_by_department(db, department_id)
         
@@ -384,7 +432,7 @@ async def get_users_by_department(department_id: int, db: Session = Depends(get_
         )
         
     except Exception as e:
-        logger.error(f"Error retrieving users by department: {str(e)}")
+        logger.error("Error retrieving users by department: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while retrieving users by department"
@@ -392,12 +440,12 @@ async def get_users_by_department(department_id: int, db: Session = Depends(get_
 
 
 @router.get("/role/{role}", response_model=UserListResponse)
-async def get_users_by_role(role: str, db: Session = Depends(get_db)):
+async def get_users_by_role(role: str, db: Session = Depends(get_read_db)):
     """
     Get all users with a specific role
     """
     try:
-        logger.info(f"Retrieving users with role: {role}")
+        logger.info("Retrieving users with role: %s", role)
         
         users = UserService.get_users_by_role(db, role)
         
@@ -415,7 +463,7 @@ async def get_users_by_role(role: str, db: Session = Depends(get_db)):
         )
         
     except Exception as e:
-        logger.error(f"Error retrieving users by role: {str(e)}")
+        logger.error("Error retrieving users by role: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Internal server error while retrieving users by role"
@@ -1,18 +1,21 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import List, Optional
 
-from app.database.database import get_db
-from app.services.ward1_monthly_report_service import Ward1MonthlyReportService
+from app.database.database import get_db, get_read_db
+from app.services.ward1_monthly_report_service import BatchSaveError, Ward1MonthlyReportService
+from app.services.reference_data_service import ReferenceDataService
 from app.schemas.ward1_monthly_report import (
     Ward1MonthlyReportCreate,
     Ward1MonthlyReportUpdate,
     Ward1MonthlyReportResponse,
     Ward1MonthlyReportSubmit,
+    Ward1MonthlyReportBatch,
+    Ward1BatchSaveResponse,
     MessageResponse
 )
-from app.utils.auth_dependencies import get_current_user
-from app.models.user import User
+from app.utils.auth_dependencies import AuthenticatedUser, require_permission
 import logging
 
 logger = logging.getLogger(__name__)
@@ -24,7 +27,7 @@ router = APIRouter(prefix="/ward1", tags=["Ward 1 Monthly Reports"])
 async def create_or_update_monthly_report(
     report_data: Ward1MonthlyReportCreate,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(require_permission("ward_report.create"))
 ):
     """
     Create new monthly report or update existing one for Ward 1
@@ -54,25 +57,72 @@ async def create_or_update_monthly_report(
         )
         
     except ValueError as e:
-        logger.warning(f"Validation error: {str(e)}")
+        logger.warning("Validation error: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Error saving Ward1 monthly report: {str(e)}")
+        logger.error("Error saving Ward1 monthly report: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to save monthly report. Please try again."
         )
 
 
+@router.post("/monthly-reports/batch", response_model=Ward1BatchSaveResponse)
+async def save_monthly_reports_batch(
+    batch_data: Ward1MonthlyReportBatch,
+    db: Session = Depends(get_db),
+    current_user: AuthenticatedUser = Depends(require_permission("ward_report.create"))
+):
+    """
+    Create or update several monthly reports for Ward 1 in one transaction
+
+    - **reports**: List of reports with the same fields as POST /monthly-report (up to 24)
+
+    Each month is validated and reported on separately; valid months are
+    saved even when others are rejected.
+    """
+    try:
+        # One transaction over up to 24 months; keep the event loop free
+        results = await run_in_threadpool(
+            Ward1MonthlyReportService.upsert_reports,
+            db=db,
+            rows=batch_data.reports,
+            user_id=current_user.id
+        )
+
+        saved = sum(1 for result in results if result["success"])
+        failed = len(results) - saved
+        return Ward1BatchSaveResponse(
+            success=failed == 0,
+            message=f"{saved} Ward 1 monthly reports saved, {failed} rejected",
+            saved=saved,
+            failed=failed,
+            results=results
+        )
+
+    except BatchSaveError as e:
+        logger.warning("Batch save rejected by the database: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        logger.error("Error saving Ward1 monthly reports batch: %s", e)
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail="Failed to save monthly reports. Please try again."
+        )
+
+
 @router.get("/monthly-report/{year}/{month}", response_model=Ward1MonthlyReportResponse)
 async def get_monthly_report(
     year: int,
     month: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: AuthenticatedUser = Depends(require_permission("ward_report.read"))
 ):
     """
     Get monthly report for specific year and month
@@ -105,7 +155,7 @@ async def get_monthly_report(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving Ward1 monthly report: {str(e)}")
+        logger.error("Error retrieving Ward1 monthly report: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to retrieve monthly report"
@@ -115,8 +165,8 @@ async def get_monthly_report(
 @router.get("/monthly-reports/{year}", response_model=List[Ward1MonthlyReportResponse])
 async def get_monthly_reports_by_year(
     year: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: AuthenticatedUser = Depends(require_permission("ward_report.read"))
 ):
     """
     Get all monthly reports for a specific year
@@ -128,14 +178,12 @@ async def get_monthly_reports_by_year(
                 detail="Year must be between 2020 and 2030"
             )
         
-        reports = Ward1MonthlyReportService.get_reports_by_year(db, year)
-        
-        return [Ward1MonthlyReportResponse.from_orm(report) for report in reports]
+        return ReferenceDataService.get_ward1_reports_by_year(db, year)
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving Ward1 monthly reports for {year}: {str(e)}")
+        logger.error("Error retrieving Ward1 monthly reports for %s: %s", year, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve monthly reports for {year}"
@@ -146,7 +194,7 @@ async def get_monthly_reports_by_year(
 async def submit_monthly_report(
     submit_data: Ward1MonthlyReportSubmit,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(require_permission("ward_report.submit"))
 ):
     """
     Submit monthly report for approval
@@ -172,13 +220,13 @@ async def submit_monthly_report(
         )
         
     except ValueError as e:
-        logger.warning(f"Validation error submitting report: {str(e)}")
+        logger.warning("Validation error submitting report: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Error submitting Ward1 monthly report: {str(e)}")
+        logger.error("Error submitting Ward1 monthly report: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to submit monthly report for approval"
@@ -190,19 +238,12 @@ async def approve_monthly_report(
     year: int,
     month: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(require_permission("ward_report.approve"))
 ):
     """
-    Approve a submitted monthly report (Admin/Supervisor only)
+    Approve a submitted monthly report (requires ward_report.approve)
     """
     try:
-        # Check if user has approval permissions (add role check if needed)
-        if current_user.role not in ["admin", "supervisor"]:
-            raise HTTPException(
-                status_code=status.HTTP_403_FORBIDDEN,
-                detail="Only administrators and supervisors can approve reports"
-            )
-        
         # Approve the report
         approved_report = Ward1MonthlyReportService.approve_report(
             db=db,
@@ -224,7 +265,7 @@ async def approve_monthly_report(
         )
         
     except ValueError as e:
-        logger.warning(f"Validation error approving report: {str(e)}")
+        logger.warning("Validation error approving report: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
@@ -232,7 +273,7 @@ async def approve_monthly_report(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error approving Ward1 monthly report: {str(e)}")
+        logger.error("Error approving Ward1 monthly report: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to approve monthly report"
@@ -244,7 +285,7 @@ async def delete_monthly_report(
     year: int,
     month: int,
     db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    current_user: AuthenticatedUser = Depends(require_permission("ward_report.delete"))
 ):
     """
     Delete a draft monthly report
@@ -270,13 +311,13 @@ async def delete_monthly_report(
         )
         
     except ValueError as e:
-        logger.warning(f"Validation error deleting report: {str(e)}")
+        logger.warning("Validation error deleting report: %s", e)
         raise HTTPException(
             status_code=status.HTTP_400_BAD_REQUEST,
             detail=str(e)
         )
     except Exception as e:
-        logger.error(f"Error deleting Ward1 monthly report: {str(e)}")
+        logger.error("Error deleting Ward1 monthly report: %s", e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail="Failed to delete monthly report"
@@ -286,8 +327,8 @@ async def delete_monthly_report(
 @router.get("/statistics/{year}")
 async def get_ward1_statistics(
     year: int,
-    db: Session = Depends(get_db),
-    current_user: User = Depends(get_current_user)
+    db: Session = Depends(get_read_db),
+    current_user: AuthenticatedUser = Depends(require_permission("ward_report.read"))
 ):
     """
     Get statistics for Ward 1 reports in a given year
@@ -310,7 +351,7 @@ async def get_ward1_statistics(
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error retrieving Ward1 statistics for {year}: {str(e)}")
+        logger.error("Error retrieving Ward1 statistics for %s: %s", year, e)
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to retrieve statistics for {year}"
@@ -0,0 +1,116 @@
+"""
+In-process caches for reference data
+
+Caches hold response models (never ORM objects, which are bound to the
+session that loaded them). Services clear the relevant cache whenever they
+write, so a worker always sees its own writes. Every worker has its own
+caches, so the TTL bounds how long another worker's write can go unseen.
+
+With read replicas, a load right after a write may read a replica that has
+not applied it yet. Clearing an entry therefore also stops it from being
+cached again for REPLICA_MAX_LAG_SECONDS, so a stale load is served once
+rather than cached for the whole TTL.
+
+get_or_load runs its loader outside the lock; a load that overlaps an
+invalidate() or clear() of its key is returned but not cached, since it may
+have read the data from before the write.
+"""
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from app.core.config import settings
+
+_MISSING = object()
+
+
+def _refill_hold_seconds() -> float:
+    """How long a cleared entry must not be refilled (replicas may still serve the old data)"""
+    return settings.replica_max_lag_seconds if settings.database_replica_urls else 0.0
+
+
+class TTLCache:
+    """Thread-safe key/value cache whose entries expire after ttl seconds"""
+
+    def __init__(self, name: str, ttl: float):
+        self.name = name
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._held: Dict[Hashable, float] = {}  # key -> monotonic time until which set() is skipped
+        self._all_held_until = 0.0
+        # Bumped by clear() and per key by invalidate(), so get_or_load can tell
+        # whether its key was invalidated while the loader ran
+        self._clears = 0
+        self._invalidations: Dict[Hashable, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self.hits += 1
+                return entry[1]
+            self._entries.pop(key, None)
+            self.misses += 1
+            return default
+
+    def _generation(self, key: Hashable) -> Tuple[int, int]:
+        return self._clears, self._invalidations.get(key, 0)
+
+    def set(self, key: Hashable, value: Any, generation: Optional[Tuple[int, int]] = None):
+        """Cache value; with a generation, only if key has not been invalidated since it was taken"""
+        if not settings.cache_enabled:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if now < self._all_held_until or now < self._held.get(key, 0.0):
+                return
+            if generation is not None and generation != self._generation(key):
+                return
+            self._entries[key] = (now + self.ttl, value)
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """Cached value for key, calling loader (outside the lock) on a miss"""
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            with self._lock:
+                generation = self._generation(key)
+            value = loader()
+            self.set(key, value, generation)
+        return value
+
+    def invalidate(self, key: Hashable):
+        hold = _refill_hold_seconds()
+        with self._lock:
+            self._entries.pop(key, None)
+            self._invalidations[key] = self._invalidations.get(key, 0) + 1
+            if hold:
+                self._held[key] = time.monotonic() + hold
+
+    def clear(self):
+        hold = _refill_hold_seconds()
+        with self._lock:
+            self._entries.clear()
+            # The new clear count supersedes every per-key count
+            self._clears += 1
+            self._invalidations.clear()
+            if hold:
+                self._held.clear()
+                self._all_held_until = time.monotonic() + hold
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "ttl": self.ttl}
+
+
+# Department lists, keyed by "all" and "active"
+department_cache = TTLCache("departments", settings.cache_ttl_seconds)
+
+# Ward report lists, keyed by (ward, year)
+report_cache = TTLCache("reports", settings.cache_ttl_seconds)
+
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {cache.name: cache.stats() for cache in (department_cache, report_cache)}
@@ -3,7 +3,7 @@ try:
 except ImportError:
     from pydantic import BaseSettings
 from pydantic import field_validator
-from typing import List, Union
+from typing import List, Optional, Union
 import os
 
 
@@ -15,11 +15,44 @@ class Settings(BaseSettings):
     db_user: str
     db_password: str = ""
     db_name: str
+    db_pool_size: int = 5  # Connections each worker keeps open (and opens during warm-up)
+    db_max_overflow: int = 10  # Extra connections allowed under burst load
+    orm_strict_loading: Optional[bool] = None  # Unplanned lazy relationship loads raise (unset = on in development)
+
+    # Read replicas for GET endpoints; see app/database/routing.py
+    database_replica_urls: str = ""  # Comma-separated replica URLs (empty = everything on the primary)
+    replica_max_lag_seconds: float = 2.0  # Replicas further behind are skipped until they catch up
+    replica_lag_check_seconds: float = 2.0  # How often each worker measures replica lag
+    replica_sticky_seconds: float = 5.0  # A user's reads stay on the primary this long after their write
 
     # Application
     secret_key: str
     algorithm: str = "HS256"
-    access_token_expire_minutes: int = 30
+    access_token_expire_minutes: int = 15  # Role/department changes reach the claims within this
+    refresh_token_expire_days: int = 14  # Idle sessions log out after this
+
+    # RS256 signing key ring; see app/core/jwt_keys.py and scripts/rotate_jwt_keys.py
+    jwt_keys_dir: str = ""  # Empty = sign with SECRET_KEY (HS256)
+    jwt_keys_reload_seconds: float = 30.0  # How often workers check the ring for rotations
+    jwt_accept_hs256: bool = True  # Still accept SECRET_KEY tokens next to the ring (switch-over)
+    jwt_verify_cache_size: int = 10000  # Verified tokens remembered per worker
+
+    # Login throttling; see app/core/rate_limit.py
+    login_rate_limit_enabled: bool = True
+    login_ip_per_minute: float = 20.0  # Sustained attempts per client IP (see SERVER_FORWARDED_ALLOW_IPS)
+    login_ip_burst: int = 10  # Attempts a client IP may make back to back
+    login_account_per_minute: float = 5.0  # Sustained attempts per employee ID
+    login_account_burst: int = 5
+    login_backoff_after_failures: int = 5  # Consecutive failed passwords before an account is locked
+    login_backoff_base_seconds: float = 1.0  # First lockout; doubles with every further failure
+    login_backoff_max_seconds: float = 900.0
+    rate_limit_redis_url: str = ""  # Share limits across workers (needs the redis package); empty = per worker
+
+    # Token revocation (logout); see app/core/token_revocation.py
+    revocation_sync_seconds: float = 5.0  # How soon other workers see a logout
+    revocation_compact_seconds: float = 300.0  # How often expired revocations are dropped
+    revocation_bloom_capacity: int = 100000  # Revocations the Bloom filter is sized for (it grows past this)
+    revocation_bloom_error_rate: float = 0.001  # Fraction of live tokens that fall through to the exact check
 
     # Environment
     environment: str = "development"
@@ -27,10 +60,71 @@ class Settings(BaseSettings):
 
     # Startup Configuration
     create_default_admin: bool = True  # Set to False to disable auto admin creation
+    fast_start: bool = False  # Skip bootstrap steps when the schema revision is current
+    auto_migrate: bool = True  # Run pending Alembic migrations on startup
+
+    # Password hashing; see app/utils/password_hashing.py
+    password_hash_scheme: str = "bcrypt"  # bcrypt or argon2id (needs argon2-cffi); existing hashes of either verify
+    password_hash_target_ms: float = 250.0  # Calibrated costs aim for this much CPU per hash
+    bcrypt_rounds: int = 0  # Fixed bcrypt cost (0 = calibrate at startup)
+    argon2_time_cost: int = 0  # Fixed argon2id passes (0 = calibrate at startup)
+    argon2_memory_kib: int = 65536
+    argon2_parallelism: int = 1
+    password_hash_workers: int = 0  # Processes hashing passwords for bulk user creation (0 = one per CPU)
+
+    # Reference data caches (per worker; writes clear the worker's own cache)
+    cache_enabled: bool = True
+    cache_ttl_seconds: float = 30.0  # Bounds how long another worker's write can go unseen
+
+    # Production server (serve.py and gunicorn.conf.py)
+    server_host: str = "0.0.0.0"
+    server_port: int = 8000
+    server_workers: int = 0  # 0 = one worker per available CPU
+    server_keepalive: int = 5  # Seconds an idle keep-alive connection is held open
+    server_backlog: int = 2048  # Connections queued by the listening socket
+    server_timeout: int = 60  # Workers silent for longer are killed and replaced
+    server_graceful_timeout: int = 30  # Seconds a worker gets to finish in-flight requests on restart
+    server_max_requests: int = 0  # Recycle a worker after this many requests (0 = never)
+    server_max_requests_jitter: int = 0  # Random extra requests, so workers do not recycle together
+    server_pidfile: str = ""  # Master pid, for sending reload signals
+    # Proxies whose X-Forwarded-For is trusted for the client address ("*" = any peer).
+    # Login throttling keys on that address, so behind a proxy it must list the proxy.
+    server_forwarded_allow_ips: str = "127.0.0.1"
+
+    # Logging (queued, written by a background thread)
+    log_level: str = "INFO"
+    log_format: str = "json"  # "json" or "text"
+    log_queue_size: int = 10000  # Records beyond this are dropped and counted
+    log_sampling: str = ""  # e.g. "app.services=0.1,app.api=0.25" keeps that fraction of INFO lines
+
+    # Request profiling (admins trigger it with the X-Profile header)
+    profiling_sample_rate: float = 0.0  # Fraction of all requests to profile
+    profiling_interval_ms: float = 5.0  # Stack sampling interval
+    profiling_dir: str = "profiles"  # On-disk ring buffer location
+    profiling_max_profiles: int = 50  # Oldest profiles are deleted beyond this
+
+    # Tracing (OTLP/JSON spans for routes, dependencies, services, SQL and bcrypt)
+    tracing_enabled: bool = False
+    tracing_sample_rate: float = 1.0  # Fraction of new traces to record
+    tracing_exporter: str = "file"  # "file" or "otlp"
+    tracing_file: str = "traces/spans.jsonl"
+    tracing_otlp_endpoint: str = "http://localhost:4318/v1/traces"
+    tracing_service_name: str = "hospital-management-api"
+
+    # Request correlation (request ID in SQL comments, slow logs and metrics exemplars)
+    sql_comments_enabled: bool = True  # Append sqlcommenter-style /*request_id='..'*/ comments to SQL
+    slow_query_ms: float = 200.0  # Log SQL statements slower than this
+    slow_request_ms: float = 1000.0  # Log requests slower than this
+    metrics_enabled: bool = True  # Serve OpenMetrics text at /metrics
 
     # CORS - Handle both JSON list and comma-separated string
     allowed_origins: str = "http://localhost:3000,http://localhost:5173"
 
+    @property
+    def get_replica_urls(self) -> List[str]:
+        """Parse replica URLs from the comma-separated string"""
+        return [url.strip() for url in self.database_replica_urls.split(",") if url.strip()]
+
     @property
     def get_allowed_origins(self) -> List[str]:
         """Parse CORS origins from string to list"""
@@ -0,0 +1,136 @@
+"""
+RS256 signing key ring for access tokens
+
+The ring is a directory holding one PEM private key per key ID (kid) and a
+keyring.json manifest naming the active signing key:
+
+    {"active": "<kid>", "keys": [{"kid": "<kid>", "created": "...", "retired": null}]}
+
+Tokens are signed with the active key and carry its kid in the header;
+verification picks the public key by kid, so every key still in the ring
+verifies. Rotation (scripts/rotate_jwt_keys.py) adds a key, activates it,
+and prunes the old one only after its last tokens have expired. The public
+keys are published at /.well-known/jwks.json for services that verify
+tokens without sharing a secret.
+
+Workers notice manifest changes by its modification time, checked every
+JWT_KEYS_RELOAD_SECONDS and whenever a token names an unknown kid.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from jose import jwk
+from jose.backends.base import Key
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+ALGORITHM = "RS256"
+MANIFEST_NAME = "keyring.json"
+
+
+class KeyRing:
+    """Signing and verification keys loaded from a key ring directory"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, MANIFEST_NAME)
+        self._lock = threading.Lock()
+        self._active: Optional[Tuple[str, Key]] = None
+        self._public: Dict[str, Key] = {}
+        self._jwks: Dict[str, List[Dict[str, Any]]] = {"keys": []}
+        self._mtime: Optional[float] = None
+        self._checked = 0.0
+        self.generation = 0  # Bumped by every load, so caches of verified tokens can tell
+        self.load()
+
+    def load(self):
+        """(Re)read the manifest and keys; the previous keys stay in use if this fails"""
+        mtime = os.stat(self.manifest_path).st_mtime
+        with open(self.manifest_path, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+        active_kid = manifest.get("active")
+        active = None
+        public: Dict[str, Key] = {}
+        jwks = []
+        for entry in manifest.get("keys", []):
+            kid = entry["kid"]
+            with open(os.path.join(self.directory, f"{kid}.pem"), encoding="utf-8") as f:
+                private_key = jwk.construct(f.read(), ALGORITHM)
+            public_key = private_key.public_key()
+            public[kid] = public_key
+            jwks.append({**public_key.to_dict(), "kid": kid, "use": "sig"})
+            if kid == active_kid:
+                active = (kid, private_key)
+
+        if active is None:
+            raise ValueError(f"Active key {active_kid!r} is not in {self.manifest_path}")
+
+        with self._lock:
+            self._active = active
+            self._public = public
+            self._jwks = {"keys": jwks}
+            self._mtime = mtime
+            self._checked = time.monotonic()
+            self.generation += 1
+        logger.info("Loaded JWT key ring: %s keys, active kid %s", len(public), active[0])
+
+    def _reload_if_changed(self, force: bool = False):
+        now = time.monotonic()
+        if not force and now - self._checked < settings.jwt_keys_reload_seconds:
+            return
+        self._checked = now
+        try:
+            if os.stat(self.manifest_path).st_mtime != self._mtime:
+                self.load()
+        except Exception as e:
+            logger.error("Failed to reload JWT key ring from %s: %s", self.directory, e)
+
+    def current_generation(self) -> int:
+        """Generation of the keys in use, after picking up any rotation due for a check"""
+        self._reload_if_changed()
+        return self.generation
+
+    def signing_key(self) -> Tuple[str, Key]:
+        """(kid, private key) of the active key"""
+        self._reload_if_changed()
+        return self._active
+
+    def verification_key(self, kid: Optional[str]) -> Optional[Key]:
+        """Public key for a kid, or None if the ring does not hold it"""
+        if not kid:
+            return None
+        self._reload_if_changed()
+        key = self._public.get(kid)
+        if key is None:
+            # Possibly added by a rotation since the last check
+            self._reload_if_changed(force=True)
+            key = self._public.get(kid)
+        return key
+
+    def jwks(self) -> Dict[str, List[Dict[str, Any]]]:
+        """Public keys as a JWK Set"""
+        self._reload_if_changed()
+        return self._jwks
+
+
+_key_ring: Optional[KeyRing] = None
+_key_ring_lock = threading.Lock()
+
+
+def get_key_ring() -> Optional[KeyRing]:
+    """The configured key ring, or None when tokens are signed with SECRET_KEY (HS256)"""
+    global _key_ring
+    if not settings.jwt_keys_dir:
+        return None
+    if _key_ring is None:
+        with _key_ring_lock:
+            if _key_ring is None:
+                _key_ring = KeyRing(settings.jwt_keys_dir)
+    return _key_ring
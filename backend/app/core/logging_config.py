@@ -0,0 +1,205 @@
+"""
+Logging pipeline for the Hospital Management System API
+
+Application code logs through a QueueHandler, so a log call only builds a
+record and puts it on a bounded in-memory queue. A QueueListener thread
+formats and writes the records, so formatting and the write to stderr never
+run on a request thread.
+
+- Records are JSON by default, with the request ID, user ID and trace ID of
+  the request that logged them, plus any `extra=` fields
+- Messages use %-style arguments and are formatted on the writer thread.
+  Records whose arguments are not plain values are formatted on the calling
+  thread instead, so ORM objects are never read from another thread.
+- LOG_SAMPLING keeps only a fraction of INFO and DEBUG records from chosen
+  loggers, e.g. "app.services=0.1". Warnings and errors are always kept.
+- When the queue is full, records are dropped and counted rather than
+  blocking the request. Counters are reported by logging_stats().
+"""
+import atexit
+import json
+import logging
+import os
+import queue
+import random
+import sys
+from datetime import date, datetime, timezone
+from decimal import Decimal
+from logging.handlers import QueueHandler, QueueListener
+from typing import Any, Dict, Optional
+
+from app.core.config import settings
+from app.core.request_context import get_request_context
+from app.core.tracing import current_trace_id
+
+# Argument types that are safe to format later on the writer thread
+_PLAIN_TYPES = (str, int, float, bool, type(None), Decimal, datetime, date)
+
+# Attributes every LogRecord has; anything else came from `extra=`
+_RECORD_ATTRIBUTES = set(vars(logging.LogRecord("", 0, "", 0, "", (), None))) | {
+    "message", "asctime", "request_id", "user_id", "trace_id",
+}
+
+
+class ContextFilter(logging.Filter):
+    """Stamp records with the request, user and trace IDs while still on the calling thread"""
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        context = get_request_context()
+        record.request_id = context.request_id if context is not None else None
+        record.user_id = context.user_id if context is not None else None
+        record.trace_id = current_trace_id()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """Keep a fraction of INFO and lower records from configured logger prefixes"""
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        # Longest prefix first, so "app.services.user_service" beats "app.services"
+        self.rates = sorted(rates.items(), key=lambda item: len(item[0]), reverse=True)
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.INFO or not self.rates:
+            return True
+        for prefix, rate in self.rates:
+            if record.name == prefix or record.name.startswith(prefix + "."):
+                if random.random() < rate:
+                    return True
+                self.sampled_out += 1
+                return False
+        return True
+
+
+class NonBlockingQueueHandler(QueueHandler):
+    """QueueHandler that drops and counts records instead of blocking on a full queue"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Plain arguments are formatted later on the writer thread; anything
+        # else (ORM objects, exceptions) is rendered now, on its own thread
+        if record.args and not all(isinstance(arg, _PLAIN_TYPES) for arg in _iter_args(record.args)):
+            record.msg = record.getMessage()
+            record.args = None
+        return record
+
+
+def _iter_args(args):
+    return args.values() if isinstance(args, dict) else args
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per line"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key in ("request_id", "user_id", "trace_id"):
+            value = getattr(record, key, None)
+            if value:
+                entry[key] = value
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES:
+                entry[key] = value
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        return json.dumps(entry, default=str)
+
+
+class TextFormatter(logging.Formatter):
+    """Classic single-line format with the request ID appended"""
+
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)s %(name)s: %(message)s")
+
+    def format(self, record: logging.LogRecord) -> str:
+        line = super().format(record)
+        request_id = getattr(record, "request_id", None)
+        return f"{line} [request_id={request_id}]" if request_id else line
+
+
+def parse_sampling(spec: str) -> Dict[str, float]:
+    """Parse "logger=rate,logger=rate" into a dict"""
+    rates = {}
+    for item in filter(None, (part.strip() for part in spec.split(","))):
+        name, _, rate = item.partition("=")
+        rates[name.strip()] = min(max(float(rate), 0.0), 1.0)
+    return rates
+
+
+_handler: Optional[NonBlockingQueueHandler] = None
+_sampling: Optional[SamplingFilter] = None
+_listener: Optional[QueueListener] = None
+
+
+def configure_logging():
+    """Route the root logger through the queue; safe to call more than once"""
+    global _handler, _sampling, _listener
+    if _listener is not None:
+        return
+
+    log_queue: queue.Queue = queue.Queue(maxsize=settings.log_queue_size)
+    _handler = NonBlockingQueueHandler(log_queue)
+    _sampling = SamplingFilter(parse_sampling(settings.log_sampling))
+    _handler.addFilter(_sampling)  # before ContextFilter, so dropped records cost less
+    _handler.addFilter(ContextFilter())
+
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(JsonFormatter() if settings.log_format == "json" else TextFormatter())
+
+    root = logging.getLogger()
+    for existing in list(root.handlers):
+        root.removeHandler(existing)
+    root.addHandler(_handler)
+    root.setLevel(settings.log_level.upper())
+
+    _listener = QueueListener(log_queue, stream_handler, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+
+
+def _restart_after_fork():
+    # The writer thread does not exist in a forked child (e.g. a gunicorn
+    # worker of a preloaded app), so build a fresh queue and listener there
+    global _handler, _sampling, _listener
+    if _listener is not None:
+        _handler = _sampling = _listener = None
+        configure_logging()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_restart_after_fork)
+
+
+def shutdown_logging():
+    """Flush queued records and stop the writer thread"""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+def logging_stats() -> Dict[str, int]:
+    """Queue depth and how many records were dropped or sampled out"""
+    if _handler is None:
+        return {"queued": 0, "dropped": 0, "sampled_out": 0}
+    return {
+        "queued": _handler.queue.qsize(),
+        "dropped": _handler.dropped,
+        "sampled_out": _sampling.sampled_out if _sampling else 0,
+    }
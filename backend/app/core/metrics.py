@@ -0,0 +1,165 @@
+"""
+In-process metrics for the Hospital Management System API
+
+A minimal registry of counters and histograms rendered in the OpenMetrics
+text format at /metrics. Observations made during a request attach an
+exemplar with its request ID (and trace ID when traced), so a latency spike
+on a dashboard links straight to the request's logs and trace.
+"""
+import math
+import threading
+import time
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from app.core.request_context import get_request_id
+from app.core.tracing import current_trace_id
+
+CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+Exemplar = Tuple[Dict[str, str], float, float]  # labels, value, timestamp
+
+
+def current_exemplar_labels() -> Optional[Dict[str, str]]:
+    """Request and trace IDs of the current request, if any"""
+    request_id = get_request_id()
+    if request_id is None:
+        return None
+    labels = {"request_id": request_id}
+    trace_id = current_trace_id()
+    if trace_id:
+        labels["trace_id"] = trace_id
+    return labels
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def _format_exemplar(exemplar: Optional[Exemplar]) -> str:
+    if exemplar is None:
+        return ""
+    labels, value, timestamp = exemplar
+    return f" # {_format_labels(labels)} {value} {timestamp:.3f}"
+
+
+class Counter:
+    """Monotonic counter with labels"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._exemplars: Dict[Tuple[str, ...], Exemplar] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels: str):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        exemplar_labels = current_exemplar_labels()
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+            if exemplar_labels:
+                self._exemplars[key] = (exemplar_labels, amount, time.time())
+
+    def render(self) -> List[str]:
+        lines = [f"# TYPE {self.name} counter", f"# HELP {self.name} {self.documentation}"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                labels = _format_labels(dict(zip(self.labelnames, key)))
+                lines.append(f"{self.name}_total{labels} {value}{_format_exemplar(self._exemplars.get(key))}")
+        return lines
+
+
+class Histogram:
+    """Cumulative-bucket histogram with labels and one exemplar per bucket"""
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # label values -> [per-bucket counts, sum, per-bucket exemplars]
+        self._series: Dict[Tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels: str):
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        index = next(i for i, bound in enumerate(self.buckets) if value <= bound)
+        exemplar_labels = current_exemplar_labels()
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * len(self.buckets), 0.0, [None] * len(self.buckets)]
+            series[0][index] += 1
+            series[1] += value
+            if exemplar_labels:
+                series[2][index] = (exemplar_labels, value, time.time())
+
+    def render(self) -> List[str]:
+        lines = [f"# TYPE {self.name} histogram", f"# HELP {self.name} {self.documentation}"]
+        with self._lock:
+            for key, (counts, total, exemplars) in sorted(self._series.items()):
+                base = dict(zip(self.labelnames, key))
+                cumulative = 0
+                for bound, count, exemplar in zip(self.buckets, counts, exemplars):
+                    cumulative += count
+                    le = "+Inf" if bound == math.inf else repr(bound)
+                    labels = _format_labels({**base, "le": le})
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}{_format_exemplar(exemplar)}")
+                lines.append(f"{self.name}_sum{_format_labels(base)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(base)} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Named metrics, created on first use"""
+
+    def __init__(self):
+        self._metrics: Dict[str, object] = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self._get_or_create(name, lambda: Counter(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._get_or_create(name, lambda: Histogram(name, documentation, labelnames, buckets))
+
+    def _get_or_create(self, name, factory):
+        with self._lock:
+            if name not in self._metrics:
+                self._metrics[name] = factory()
+            return self._metrics[name]
+
+    def render(self) -> str:
+        with self._lock:
+            metrics = list(self._metrics.values())
+        lines = []
+        for metric in metrics:
+            lines.extend(metric.render())
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+
+metrics = MetricsRegistry()
+
+http_request_duration = metrics.histogram(
+    "http_request_duration_seconds", "HTTP request latency by route", ("method", "route", "status")
+)
+db_query_duration = metrics.histogram(
+    "db_query_duration_seconds", "SQL statement latency by operation", ("operation",),
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+db_slow_queries = metrics.counter("db_slow_queries", "SQL statements slower than SLOW_QUERY_MS", ("operation",))
+http_slow_requests = metrics.counter(
+    "http_slow_requests", "Requests slower than SLOW_REQUEST_MS", ("method", "route")
+)
@@ -0,0 +1,245 @@
+"""
+Login throttling: token buckets per client IP and per employee ID, plus
+progressive backoff after repeated failed passwords
+
+Every login attempt takes a token from the bucket of its client IP and from
+the bucket of the account it names; an empty bucket answers 429 with
+Retry-After before any database or password hashing work is done. Buckets refill
+continuously (LOGIN_*_PER_MINUTE) up to their burst size, so normal users
+never notice them while a credential-stuffing burst is cut off after a
+handful of attempts.
+
+Failed passwords on one account additionally lock it for an exponentially
+growing period once LOGIN_BACKOFF_AFTER_FAILURES is reached; a successful
+login clears the count.
+
+The client IP is the ASGI client address. Uvicorn replaces the proxy's
+address with the X-Forwarded-For client only for peers listed in
+SERVER_FORWARDED_ALLOW_IPS, so a deployment behind a proxy must list it
+there (or every client shares the proxy's bucket), and clients elsewhere
+cannot pick their own address.
+
+State lives in a sharded in-process store (one lock per shard), which limits
+each worker on its own. With RATE_LIMIT_REDIS_URL set (needs the optional
+redis package), all workers share the state in Redis.
+"""
+import logging
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from zlib import crc32
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+login_attempts = metrics.counter(
+    "login_attempts", "Login attempts by outcome (success, failure, throttled)", ("outcome",)
+)
+login_throttled = metrics.counter(
+    "login_throttled", "Login attempts rejected before checking the password", ("reason",)
+)
+
+
+class MemoryStore:
+    """Token buckets and failure counters in this process, split over locked shards"""
+
+    SHARDS = 16
+    MAX_KEYS_PER_SHARD = 10000
+
+    def __init__(self):
+        # Per shard: lock, buckets (key -> [tokens, updated, full_at]) and
+        # failures (key -> [count, blocked_until, last_failure])
+        self._shards: List[Tuple[threading.Lock, Dict[str, list], Dict[str, list]]] = [
+            (threading.Lock(), {}, {}) for _ in range(self.SHARDS)
+        ]
+
+    def _shard(self, key: str):
+        return self._shards[crc32(key.encode("utf-8")) % self.SHARDS]
+
+    def take(self, key: str, rate: float, burst: int, now: float) -> float:
+        """Take one token; returns 0 if allowed, else seconds until a token is available"""
+        lock, buckets, _ = self._shard(key)
+        with lock:
+            bucket = buckets.get(key)
+            if bucket is None:
+                if len(buckets) >= self.MAX_KEYS_PER_SHARD:
+                    # A full bucket holds no information
+                    self._evict(buckets, lambda entry: entry[2] <= now)
+                bucket = buckets[key] = [float(burst), now, now]
+            tokens = min(float(burst), bucket[0] + (now - bucket[1]) * rate)
+            wait = 0.0
+            if tokens >= 1:
+                tokens -= 1
+            else:
+                wait = (1 - tokens) / rate
+            bucket[:] = [tokens, now, now + (burst - tokens) / rate]
+            return wait
+
+    def blocked_for(self, key: str, now: float) -> float:
+        lock, _, failures = self._shard(key)
+        with lock:
+            entry = failures.get(key)
+            return max(0.0, entry[1] - now) if entry else 0.0
+
+    def add_failure(self, key: str, now: float) -> int:
+        lock, _, failures = self._shard(key)
+        forget_after = settings.login_backoff_max_seconds * 4
+        with lock:
+            entry = failures.get(key)
+            if entry is None or now - entry[2] > forget_after:
+                if len(failures) >= self.MAX_KEYS_PER_SHARD:
+                    self._evict(failures, lambda entry: now - entry[2] > forget_after)
+                entry = failures[key] = [0, 0.0, now]
+            entry[0] += 1
+            entry[1] = now + backoff_seconds(entry[0])
+            entry[2] = now
+            return entry[0]
+
+    def clear_failures(self, key: str):
+        lock, _, failures = self._shard(key)
+        with lock:
+            failures.pop(key, None)
+
+    def _evict(self, entries: Dict[str, list], expired):
+        for key in [key for key, entry in entries.items() if expired(entry)]:
+            del entries[key]
+        if len(entries) >= self.MAX_KEYS_PER_SHARD:
+            entries.clear()  # Flooded with distinct keys; start over rather than grow
+
+
+class RedisStore:
+    """The same operations on Redis, atomic via Lua, shared by all workers"""
+
+    TAKE_SCRIPT = """
+    local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+    local rate, burst, now = tonumber(ARGV[1]), tonumber(ARGV[2]), tonumber(ARGV[3])
+    local tokens = tonumber(bucket[1]) or burst
+    local updated = tonumber(bucket[2]) or now
+    tokens = math.min(burst, tokens + math.max(0, now - updated) * rate)
+    local wait = 0
+    if tokens >= 1 then tokens = tokens - 1 else wait = (1 - tokens) / rate end
+    redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+    redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+    return tostring(wait)
+    """
+
+    def __init__(self, url: str):
+        import redis  # Optional dependency, only needed for a shared store
+
+        self._redis = redis.Redis.from_url(url, socket_timeout=0.5)
+        self._take = self._redis.register_script(self.TAKE_SCRIPT)
+
+    def take(self, key: str, rate: float, burst: int, now: float) -> float:
+        return float(self._take(keys=[f"ratelimit:{key}"], args=[rate, burst, now]))
+
+    def blocked_for(self, key: str, now: float) -> float:
+        blocked_until = self._redis.get(f"loginblock:{key}")
+        return max(0.0, float(blocked_until) - now) if blocked_until else 0.0
+
+    def add_failure(self, key: str, now: float) -> int:
+        failures = self._redis.incr(f"loginfail:{key}")
+        self._redis.expire(f"loginfail:{key}", int(settings.login_backoff_max_seconds) * 4)
+        seconds = backoff_seconds(failures)
+        if seconds > 0:
+            self._redis.set(f"loginblock:{key}", now + seconds, ex=int(seconds) + 1)
+        return failures
+
+    def clear_failures(self, key: str):
+        self._redis.delete(f"loginfail:{key}", f"loginblock:{key}")
+
+
+def backoff_seconds(failures: int) -> float:
+    """Lockout after the given number of consecutive failures (0 below the threshold)"""
+    excess = failures - settings.login_backoff_after_failures
+    if excess < 0:
+        return 0.0
+    return min(settings.login_backoff_max_seconds, settings.login_backoff_base_seconds * (2 ** min(excess, 30)))
+
+
+class LoginThrottle:
+    """Decides whether a login attempt may proceed to the password check"""
+
+    def __init__(self):
+        self._store = None
+        self._lock = threading.Lock()
+
+    @property
+    def store(self):
+        if self._store is None:
+            with self._lock:
+                if self._store is None:
+                    self._store = self._create_store()
+        return self._store
+
+    @staticmethod
+    def _create_store():
+        if settings.rate_limit_redis_url:
+            try:
+                return RedisStore(settings.rate_limit_redis_url)
+            except Exception as e:
+                logger.error("Rate limit store unavailable, limiting per worker instead: %s", e)
+        return MemoryStore()
+
+    def check(self, client_ip: Optional[str], employee_id: str) -> Optional[Tuple[float, str]]:
+        """None if the attempt may proceed, else (retry after seconds, reason)"""
+        if not settings.login_rate_limit_enabled:
+            return None
+        now = time.time()
+        account = employee_id.strip().lower()
+        try:
+            blocked = self.store.blocked_for(f"account:{account}", now)
+            if blocked > 0:
+                return self._throttled(blocked, "backoff")
+
+            wait = self.store.take(
+                f"ip:{client_ip or 'unknown'}",
+                settings.login_ip_per_minute / 60, settings.login_ip_burst, now,
+            )
+            if wait > 0:
+                return self._throttled(wait, "ip")
+
+            wait = self.store.take(
+                f"account:{account}",
+                settings.login_account_per_minute / 60, settings.login_account_burst, now,
+            )
+            if wait > 0:
+                return self._throttled(wait, "account")
+        except Exception as e:
+            # Never lock everyone out because the store failed
+            logger.error("Login throttle check failed: %s", e)
+        return None
+
+    @staticmethod
+    def _throttled(retry_after: float, reason: str) -> Tuple[float, str]:
+        login_attempts.inc(outcome="throttled")
+        login_throttled.inc(reason=reason)
+        return retry_after, reason
+
+    def record_failure(self, employee_id: str):
+        login_attempts.inc(outcome="failure")
+        if not settings.login_rate_limit_enabled:
+            return
+        try:
+            account = employee_id.strip().lower()
+            failures = self.store.add_failure(f"account:{account}", time.time())
+            if failures >= settings.login_backoff_after_failures:
+                logger.warning(
+                    "Login backoff for employee ID %s after %s failed attempts (%.0f s)",
+                    employee_id, failures, backoff_seconds(failures)
+                )
+        except Exception as e:
+            logger.error("Failed to record login failure: %s", e)
+
+    def record_success(self, employee_id: str):
+        login_attempts.inc(outcome="success")
+        if not settings.login_rate_limit_enabled:
+            return
+        try:
+            self.store.clear_failures(f"account:{employee_id.strip().lower()}")
+        except Exception as e:
+            logger.error("Failed to clear login failures: %s", e)
+
+
+login_throttle = LoginThrottle()
@@ -0,0 +1,150 @@
+"""
+Role-based access control
+
+ROLE_PERMISSIONS is the single source of truth for what each role may do.
+At import it is compiled into integer bitmasks: every permission gets one
+bit, and every role two masks, one for permissions it holds everywhere and
+one for permissions it holds only in its own department (written
+"permission:own"). "*" grants everything.
+
+Routes declare permissions with auth_dependencies.require_permission(), which
+resolves the bit once when the route is defined. Each request then costs one
+dict lookup for the role's masks (done when the token is read) and an AND;
+nothing is read from the database and nothing is allocated.
+"""
+from typing import Dict, Iterable, NamedTuple, Optional
+
+# Granted to every role (ward reporting is open to all clinical and support staff)
+COMMON_PERMISSIONS = [
+    "department.read",
+    "ward_report.read", "ward_report.create", "ward_report.submit", "ward_report.delete",
+    "user.read:own",
+]
+
+ROLE_PERMISSIONS = {
+    "Administrator": {
+        "permissions": ["*"],
+        "description": "Full system access"
+    },
+    "Doctor": {
+        "permissions": [
+            "patient.create", "patient.read", "patient.update",
+            "medical_record.create", "medical_record.read", "medical_record.update",
+            "prescription.create", "prescription.read", "prescription.update",
+            "user.read"
+        ],
+        "description": "Medical staff with patient care access"
+    },
+    "Nurse": {
+        "permissions": [
+            "patient.read", "patient.update",
+            "medical_record.read", "medical_record.update",
+            "prescription.read"
+        ],
+        "description": "Nursing staff with patient care access"
+    },
+    "Lab Technician": {
+        "permissions": [
+            "patient.read", "lab_result.create", "lab_result.read", "lab_result.update"
+        ],
+        "description": "Laboratory staff access"
+    },
+    "Pharmacist": {
+        "permissions": [
+            "prescription.read", "prescription.update", "medication.create",
+            "medication.read", "medication.update"
+        ],
+        "description": "Pharmacy staff access"
+    },
+    "Receptionist": {
+        "permissions": [
+            "patient.create", "patient.read", "patient.update",
+            "appointment.create", "appointment.read", "appointment.update"
+        ],
+        "description": "Front desk and appointment management"
+    },
+    "Radiologist": {
+        "permissions": [
+            "patient.read", "imaging.create", "imaging.read", "imaging.update"
+        ],
+        "description": "Radiology department access"
+    },
+    "Physiotherapist": {
+        "permissions": [
+            "patient.read", "therapy.create", "therapy.read", "therapy.update"
+        ],
+        "description": "Physical therapy access"
+    },
+    "Dietitian": {
+        "permissions": ["patient.read"],
+        "description": "Nutrition and diet planning access"
+    },
+    "Social Worker": {
+        "permissions": ["patient.read"],
+        "description": "Patient support services access"
+    },
+}
+
+# Administrator-only permissions: no role lists them, Administrator holds them
+# through "*". Routes check user.create, ward_report.approve and system.admin;
+# the user and department update/delete routes do not check permissions yet,
+# so those names (and reports.all) only reserve their bits.
+ADMIN_PERMISSIONS = [
+    "user.create", "user.update", "user.delete",
+    "department.create", "department.update", "department.delete",
+    "ward_report.approve",
+    "system.admin", "reports.all",
+]
+
+OWN_DEPARTMENT_SUFFIX = ":own"
+
+
+class RoleMasks(NamedTuple):
+    anywhere: int
+    own_department: int
+
+
+NO_ACCESS = RoleMasks(0, 0)
+
+
+def _permission_names() -> Iterable[str]:
+    names = set(COMMON_PERMISSIONS) | set(ADMIN_PERMISSIONS)
+    for role in ROLE_PERMISSIONS.values():
+        names.update(role["permissions"])
+    names.discard("*")
+    return sorted({name.split(":", 1)[0] for name in names})
+
+
+def _compile():
+    bits = {name: 1 << index for index, name in enumerate(_permission_names())}
+    everything = sum(bits.values())
+    masks: Dict[str, RoleMasks] = {}
+    for role, definition in ROLE_PERMISSIONS.items():
+        anywhere = own = 0
+        for name in list(definition["permissions"]) + COMMON_PERMISSIONS:
+            if name == "*":
+                anywhere = everything
+            elif name.endswith(OWN_DEPARTMENT_SUFFIX):
+                own |= bits[name[:-len(OWN_DEPARTMENT_SUFFIX)]]
+            else:
+                anywhere |= bits[name]
+        masks[role] = RoleMasks(anywhere, own | anywhere)
+    return bits, masks
+
+
+PERMISSION_BITS, ROLE_MASKS = _compile()
+
+
+def permission_bit(permission: str) -> int:
+    """Bit of a permission; raises KeyError for unknown names so typos fail at import"""
+    return PERMISSION_BITS[permission]
+
+
+def role_masks(role: Optional[str]) -> RoleMasks:
+    """Compiled masks of a role (no access for unknown roles)"""
+    return ROLE_MASKS.get(role, NO_ACCESS)
+
+
+def is_allowed(masks: RoleMasks, bit: int, same_department: bool = False) -> bool:
+    """True if the masks grant the permission bit, anywhere or (when same_department) in the caller's department"""
+    return bool(masks.anywhere & bit) or (same_department and bool(masks.own_department & bit))
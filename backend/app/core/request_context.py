@@ -0,0 +1,71 @@
+"""
+Request context shared across layers of the Hospital Management System API
+
+Middleware in main.py binds a RequestContext for each request. Code anywhere
+below it (services, SQL hooks, log filters, metrics) reads it from a context
+variable, without threading it through function arguments.
+
+The request ID comes from the caller's X-Request-ID header when it is a
+reasonable token, otherwise it is generated.
+"""
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional
+
+REQUEST_ID_HEADER = "X-Request-ID"
+
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:-]{1,128}$")
+
+
+@dataclass
+class RequestContext:
+    """What is known about the request being served"""
+
+    request_id: str
+    method: str
+    path: str
+    scope: Dict[str, Any] = field(default_factory=dict, repr=False)
+    started: float = field(default_factory=time.perf_counter)
+    user_id: Optional[int] = None
+    role: Optional[str] = None
+
+    @property
+    def route(self) -> str:
+        """Route template once routing has happened (e.g. /api/v1/users/{user_id}), else the raw path"""
+        route = self.scope.get("route")
+        return getattr(route, "path", None) or self.path
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+
+request_context_var: ContextVar[Optional[RequestContext]] = ContextVar("request_context", default=None)
+
+
+def get_request_context() -> Optional[RequestContext]:
+    """Context of the current request, or None outside a request"""
+    return request_context_var.get()
+
+
+def get_request_id() -> Optional[str]:
+    """Request ID of the current request, or None outside a request"""
+    context = request_context_var.get()
+    return context.request_id if context is not None else None
+
+
+def bind_user(user_id: int, role: Optional[str]):
+    """Record the authenticated user on the current request"""
+    context = request_context_var.get()
+    if context is not None:
+        context.user_id = user_id
+        context.role = role
+
+
+def resolve_request_id(incoming: Optional[str]) -> str:
+    """Use the caller's request ID if it is safe to log and echo, else generate one"""
+    if incoming and _VALID_REQUEST_ID.match(incoming):
+        return incoming
+    return uuid.uuid4().hex
@@ -0,0 +1,262 @@
+"""
+Per-request sampling profiler for the Hospital Management System API
+
+A request is profiled when an administrator sends the X-Profile header, or
+when it falls into the PROFILING_SAMPLE_RATE fraction of traffic. While the
+request runs, a sampler thread snapshots the stacks of the threads serving
+it every PROFILING_INTERVAL_MS, and engine events record each SQL statement
+with its offset and duration. The result is kept in a bounded on-disk ring
+buffer and can be listed and downloaded from /api/v1/admin/profiles.
+
+Stacks are stored in folded format ("frame;frame;frame count"), which
+flamegraph.pl, speedscope and inferno read directly. Samples come from the
+event loop thread and from any worker thread that ran SQL for the request;
+other requests interleaved on the loop at the same time can show up in the
+event loop stacks.
+"""
+import json
+import logging
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.rbac import permission_bit, role_masks
+from app.utils.jwt_handler import JWTHandler
+
+logger = logging.getLogger(__name__)
+
+PROFILE_HEADER = "x-profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+SYSTEM_ADMIN = permission_bit("system.admin")
+MAX_CONCURRENT_PROFILES = 2
+MAX_STACK_DEPTH = 128
+MAX_STATEMENT_LENGTH = 2000
+
+_current_profile: ContextVar[Optional["RequestProfile"]] = ContextVar("current_profile", default=None)
+
+
+_BACKEND_DIR = str(Path(__file__).resolve().parents[2]) + os.sep
+_SITE_PACKAGES = "site-packages" + os.sep
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    filename = code.co_filename
+    # Shorten to a backend-relative or package-relative path
+    if filename.startswith(_BACKEND_DIR):
+        filename = filename[len(_BACKEND_DIR):]
+    elif _SITE_PACKAGES in filename:
+        filename = filename[filename.rindex(_SITE_PACKAGES) + len(_SITE_PACKAGES):]
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+
+
+def _fold(frame) -> str:
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+class RequestProfile:
+    """Stack samples and SQL timeline for one request"""
+
+    def __init__(self, method: str, path: str, trigger: str, user: Optional[str], interval: float):
+        self.id = f"{datetime.now(timezone.utc):%Y%m%dT%H%M%S}-{uuid.uuid4().hex[:8]}"
+        self.method = method
+        self.path = path
+        self.trigger = trigger
+        self.user = user
+        self.interval = interval
+        self.started_at = datetime.now(timezone.utc)
+        self.started = time.perf_counter()
+        self.duration_ms: Optional[float] = None
+        self.status_code: Optional[int] = None
+        self.samples: Counter = Counter()
+        self.sql: List[Dict[str, Any]] = []
+        self._thread_ids = {threading.get_ident()}
+        self._stop = threading.Event()
+        self._sampler = threading.Thread(target=self._sample, name=f"profiler-{self.id}", daemon=True)
+
+    def attach_current_thread(self):
+        """Include the calling thread in the samples"""
+        self._thread_ids.add(threading.get_ident())
+
+    def start(self):
+        self._sampler.start()
+
+    def stop(self, status_code: Optional[int]):
+        self._stop.set()
+        self._sampler.join()
+        self.status_code = status_code
+        self.duration_ms = round((time.perf_counter() - self.started) * 1000, 2)
+
+    def _sample(self):
+        while not self._stop.wait(self.interval):
+            frames = sys._current_frames()
+            for thread_id in tuple(self._thread_ids):
+                frame = frames.get(thread_id)
+                if frame is not None:
+                    self.samples[_fold(frame)] += 1
+
+    def record_sql(self, statement: str, started: float, finished: float, executemany: bool):
+        self.sql.append({
+            "offset_ms": round((started - self.started) * 1000, 3),
+            "duration_ms": round((finished - started) * 1000, 3),
+            "statement": statement[:MAX_STATEMENT_LENGTH],
+            "executemany": executemany,
+        })
+
+    def folded(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.samples.most_common())
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "id": self.id,
+            "method": self.method,
+            "path": self.path,
+            "status_code": self.status_code,
+            "trigger": self.trigger,
+            "user": self.user,
+            "started_at": self.started_at.isoformat(),
+            "duration_ms": self.duration_ms,
+            "sample_interval_ms": round(self.interval * 1000, 3),
+            "sample_count": sum(self.samples.values()),
+            "sql_count": len(self.sql),
+            "sql_time_ms": round(sum(entry["duration_ms"] for entry in self.sql), 3),
+            "sql": self.sql,
+            "folded_stacks": self.folded(),
+        }
+
+
+class ProfileStore:
+    """Bounded on-disk ring buffer of request profiles, one JSON file each"""
+
+    def __init__(self, directory: str, max_profiles: int):
+        self.directory = Path(directory)
+        self.max_profiles = max_profiles
+        self._lock = threading.Lock()
+
+    def save(self, profile: RequestProfile):
+        with self._lock:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            path = self.directory / f"{profile.id}.json"
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_text(json.dumps(profile.to_dict()))
+            tmp_path.replace(path)
+            # Profile IDs start with a UTC timestamp, so name order is age order
+            for old in sorted(self.directory.glob("*.json"))[:-self.max_profiles]:
+                old.unlink(missing_ok=True)
+
+    def list(self) -> List[Dict[str, Any]]:
+        summaries = []
+        for path in sorted(self.directory.glob("*.json"), reverse=True):
+            profile = self._read(path)
+            if profile:
+                profile.pop("sql")
+                profile.pop("folded_stacks")
+                summaries.append(profile)
+        return summaries
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        path = self.directory / f"{profile_id}.json"
+        # Profile IDs never contain path separators; reject anything else
+        if path.parent != self.directory or not path.exists():
+            return None
+        return self._read(path)
+
+    @staticmethod
+    def _read(path: Path) -> Optional[Dict[str, Any]]:
+        try:
+            return json.loads(path.read_text())
+        except (OSError, ValueError):
+            return None  # rotated out while reading
+
+
+class RequestProfiler:
+    """Decides which requests to profile and runs the profiles"""
+
+    def __init__(self):
+        self.store = ProfileStore(settings.profiling_dir, settings.profiling_max_profiles)
+        self.sample_rate = settings.profiling_sample_rate
+        self.interval = settings.profiling_interval_ms / 1000
+        self._active = 0
+        self._lock = threading.Lock()
+
+    def instrument_engine(self, engine):
+        """Record SQL statements of profiled requests"""
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+
+    def start(self, request) -> Optional[RequestProfile]:
+        """Begin profiling the request if it is triggered and a slot is free"""
+        trigger, user = None, None
+        if PROFILE_HEADER in request.headers:
+            user = _admin_from_authorization(request.headers.get("authorization"))
+            if user is None:
+                logger.warning("Ignoring %s header from a non-admin request to %s", PROFILE_HEADER, request.url.path)
+            else:
+                trigger = "header"
+        if trigger is None and self.sample_rate and random.random() < self.sample_rate:
+            trigger = "sampled"
+        if trigger is None:
+            return None
+
+        with self._lock:
+            if self._active >= MAX_CONCURRENT_PROFILES:
+                return None
+            self._active += 1
+
+        profile = RequestProfile(request.method, request.url.path, trigger, user, self.interval)
+        profile.start()
+        _current_profile.set(profile)
+        return profile
+
+    def finish(self, profile: RequestProfile, status_code: Optional[int]):
+        """Stop sampling and persist the profile (blocking; call off the event loop)"""
+        profile.stop(status_code)
+        with self._lock:
+            self._active -= 1
+        try:
+            self.store.save(profile)
+            logger.info("Saved profile %s for %s %s (%s ms)", profile.id, profile.method, profile.path, profile.duration_ms)
+        except OSError as e:
+            logger.error("Failed to save profile %s: %s", profile.id, e)
+
+
+def _admin_from_authorization(authorization: Optional[str]) -> Optional[str]:
+    """Employee ID of an administrator bearer token, else None"""
+    if not authorization or not authorization.lower().startswith("bearer "):
+        return None
+    payload = JWTHandler.verify_token(authorization[7:])
+    if not payload or not role_masks(payload.get("role")).anywhere & SYSTEM_ADMIN:
+        return None
+    return payload.get("employee_id")
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    if profile is not None:
+        profile.attach_current_thread()
+        context._profile_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    profile = _current_profile.get()
+    started = getattr(context, "_profile_started", None)
+    if profile is not None and started is not None:
+        profile.record_sql(statement, started, time.perf_counter(), executemany)
+
+
+request_profiler = RequestProfiler()
@@ -0,0 +1,164 @@
+"""
+Startup profiler for the Hospital Management System API
+Records per-module import times and per-step lifespan timings for the startup report
+"""
+import importlib.abc
+import logging
+import sys
+import time
+from contextlib import contextmanager
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class _TimedLoader(importlib.abc.Loader):
+    """Loader wrapper that times module execution"""
+
+    def __init__(self, loader, profiler: "StartupProfiler"):
+        self._loader = loader
+        self._profiler = profiler
+
+    def create_module(self, spec):
+        return self._loader.create_module(spec)
+
+    def exec_module(self, module):
+        self._profiler._import_started(module.__name__)
+        try:
+            self._loader.exec_module(module)
+        finally:
+            self._profiler._import_finished(module.__name__)
+
+    def __getattr__(self, name):
+        return getattr(self._loader, name)
+
+
+class _ImportTimingFinder(importlib.abc.MetaPathFinder):
+    """Meta path finder that wraps loaders of tracked modules"""
+
+    def __init__(self, profiler: "StartupProfiler", prefixes: tuple):
+        self._profiler = profiler
+        self._prefixes = prefixes
+        self._resolving = set()
+
+    def find_spec(self, fullname, path, target=None):
+        if fullname in self._resolving or not fullname.startswith(self._prefixes):
+            return None
+
+        self._resolving.add(fullname)
+        try:
+            for finder in sys.meta_path:
+                if finder is self or not hasattr(finder, "find_spec"):
+                    continue
+                spec = finder.find_spec(fullname, path, target)
+                if spec is not None:
+                    break
+            else:
+                return None
+        finally:
+            self._resolving.discard(fullname)
+
+        if spec.loader is not None and hasattr(spec.loader, "exec_module"):
+            spec.loader = _TimedLoader(spec.loader, self._profiler)
+        return spec
+
+
+class StartupProfiler:
+    """Collect import and lifespan step timings for the startup report"""
+
+    def __init__(self):
+        self.created_at = time.perf_counter()
+        self.imports: List[Dict[str, Any]] = []
+        self.steps: List[Dict[str, Any]] = []
+        self.ready_ms: Optional[float] = None
+        self._import_stack: List[list] = []
+        self._finder: Optional[_ImportTimingFinder] = None
+
+    # === IMPORT TIMING ===
+
+    def install_import_hook(self, prefixes=("app", "fastapi", "sqlalchemy", "jose", "bcrypt", "pydantic")):
+        """Start timing imports of modules matching the given prefixes"""
+        if self._finder is None:
+            self._finder = _ImportTimingFinder(self, tuple(prefixes))
+            sys.meta_path.insert(0, self._finder)
+
+    def uninstall_import_hook(self):
+        """Stop timing imports"""
+        if self._finder is not None:
+            try:
+                sys.meta_path.remove(self._finder)
+            except ValueError:
+                pass
+            self._finder = None
+
+    def _import_started(self, name: str):
+        self._import_stack.append([name, time.perf_counter(), 0.0])
+
+    def _import_finished(self, name: str):
+        module_name, started, children = self._import_stack.pop()
+        elapsed = time.perf_counter() - started
+        if self._import_stack:
+            self._import_stack[-1][2] += elapsed
+        self.imports.append({
+            "module": module_name,
+            "cumulative_ms": round(elapsed * 1000, 2),
+            "self_ms": round((elapsed - children) * 1000, 2),
+        })
+
+    # === LIFESPAN STEP TIMING ===
+
+    @contextmanager
+    def step(self, name: str):
+        """Time a lifespan step and record whether it succeeded"""
+        entry = {"step": name, "status": "ok", "ms": 0.0}
+        started = time.perf_counter()
+        try:
+            yield entry
+        except Exception:
+            entry["status"] = "failed"
+            raise
+        finally:
+            entry["ms"] = round((time.perf_counter() - started) * 1000, 2)
+            self.steps.append(entry)
+
+    def skip(self, name: str, reason: str):
+        """Record a lifespan step that was skipped"""
+        self.steps.append({"step": name, "status": "skipped", "ms": 0.0, "reason": reason})
+
+    def mark_ready(self):
+        """Record the time from profiler creation until the app can serve"""
+        self.ready_ms = round((time.perf_counter() - self.created_at) * 1000, 2)
+
+    # === REPORTING ===
+
+    def report(self, top: int = 15) -> Dict[str, Any]:
+        """Build the startup report"""
+        slowest = sorted(self.imports, key=lambda i: i["self_ms"], reverse=True)[:top]
+        return {
+            "ready_ms": self.ready_ms,
+            "modules_imported": len(self.imports),
+            "import_ms": round(sum(i["self_ms"] for i in self.imports), 2),
+            "slowest_imports": slowest,
+            "steps": list(self.steps),
+        }
+
+    def log_report(self, top: int = 10):
+        """Write the startup report to the log"""
+        report = self.report(top=top)
+        logger.info(
+            "Startup report: ready in %s ms, "
+            "%s modules imported in %s ms",
+            report['ready_ms'], report['modules_imported'], report['import_ms']
+        )
+        for entry in report["steps"]:
+            suffix = f" ({entry['reason']})" if entry.get("reason") else ""
+            logger.info("  step %s: %s in %s ms%s", entry['step'], entry['status'], entry['ms'], suffix)
+        for entry in report["slowest_imports"]:
+            logger.info(
+                "  import %s: %s ms self, "
+                "%s ms cumulative",
+                entry['module'], entry['self_ms'], entry['cumulative_ms']
+            )
+
+
+startup_profiler = StartupProfiler()
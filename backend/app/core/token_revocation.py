@@ -0,0 +1,209 @@
+"""
+Access token revocation for the Hospital Management System API
+
+Tokens carry a random JWT ID (jti). Logging out records the jti in the
+revoked_tokens table, which all workers share, and every worker keeps an
+in-memory copy so get_current_user never queries the database for it:
+
+- A Bloom filter answers "definitely not revoked" for almost every token
+  with a few bit probes
+- Only on a Bloom hit (revoked, or a false positive at
+  REVOCATION_BLOOM_ERROR_RATE) is the exact jti -> expiry dict consulted
+- A background thread pulls rows revoked by other workers every
+  REVOCATION_SYNC_SECONDS, so a logout takes effect everywhere within that
+  interval (immediately in the worker that handled it)
+- Entries are only needed until the token's own expiry. Compaction drops
+  expired entries, rebuilds the Bloom filter (bits cannot be removed) and
+  deletes expired rows, along with expired refresh tokens.
+"""
+import hashlib
+import logging
+import math
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.models.refresh_token import RefreshToken
+from app.models.revoked_token import RevokedToken
+
+logger = logging.getLogger(__name__)
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on one blake2b digest)"""
+
+    def __init__(self, capacity: int, error_rate: float):
+        capacity = max(capacity, 1)
+        self.capacity = capacity
+        self.size = max(8, int(math.ceil(-capacity * math.log(error_rate) / (math.log(2) ** 2))))
+        self.hash_count = max(1, int(round(self.size / capacity * math.log(2))))
+        self.count = 0
+        self._bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, key: str):
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.size for i in range(self.hash_count))
+
+    def add(self, key: str):
+        for position in self._positions(key):
+            self._bits[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def might_contain(self, key: str) -> bool:
+        bits = self._bits
+        return all(bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class TokenRevocationList:
+    """In-memory view of revoked_tokens, kept in sync by a background thread"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._exact: Dict[str, float] = {}  # jti -> expiry (unix time)
+        self._bloom = self._new_bloom(0)
+        self._synced_until: Optional[datetime] = None
+        self._last_compaction = time.monotonic()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.bloom_hits = 0
+        self.false_positives = 0
+
+    @staticmethod
+    def _new_bloom(entries: int) -> BloomFilter:
+        capacity = max(settings.revocation_bloom_capacity, entries * 2)
+        return BloomFilter(capacity, settings.revocation_bloom_error_rate)
+
+    # === HOT PATH ===
+
+    def is_revoked(self, jti: Optional[str]) -> bool:
+        """True if the token with this JWT ID was revoked and has not expired yet"""
+        if not jti or not self._exact or not self._bloom.might_contain(jti):
+            return False
+        self.bloom_hits += 1
+        expires = self._exact.get(jti)
+        if expires is None:
+            self.false_positives += 1
+            return False
+        return expires > time.time()
+
+    # === WRITES ===
+
+    def revoke(self, db: Session, jti: str, expires_at: datetime, user_id: Optional[int] = None):
+        """
+        Revoke a token until its expiry (naive UTC)
+
+        Takes effect immediately in this worker and within one sync interval
+        in the others.
+        """
+        try:
+            db.add(RevokedToken(jti=jti, user_id=user_id, expires_at=expires_at))
+            db.commit()
+        except IntegrityError:
+            db.rollback()  # already revoked
+        except Exception as e:
+            db.rollback()
+            logger.error("Error revoking token: %s", e)
+            raise e
+        self._add(jti, expires_at)
+        logger.info("Revoked token %s for user_id %s", jti, user_id)
+
+    def _add(self, jti: str, expires_at: datetime):
+        expires = (expires_at - datetime(1970, 1, 1)).total_seconds()
+        with self._lock:
+            if jti not in self._exact:
+                self._exact[jti] = expires
+                self._bloom.add(jti)
+                if self._bloom.count > self._bloom.capacity:
+                    self._rebuild()
+
+    def _rebuild(self):
+        # Caller holds the lock
+        bloom = self._new_bloom(len(self._exact))
+        for jti in self._exact:
+            bloom.add(jti)
+        self._bloom = bloom
+
+    # === SYNC AND COMPACTION ===
+
+    def sync(self, db: Session) -> int:
+        """Pull revocations recorded since the last sync (all live ones on the first call)"""
+        now = datetime.utcnow()
+        query = db.query(RevokedToken.jti, RevokedToken.expires_at).filter(RevokedToken.expires_at > now)
+        if self._synced_until is not None:
+            # Overlap by a few intervals to cover clock skew between workers and
+            # rows committed late; re-adding a known jti is a no-op
+            overlap = timedelta(seconds=max(settings.revocation_sync_seconds * 3, 5))
+            query = query.filter(RevokedToken.revoked_at >= self._synced_until - overlap)
+        rows = query.all()
+        for jti, expires_at in rows:
+            self._add(jti, expires_at)
+        self._synced_until = now
+        return len(rows)
+
+    def compact(self, db: Optional[Session] = None) -> int:
+        """Forget expired entries, rebuild the Bloom filter and delete expired token rows"""
+        now = time.time()
+        with self._lock:
+            before = len(self._exact)
+            self._exact = {jti: expires for jti, expires in self._exact.items() if expires > now}
+            self._rebuild()
+            removed = before - len(self._exact)
+        if db is not None:
+            try:
+                expired_before = datetime.utcnow()
+                for model in (RevokedToken, RefreshToken):
+                    db.query(model).filter(model.expires_at <= expired_before).delete(synchronize_session=False)
+                db.commit()
+            except Exception as e:
+                db.rollback()
+                logger.warning("Failed to delete expired revocations: %s", e)
+        self._last_compaction = time.monotonic()
+        return removed
+
+    def start_background_sync(self, session_factory):
+        """Sync (and compact when due) on a daemon thread until stop_background_sync()"""
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(
+            target=self._run, args=(session_factory,), name="token-revocation-sync", daemon=True
+        )
+        self._thread.start()
+
+    def stop_background_sync(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self, session_factory):
+        while not self._stop.wait(settings.revocation_sync_seconds):
+            db = session_factory()
+            try:
+                self.sync(db)
+                if time.monotonic() - self._last_compaction >= settings.revocation_compact_seconds:
+                    removed = self.compact(db)
+                    logger.debug("Compacted revocation list, %s expired entries removed", removed)
+            except Exception as e:
+                # Keep serving from memory; the next round retries
+                logger.warning("Token revocation sync failed: %s", e)
+            finally:
+                db.close()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "entries": len(self._exact),
+            "bloom_bits": self._bloom.size,
+            "bloom_hits": self.bloom_hits,
+            "false_positives": self.false_positives,
+        }
+
+
+revocation_list = TokenRevocationList()
@@ -0,0 +1,389 @@
+"""
+Request tracing for the Hospital Management System API
+
+A small OpenTelemetry-compatible tracer: spans carry W3C trace and span IDs,
+an incoming `traceparent` header continues the caller's trace, and finished
+spans are exported as OTLP/JSON (ExportTraceServiceRequest), either appended
+to a JSON-lines file or POSTed to an OTLP/HTTP collector.
+
+Each traced request gets a server span for the route, with child spans for:
+- FastAPI dependencies (get_db, get_current_user, role checkers) via
+  @traced_dependency
+- service methods via the @traced_service class decorator
+- every SQL statement, via engine events
+- password hashing and checking
+- response serialization (fastapi.routing.serialize_response)
+
+Spans are only created inside a sampled request, so startup work and
+disabled tracing cost one context variable lookup.
+"""
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import os
+import queue
+import random
+import re
+import threading
+import time
+import urllib.request
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import event
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# OTLP span kinds and status codes
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CLIENT = 3
+STATUS_UNSET = 0
+STATUS_ERROR = 2
+
+MAX_STATEMENT_LENGTH = 2000
+EXPORT_BATCH_SIZE = 512
+EXPORT_INTERVAL_SECONDS = 2.0
+EXPORT_QUEUE_SIZE = 10000
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed operation in a trace"""
+
+    __slots__ = ("trace_id", "span_id", "parent_span_id", "name", "kind", "attributes",
+                 "start_ns", "end_ns", "status_code", "status_message")
+
+    def __init__(self, name: str, trace_id: str, parent_span_id: Optional[str], kind: int,
+                 attributes: Optional[Dict[str, Any]] = None):
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent_span_id
+        self.name = name
+        self.kind = kind
+        self.attributes = dict(attributes or {})
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def record_error(self, error: BaseException):
+        self.status_code = STATUS_ERROR
+        self.status_message = f"{type(error).__name__}: {error}"
+
+    def to_otlp(self) -> Dict[str, Any]:
+        span = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": [_otlp_attribute(key, value) for key, value in self.attributes.items()],
+            "status": {"code": self.status_code, "message": self.status_message},
+        }
+        if self.parent_span_id:
+            span["parentSpanId"] = self.parent_span_id
+        return span
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        typed = {"boolValue": value}
+    elif isinstance(value, int):
+        typed = {"intValue": str(value)}
+    elif isinstance(value, float):
+        typed = {"doubleValue": value}
+    else:
+        typed = {"stringValue": str(value)}
+    return {"key": key, "value": typed}
+
+
+# === EXPORT ===
+
+class SpanExporter:
+    """Batches finished spans on a background thread and writes them as OTLP/JSON"""
+
+    def __init__(self, exporter: str, file_path: str, otlp_endpoint: str, service_name: str):
+        self.exporter = exporter
+        self.file_path = Path(file_path)
+        self.otlp_endpoint = otlp_endpoint
+        self.resource = {"attributes": [_otlp_attribute("service.name", service_name)]}
+        self.dropped = 0
+        self._queue: "queue.Queue[Span]" = queue.Queue(maxsize=EXPORT_QUEUE_SIZE)
+        self._thread: Optional[threading.Thread] = None
+        if hasattr(os, "register_at_fork"):
+            os.register_at_fork(after_in_child=self._reset_after_fork)
+
+    def _reset_after_fork(self):
+        # Threads do not survive fork; the child starts its own on first submit
+        self._queue = queue.Queue(maxsize=EXPORT_QUEUE_SIZE)
+        self._thread = None
+
+    def submit(self, span: Span):
+        if self._thread is None:
+            self._start()
+        try:
+            self._queue.put_nowait(span)
+        except queue.Full:
+            self.dropped += 1  # never block a request on the exporter
+
+    def _start(self):
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+        self._thread.start()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + EXPORT_INTERVAL_SECONDS
+            while len(batch) < EXPORT_BATCH_SIZE:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self.export(batch)
+
+    def export(self, spans: List[Span]):
+        payload = json.dumps({
+            "resourceSpans": [{
+                "resource": self.resource,
+                "scopeSpans": [{
+                    "scope": {"name": "app.core.tracing"},
+                    "spans": [span.to_otlp() for span in spans],
+                }],
+            }]
+        })
+        try:
+            if self.exporter == "otlp":
+                request = urllib.request.Request(
+                    self.otlp_endpoint, data=payload.encode("utf-8"),
+                    headers={"Content-Type": "application/json"}, method="POST",
+                )
+                urllib.request.urlopen(request, timeout=5).close()
+            else:
+                self.file_path.parent.mkdir(parents=True, exist_ok=True)
+                with open(self.file_path, "a", encoding="utf-8") as trace_file:
+                    trace_file.write(payload + "\n")
+        except Exception as e:
+            logger.warning("Failed to export %s spans: %s", len(spans), e)
+
+
+# === TRACER ===
+
+class Tracer:
+    """Creates spans and hands finished ones to the exporter"""
+
+    def __init__(self):
+        self.enabled = settings.tracing_enabled
+        self.sample_rate = settings.tracing_sample_rate
+        self.exporter = SpanExporter(
+            settings.tracing_exporter,
+            settings.tracing_file,
+            settings.tracing_otlp_endpoint,
+            settings.tracing_service_name,
+        )
+
+    @contextmanager
+    def start_request_span(self, name: str, traceparent: Optional[str], attributes: Dict[str, Any]):
+        """Root span of a request; continues the caller's trace when traceparent is valid"""
+        match = _TRACEPARENT.match(traceparent or "")
+        if match:
+            trace_id, parent_span_id, flags = match.groups()
+            sampled = int(flags, 16) & 1
+        else:
+            trace_id, parent_span_id = os.urandom(16).hex(), None
+            sampled = random.random() < self.sample_rate
+
+        if not (self.enabled and sampled):
+            yield None
+            return
+
+        span = Span(name, trace_id, parent_span_id, SPAN_KIND_SERVER, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end(span)
+
+    @contextmanager
+    def start_span(self, name: str, kind: int = SPAN_KIND_INTERNAL, attributes: Optional[Dict[str, Any]] = None):
+        """Child span of the current span; a no-op outside a traced request"""
+        parent = _current_span.get()
+        if parent is None:
+            yield None
+            return
+
+        span = Span(name, parent.trace_id, parent.span_id, kind, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.record_error(e)
+            raise
+        finally:
+            _current_span.reset(token)
+            self.end(span)
+
+    def end(self, span: Span):
+        span.end_ns = time.time_ns()
+        self.exporter.submit(span)
+
+    def instrument_engine(self, engine):
+        """Trace every SQL statement run inside a traced request"""
+        event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(engine, "handle_error", _handle_error)
+
+    def instrument_serialization(self):
+        """Trace FastAPI's response validation and serialization"""
+        import fastapi.routing
+
+        original = fastapi.routing.serialize_response
+        if getattr(original, "__wrapped__", None) is None:
+            fastapi.routing.serialize_response = traced("serialize_response")(original)
+
+
+def current_trace_id() -> Optional[str]:
+    """Trace ID of the current span, or None outside a traced request"""
+    span = _current_span.get()
+    return span.trace_id if span is not None else None
+
+
+def current_traceparent() -> Optional[str]:
+    """W3C traceparent of the current span, or None outside a traced request"""
+    span = _current_span.get()
+    return f"00-{span.trace_id}-{span.span_id}-01" if span is not None else None
+
+
+# === DECORATORS ===
+
+def traced(name: Optional[str] = None, kind: int = SPAN_KIND_INTERNAL):
+    """Wrap a sync or async function in a span"""
+    def decorator(fn: Callable) -> Callable:
+        span_name = name or fn.__qualname__
+
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                if _current_span.get() is None:
+                    return await fn(*args, **kwargs)
+                with tracer.start_span(span_name, kind):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return fn(*args, **kwargs)
+            with tracer.start_span(span_name, kind):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def traced_dependency(name: Optional[str] = None):
+    """
+    Wrap a FastAPI dependency in a span, keeping its kind (async, sync or generator)
+
+    For generator dependencies the span covers setup up to the yield, which is
+    what the request waits for; cleanup runs after the response.
+    """
+    def decorator(fn: Callable) -> Callable:
+        span_name = f"Depends {name or fn.__name__}"
+        attributes = {"fastapi.dependency": fn.__qualname__}
+
+        if inspect.isgeneratorfunction(fn):
+            @functools.wraps(fn)
+            def generator_wrapper(*args, **kwargs):
+                generator = fn(*args, **kwargs)
+                with tracer.start_span(span_name, attributes=attributes):
+                    value = next(generator)
+                try:
+                    yield value
+                except BaseException as e:
+                    try:
+                        generator.throw(e)
+                    except StopIteration:
+                        return
+                    raise
+                else:
+                    next(generator, None)
+            return generator_wrapper
+
+        if asyncio.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with tracer.start_span(span_name, attributes=attributes):
+                    return await fn(*args, **kwargs)
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with tracer.start_span(span_name, attributes=attributes):
+                return fn(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def traced_service(cls):
+    """Class decorator: wrap every static method of a service class in a span"""
+    for attr_name, attr in list(vars(cls).items()):
+        if isinstance(attr, staticmethod) and not attr_name.startswith("__"):
+            setattr(cls, attr_name, staticmethod(traced(f"{cls.__name__}.{attr_name}")(attr.__func__)))
+    return cls
+
+
+# === SQL ===
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parent = _current_span.get()
+    if parent is None:
+        return
+    operation = statement.lstrip().split(None, 1)[0].upper() if statement.strip() else "SQL"
+    context._trace_span = Span(operation, parent.trace_id, parent.span_id, SPAN_KIND_CLIENT, {
+        "db.system": conn.dialect.name,
+        "db.operation": operation,
+        "db.statement": statement[:MAX_STATEMENT_LENGTH],
+    })
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = getattr(context, "_trace_span", None)
+    if span is not None:
+        if cursor.rowcount is not None and cursor.rowcount >= 0:
+            span.set_attribute("db.rowcount", cursor.rowcount)
+        tracer.end(span)
+        context._trace_span = None
+
+
+def _handle_error(exception_context):
+    context = exception_context.execution_context
+    span = getattr(context, "_trace_span", None) if context is not None else None
+    if span is not None:
+        span.record_error(exception_context.original_exception)
+        tracer.end(span)
+        context._trace_span = None
+
+
+tracer = Tracer()
@@ -1,41 +1,47 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, text, make_url
 from sqlalchemy.exc import SQLAlchemyError
 from app.core.config import settings
+from app.database.database import engine
 import logging
 
 logger = logging.getLogger(__name__)
 
 
 def test_database_connection():
-    """Test database connection"""
+    """Test database connection using the shared application engine"""
     try:
-        engine = create_engine(settings.database_url)
-        connection = engine.connect()
-        connection.close()
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
         logger.info("Database connection successful!")
         return True
     except SQLAlchemyError as e:
-        logger.error(f"Database connection failed: {e}")
+        logger.error("Database connection failed: %s", e)
         return False
     except Exception as e:
-        logger.error(f"Unexpected error during database connection: {e}")
+        logger.error("Unexpected error during database connection: %s", e)
         return False
 
 
 def create_database_if_not_exists():
     """Create database if it doesn't exist"""
+    if make_url(settings.database_url).get_backend_name() != "mysql":
+        # SQLite and other stand-ins create the database on first connect
+        logger.info("Skipping database creation for non-MySQL backend")
+        return
+
     try:
         # Connect without specifying database
         base_url = f"mysql+pymysql://{settings.db_user}:{settings.db_password}@{settings.db_host}:{settings.db_port}"
-        engine = create_engine(base_url)
-        
-        with engine.connect() as connection:
-            # Use text() for raw SQL in SQLAlchemy 2.0
-            from sqlalchemy import text
-            connection.execute(text(f"CREATE DATABASE IF NOT EXISTS {settings.db_name}"))
-            connection.commit()
-            logger.info(f"Database '{settings.db_name}' created or already exists")
-            
+        server_engine = create_engine(base_url)
+
+        try:
+            with server_engine.connect() as connection:
+                connection.execute(text(f"CREATE DATABASE IF NOT EXISTS {settings.db_name}"))
+                connection.commit()
+                logger.info("Database '%s' created or already exists", settings.db_name)
+        finally:
+            server_engine.dispose()
+
     except SQLAlchemyError as e:
-        logger.error(f"Failed to create database: {e}")
-        raise e
\ No newline at end of file
+        logger.error("Failed to create database: %s", e)
+        raise e
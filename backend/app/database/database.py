@@ -1,24 +1,48 @@
-from sqlalchemy import create_engine
+from typing import Optional
+from sqlalchemy import create_engine, inspect
+from sqlalchemy.engine import make_url
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 from app.core.config import settings
+from app.core.tracing import traced_dependency
+from app.database.routing import ReplicaRouter, RoutingSession
+
+
+def _create_engine(url: str):
+    # Pool sizing applies to server databases; SQLite keeps its own pool class
+    pool_options = {}
+    if make_url(url).get_backend_name() != "sqlite":
+        pool_options = {"pool_size": settings.db_pool_size, "max_overflow": settings.db_max_overflow}
+    return create_engine(
+        url,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        echo=settings.debug,  # Log SQL queries in debug mode
+        **pool_options
+    )
+
 
 # Create SQLAlchemy engine
-engine = create_engine(
-    settings.database_url,
-    pool_pre_ping=True,
-    pool_recycle=300,
-    echo=settings.debug  # Log SQL queries in debug mode
-)
+engine = _create_engine(settings.database_url)
+
+# Read replicas, used by sessions from get_read_db (see app/database/routing.py)
+replica_engines = [_create_engine(url) for url in settings.get_replica_urls]
+replica_router = ReplicaRouter(replica_engines)
 
 # Create SessionLocal class
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# Objects keep their values after commit: sessions live for one request, and
+# re-reading every row a write just sent would double its round trips
+SessionLocal = sessionmaker(
+    class_=RoutingSession, router=replica_router,
+    autocommit=False, autoflush=False, expire_on_commit=False, bind=engine,
+)
 
 # Create Base class for models
 Base = declarative_base()
 
 
 # Dependency to get DB session
+@traced_dependency()
 def get_db():
     db = SessionLocal()
     try:
@@ -27,11 +51,67 @@ def get_db():
         db.close()
 
 
+# Dependency for read-only endpoints: SELECTs may go to a read replica
+@traced_dependency()
+def get_read_db():
+    db = SessionLocal(use_replicas=True)
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def commit_and_load(db: Session, *instances):
+    """
+    Commit, then make sure the instances' column values are all loaded
+
+    Replaces commit() followed by refresh(). Primary keys come back with the
+    INSERT and Python-side defaults are known after the flush, so usually
+    nothing is read. Columns the database generated itself (server defaults
+    it did not return) are read back, and only those, in one SELECT per
+    instance. The department and ward report timestamps are such columns on
+    purpose: their rows have always taken them from the database clock
+    (func.now()), and keeping one clock per column is worth that SELECT.
+    """
+    db.commit()
+    for instance in instances:
+        state = inspect(instance)
+        unloaded = [attr.key for attr in state.mapper.column_attrs if attr.key in state.unloaded]
+        if unloaded:
+            db.refresh(instance, attribute_names=unloaded)
+
+
+def warm_connection_pool(count: Optional[int] = None) -> int:
+    """
+    Open pool connections ahead of traffic so first requests skip the connect
+
+    Checks out `count` connections at once (the pool size by default) and
+    returns them to the pool. Returns how many were opened.
+    """
+    if count is None:
+        count = engine.pool.size() if hasattr(engine.pool, "size") else 1
+    connections = []
+    try:
+        for _ in range(count):
+            connections.append(engine.connect())
+    finally:
+        for connection in connections:
+            connection.close()
+    return len(connections)
+
+
 # Function to create all tables
 def create_tables():
-    """Create all database tables"""
+    """
+    Create all database tables directly from the models
+
+    Only for throwaway databases (benchmarks, local experiments). Real
+    databases are managed by Alembic migrations in the migrations/ directory.
+    """
     # Import all models to ensure they are registered with Base
     from app.models import Department, User  # Import all models here
     from app.models.ward1_monthly_report import Ward1MonthlyReport
+    from app.models.revoked_token import RevokedToken
+    from app.models.refresh_token import RefreshToken
     
     Base.metadata.create_all(bind=engine)
\ No newline at end of file
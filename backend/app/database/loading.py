@@ -0,0 +1,59 @@
+"""
+Relationship loading strategies
+
+Services name the relationships a method's callers will read by passing one
+of the option tuples below to the query, e.g.
+
+    db.query(User).options(*USER_WITH_DEPARTMENT)
+
+so the related rows arrive with the first SELECT instead of one lazy load per
+object. Many-to-one relationships use joinedload (one query, no extra rows);
+collections would use selectinload (one IN query, no row multiplication).
+
+Strict loading (ORM_STRICT_LOADING, on by default in development) adds
+raiseload("*", sql_only=True) to every ORM SELECT, so reading a relationship
+the query did not load raises instead of quietly issuing a SELECT. Options
+named by the query override it for their own paths, and relationships that
+resolve from the identity map without SQL still load. Production keeps plain
+lazy loading as a fallback.
+"""
+import logging
+
+from sqlalchemy import event
+from sqlalchemy.orm import joinedload, raiseload
+
+from app.core.config import settings
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+# Users as returned by the API: their department name is part of every response
+USER_WITH_DEPARTMENT = (joinedload(User.department),)
+
+_STRICT_OPTION = raiseload("*", sql_only=True)
+
+
+def strict_loading_enabled() -> bool:
+    """ORM_STRICT_LOADING if set, else on in development"""
+    if settings.orm_strict_loading is not None:
+        return settings.orm_strict_loading
+    return settings.environment == "development"
+
+
+def _add_strict_loading(orm_execute_state):
+    # Refreshes of expired columns and the lazy loads themselves are left alone
+    if (
+        orm_execute_state.is_select
+        and not orm_execute_state.is_column_load
+        and not orm_execute_state.is_relationship_load
+    ):
+        orm_execute_state.statement = orm_execute_state.statement.options(_STRICT_OPTION)
+
+
+def install_strict_loading(session_factory) -> bool:
+    """Make unplanned lazy loads raise in sessions from session_factory (if enabled)"""
+    if not strict_loading_enabled():
+        return False
+    event.listen(session_factory, "do_orm_execute", _add_strict_loading)
+    logger.info("Strict relationship loading enabled: lazy loads raise")
+    return True
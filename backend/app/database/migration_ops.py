@@ -0,0 +1,58 @@
+"""
+Online-safe schema operations for Alembic revisions
+
+On MySQL, index changes are issued with ALGORITHM=INPLACE, LOCK=NONE so the
+table stays readable and writable while the index builds. If the server cannot
+honour that, the statement fails instead of silently taking a table lock.
+Other dialects fall back to the regular Alembic operations.
+"""
+from typing import List
+
+from alembic import op
+
+
+def _is_mysql() -> bool:
+    return op.get_bind().dialect.name == "mysql"
+
+
+def create_index_online(index_name: str, table_name: str, columns: List[str], unique: bool = False):
+    """Add an index without blocking reads or writes on MySQL"""
+    if _is_mysql():
+        kind = "UNIQUE INDEX" if unique else "INDEX"
+        column_list = ", ".join(f"`{column}`" for column in columns)
+        op.execute(
+            f"ALTER TABLE `{table_name}` ADD {kind} `{index_name}` ({column_list}), "
+            f"ALGORITHM=INPLACE, LOCK=NONE"
+        )
+    else:
+        op.create_index(index_name, table_name, columns, unique=unique)
+
+
+def drop_index_online(index_name: str, table_name: str):
+    """Drop an index without blocking reads or writes on MySQL"""
+    if _is_mysql():
+        op.execute(f"ALTER TABLE `{table_name}` DROP INDEX `{index_name}`, ALGORITHM=INPLACE, LOCK=NONE")
+    else:
+        op.drop_index(index_name, table_name=table_name)
+
+
+def create_fulltext_index(index_name: str, table_name: str, columns: List[str], parser: str = "ngram"):
+    """
+    Add a MySQL FULLTEXT index (no-op on other dialects)
+
+    InnoDB builds FULLTEXT indexes in place but needs LOCK=SHARED: reads
+    continue during the build, writes wait until it finishes.
+    """
+    if not _is_mysql():
+        return
+    column_list = ", ".join(f"`{column}`" for column in columns)
+    op.execute(
+        f"ALTER TABLE `{table_name}` ADD FULLTEXT INDEX `{index_name}` ({column_list}) "
+        f"WITH PARSER {parser}, ALGORITHM=INPLACE, LOCK=SHARED"
+    )
+
+
+def drop_fulltext_index(index_name: str, table_name: str):
+    """Drop a MySQL FULLTEXT index (no-op on other dialects)"""
+    if _is_mysql():
+        drop_index_online(index_name, table_name)
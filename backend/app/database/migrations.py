@@ -0,0 +1,128 @@
+"""
+Alembic migration helpers used at application startup
+
+The startup check reads the alembic_version stamp and compares it with the
+head revision, which is read from the revision identifiers at the top of the
+migration scripts (text only, once per process). Migration scripts are
+imported and run only when the stamp is behind the head revision.
+"""
+from functools import lru_cache
+from pathlib import Path
+from typing import Optional
+import logging
+import re
+
+from alembic import command
+from alembic.config import Config
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect, text
+from sqlalchemy.exc import SQLAlchemyError
+
+from app.core.config import settings
+from app.database.database import engine
+
+logger = logging.getLogger(__name__)
+
+BACKEND_DIR = Path(__file__).resolve().parents[2]
+
+# Revision matching the tables that create_all used to build
+BASELINE_REVISION = "0001"
+
+# Identifier lines as written by the script template, e.g. down_revision: Union[str, None] = "0001"
+_REVISION_LINE = re.compile(r'^(revision|down_revision)\s*(?::[^=]*)?=\s*(None|"[^"]*"|\'[^\']*\')\s*$', re.M)
+
+
+def get_alembic_config() -> Config:
+    """Build the Alembic config independent of the current working directory"""
+    config = Config(str(BACKEND_DIR / "alembic.ini"))
+    config.set_main_option("script_location", str(BACKEND_DIR / "migrations"))
+    return config
+
+
+def _scan_head_revision() -> Optional[str]:
+    """Head from the scripts' identifier lines, or None if they do not form a single chain"""
+    revisions, parents = set(), set()
+    for path in (BACKEND_DIR / "migrations" / "versions").glob("*.py"):
+        found = dict(_REVISION_LINE.findall(path.read_text(encoding="utf-8")))
+        if "revision" not in found or "down_revision" not in found:
+            return None
+        revisions.add(found["revision"].strip("'\""))
+        if found["down_revision"] != "None":
+            parents.add(found["down_revision"].strip("'\""))
+    heads = revisions - parents
+    return heads.pop() if len(heads) == 1 else None
+
+
+@lru_cache(maxsize=1)
+def get_head_revision() -> Optional[str]:
+    """Head revision from the migration scripts (no database access, computed once)"""
+    head = _scan_head_revision()
+    if head is None:
+        # Merges, branches or hand-written headers: let Alembic load the scripts
+        head = ScriptDirectory.from_config(get_alembic_config()).get_current_head()
+    return head
+
+
+def get_current_revision(bind=None) -> Optional[str]:
+    """Revision stamped in the database, or None if it has never been stamped"""
+    bind = bind or engine
+    try:
+        with bind.connect() as connection:
+            return connection.execute(text("SELECT version_num FROM alembic_version")).scalar()
+    except SQLAlchemyError:
+        return None
+
+
+def is_schema_current(bind=None) -> bool:
+    """Check with a single query whether the database is at the head revision"""
+    current = get_current_revision(bind)
+    return current is not None and current == get_head_revision()
+
+
+def _run_command(bind, fn, *args):
+    config = get_alembic_config()
+    with bind.begin() as connection:
+        config.attributes["connection"] = connection
+        fn(config, *args)
+
+
+def upgrade_database(revision: str = "head", bind=None):
+    """Upgrade the database schema to the given revision"""
+    bind = bind or engine
+    current = get_current_revision(bind)
+
+    if current is None and inspect(bind).has_table("departments"):
+        # Database was built by create_all before migrations existed
+        logger.info("Existing schema without revision stamp - stamping baseline %s", BASELINE_REVISION)
+        _run_command(bind, command.stamp, BASELINE_REVISION)
+
+    _run_command(bind, command.upgrade, revision)
+    logger.info("Database schema upgraded to revision %s", get_current_revision(bind))
+
+
+def ensure_schema_current() -> bool:
+    """
+    Bring the schema to head if needed
+
+    Returns True when the schema is at head after the call. With
+    AUTO_MIGRATE disabled a stale schema is only reported, so migrations
+    can run as a separate deploy step.
+    """
+    current = get_current_revision()
+    head = get_head_revision()
+
+    if current == head:
+        logger.info("Database schema is current at revision %s", current)
+        return True
+
+    if not settings.auto_migrate:
+        logger.error(
+            "Database schema is at revision %s, expected %s. "
+            "Run 'alembic upgrade head' before starting the API.",
+            current, head
+        )
+        return False
+
+    logger.info("Migrating database schema from revision %s to %s", current, head)
+    upgrade_database("head")
+    return True
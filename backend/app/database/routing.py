@@ -0,0 +1,213 @@
+"""
+Read replica routing
+
+Sessions opened with get_read_db (the GET endpoints) send their SELECTs to a
+read replica; everything else goes to the primary:
+- Writes, flushes and any statement that is not a SELECT use the primary,
+  and once a session has written, its reads do too.
+- Read-your-writes: after a user commits a write, that user's reads stay on
+  the primary for REPLICA_STICKY_SECONDS (at least REPLICA_MAX_LAG_SECONDS),
+  so they never see a replica from before their own change. Requests are
+  matched by authenticated user and by the bearer token they carry, since
+  some read routes do not authenticate. Requests with neither (client
+  addresses are shared behind proxies) are not tracked. The window is kept
+  per worker.
+- Lag: a background thread measures each replica's lag every
+  REPLICA_LAG_CHECK_SECONDS. Replicas further behind than
+  REPLICA_MAX_LAG_SECONDS, unreachable, not replicating, or not checked
+  recently are skipped; with none left, reads fall back to the primary.
+
+A session picks its replica on its first read (when the request's user is
+known) and keeps it, so all reads in a request see the same snapshot.
+With no DATABASE_REPLICA_URLS every session simply uses the primary.
+"""
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, Hashable, List, Optional
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session
+from sqlalchemy.sql import Select
+from sqlalchemy.sql.dml import UpdateBase
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.request_context import get_request_context
+
+logger = logging.getLogger(__name__)
+
+db_read_routes = metrics.counter(
+    "db_read_routes", "Read sessions by where their SELECTs went (replica, sticky, lagging)", ("target",)
+)
+
+# Sticky entries beyond this are pruned of expired ones before adding more
+MAX_STICKY_REQUESTERS = 10000
+
+
+def _measure_lag(engine: Engine) -> Optional[float]:
+    """Seconds the replica is behind its source, or None if it is not replicating"""
+    with engine.connect() as connection:
+        if connection.dialect.name != "mysql":
+            # No replication status to read; reachable is all we can tell
+            connection.execute(text("SELECT 1"))
+            return 0.0
+        try:
+            row = connection.execute(text("SHOW REPLICA STATUS")).mappings().first()
+            column = "Seconds_Behind_Source"
+        except DBAPIError:
+            # MySQL before 8.0.22
+            row = connection.execute(text("SHOW SLAVE STATUS")).mappings().first()
+            column = "Seconds_Behind_Master"
+        if row is None or row[column] is None:
+            return None
+        return float(row[column])
+
+
+def _requester_keys() -> List[Hashable]:
+    """Keys identifying who the current request is for: its user and its bearer token"""
+    context = get_request_context()
+    if context is None:
+        return []
+    keys: List[Hashable] = []
+    if context.user_id is not None:
+        keys.append(("user", context.user_id))
+    for name, value in context.scope.get("headers", ()):
+        if name == b"authorization":
+            # Only used for routing, so the token need not be verified here
+            keys.append(("token", hash(value)))
+            break
+    return keys
+
+
+class Replica:
+    """One replica engine and its last measured lag"""
+
+    def __init__(self, engine: Engine):
+        self.engine = engine
+        self.name = engine.url.render_as_string(hide_password=True)
+        self.lag: Optional[float] = None  # None = unknown, unreachable or not replicating
+        self.checked = 0.0
+
+    def usable(self, now: float) -> bool:
+        # A stalled monitor must not leave an old, good measurement in force
+        fresh = now - self.checked <= settings.replica_lag_check_seconds * 3
+        return fresh and self.lag is not None and self.lag <= settings.replica_max_lag_seconds
+
+    def check(self):
+        try:
+            lag = _measure_lag(self.engine)
+            if lag is None:
+                logger.warning("Replica %s is not replicating - reads use the primary", self.name)
+        except Exception as e:
+            logger.warning("Replica %s lag check failed: %s", self.name, e)
+            lag = None
+        self.lag = lag
+        self.checked = time.monotonic()
+
+
+class ReplicaRouter:
+    """Chooses where read sessions read from"""
+
+    def __init__(self, engines: List[Engine]):
+        self.replicas = [Replica(engine) for engine in engines]
+        self._sticky: Dict[Hashable, float] = {}  # requester key -> monotonic time reads may leave the primary
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def record_write(self, keys: List[Hashable]):
+        """Keep the requester's reads on the primary until replicas have their write"""
+        if not keys or not self.replicas:
+            return
+        now = time.monotonic()
+        window = max(settings.replica_sticky_seconds, settings.replica_max_lag_seconds)
+        with self._lock:
+            if len(self._sticky) >= MAX_STICKY_REQUESTERS:
+                self._sticky = {key: until for key, until in self._sticky.items() if until > now}
+            for key in keys:
+                self._sticky[key] = now + window
+
+    def read_engine(self) -> Optional[Engine]:
+        """Replica engine for the current request's reads, or None for the primary"""
+        if not self.replicas:
+            return None
+        now = time.monotonic()
+        if any(self._sticky.get(key, 0.0) > now for key in _requester_keys()):
+            db_read_routes.inc(target="primary_sticky")
+            return None
+        usable = [replica for replica in self.replicas if replica.usable(now)]
+        if not usable:
+            db_read_routes.inc(target="primary_lagging")
+            return None
+        db_read_routes.inc(target="replica")
+        return random.choice(usable).engine
+
+    def check_replicas(self):
+        for replica in self.replicas:
+            replica.check()
+
+    def start_monitor(self):
+        """Measure replica lag on a daemon thread until stop_monitor(); reads use the primary until then"""
+        if not self.replicas or self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="replica-lag-monitor", daemon=True)
+        self._thread.start()
+
+    def stop_monitor(self):
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def _run(self):
+        while True:
+            self.check_replicas()
+            if self._stop.wait(settings.replica_lag_check_seconds):
+                return
+
+    def stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "replicas": [
+                {"name": replica.name, "lag_seconds": replica.lag, "usable": replica.usable(now)}
+                for replica in self.replicas
+            ],
+            "sticky_requesters": sum(1 for until in list(self._sticky.values()) if until > now),
+        }
+
+
+class RoutingSession(Session):
+    """
+    Session that reads from a replica when opened for reading (use_replicas)
+
+    Every session is a RoutingSession; those from get_db never use replicas.
+    """
+
+    def __init__(self, *args, router: Optional[ReplicaRouter] = None, use_replicas: bool = False, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.router = router
+        self.use_replicas = use_replicas
+        self.wrote = False
+        self._read_bind: Optional[Engine] = None
+
+    def get_bind(self, mapper=None, clause=None, **kwargs):
+        primary = super().get_bind(mapper, clause=clause, **kwargs)
+        if self._flushing or isinstance(clause, UpdateBase):
+            self.wrote = True
+            return primary
+        if not self.use_replicas or self.wrote or self.router is None or not isinstance(clause, Select):
+            return primary
+        if self._read_bind is None:
+            self._read_bind = self.router.read_engine() or primary
+        return self._read_bind
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _record_write(session: RoutingSession):
+    if session.wrote and session.router is not None:
+        session.router.record_write(_requester_keys())
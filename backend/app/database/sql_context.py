@@ -0,0 +1,89 @@
+"""
+Request correlation for SQL statements
+
+- Statements run during a request get a sqlcommenter-style comment, e.g.
+  SELECT ... /*request_id='3f2a..',route='%2Fapi%2Fv1%2Fusers%2F'*/
+  so the database's slow query log and processlist point back to the request
+- Every statement's latency goes into the db_query_duration_seconds histogram
+- Statements slower than SLOW_QUERY_MS are logged as warnings; the log record
+  carries the request ID like any other record logged during the request
+"""
+import logging
+import time
+from typing import Dict
+from urllib.parse import quote
+
+from sqlalchemy import event
+
+from app.core.config import settings
+from app.core.metrics import db_query_duration, db_slow_queries
+from app.core.request_context import get_request_context
+from app.core.tracing import current_traceparent
+
+logger = logging.getLogger(__name__)
+
+MAX_LOGGED_STATEMENT_LENGTH = 2000
+
+
+def sql_comment(fields: Dict[str, str]) -> str:
+    """Serialize fields as a sqlcommenter comment (sorted keys, URL-encoded values)"""
+    pairs = ",".join(
+        f"{quote(key, safe='')}='{quote(str(value), safe='')}'" for key, value in sorted(fields.items())
+    )
+    return f"/*{pairs}*/"
+
+
+def _comment_fields() -> Dict[str, str]:
+    context = get_request_context()
+    if context is None:
+        return {}
+    fields = {"request_id": context.request_id, "route": context.route, "framework": "fastapi"}
+    traceparent = current_traceparent()
+    if traceparent:
+        fields["traceparent"] = traceparent
+    return fields
+
+
+def _operation(statement: str) -> str:
+    stripped = statement.lstrip()
+    return stripped.split(None, 1)[0].upper() if stripped else "SQL"
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+    if not settings.sql_comments_enabled or "/*" in statement:
+        return statement, parameters
+    fields = _comment_fields()
+    if not fields:
+        return statement, parameters
+
+    body = statement.rstrip()
+    if body.endswith(";"):
+        return f"{body[:-1]} {sql_comment(fields)};", parameters
+    return f"{body} {sql_comment(fields)}", parameters
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, "_query_started", None)
+    if started is None:
+        return
+    elapsed = time.perf_counter() - started
+    operation = _operation(statement)
+    db_query_duration.observe(elapsed, operation=operation)
+
+    if elapsed * 1000 >= settings.slow_query_ms:
+        db_slow_queries.inc(operation=operation)
+        logger.warning(
+            "Slow query (%.1f ms): %s",
+            elapsed * 1000, statement[:MAX_LOGGED_STATEMENT_LENGTH],
+            extra={"duration_ms": round(elapsed * 1000, 1), "db_operation": operation,
+                   "executemany": executemany},
+        )
+
+
+def instrument_engine(engine):
+    """Add request comments, latency metrics and slow-query logging to an engine"""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute, retval=True)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
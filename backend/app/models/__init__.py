@@ -2,5 +2,7 @@
 from .department import Department
 from .user import User
 from .ward1_monthly_report import Ward1MonthlyReport
+from .revoked_token import RevokedToken
+from .refresh_token import RefreshToken
 
-__all__ = ["Department", "User", "Ward1MonthlyReport"]
\ No newline at end of file
+__all__ = ["Department", "User", "Ward1MonthlyReport", "RevokedToken", "RefreshToken"]
\ No newline at end of file
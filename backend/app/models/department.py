@@ -1,14 +1,25 @@
-from sqlalchemy import Column, Integer, String, DateTime
+from sqlalchemy import Column, Integer, String, DateTime, Index
 from sqlalchemy.sql import func
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from app.database.database import Base
 
 
+def normalize_department_name(name: str) -> str:
+    """Canonical form used for duplicate checks: trimmed, single-spaced, case-folded"""
+    return " ".join(name.split()).casefold()
+
+
+def _normalized_name_default(context) -> str:
+    """Column default so Core bulk inserts also get a normalized name"""
+    return normalize_department_name(context.get_current_parameters()["name"])
+
+
 class Department(Base):
     __tablename__ = "departments"
 
     id = Column(Integer, primary_key=True, index=True, autoincrement=True)
     name = Column(String(100), unique=True, nullable=False, index=True)
+    name_normalized = Column(String(100), unique=True, nullable=False, index=True, default=_normalized_name_default)
     status = Column(String(20), nullable=False, default="Active")
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
@@ -16,5 +27,22 @@ class Department(Base):
     # Relationships
     users = relationship("User", back_populates="department")
 
+    __table_args__ = (
+        # Active-department dropdowns: WHERE status = ? ORDER BY name
+        Index("ix_departments_status_name", "status", "name"),
+        # Fuzzy department search (MySQL only; see app/services/search_service.py)
+        Index(
+            "ft_departments_name", "name",
+            mysql_prefix="FULLTEXT", mysql_with_parser="ngram",
+        ).ddl_if(dialect="mysql"),
+    )
+
+    @validates("name")
+    def _sync_name_normalized(self, key, value):
+        """Keep name_normalized in step with name on create and rename"""
+        if value is not None:
+            self.name_normalized = normalize_department_name(value)
+        return value
+
     def __repr__(self):
-        return f"<Department(id={self.id}, name='{self.name}', status='{self.status}')>"
\ No newline at end of file
+        return f"<Department(id={self.id}, name='{self.name}', status='{self.status}')>"
@@ -0,0 +1,28 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from datetime import datetime
+from app.database.database import Base
+
+
+class RefreshToken(Base):
+    """
+    Opaque refresh tokens, stored as SHA-256 hashes
+
+    Every refresh rotates the token: the presented row is marked used and a
+    new row is issued in the same family. Presenting a used token again means
+    it was copied, so the whole family is revoked (see
+    app/services/refresh_token_service.py).
+    """
+    __tablename__ = "refresh_tokens"
+
+    id = Column(Integer, primary_key=True, index=True)
+    token_hash = Column(String(64), unique=True, nullable=False)
+    family_id = Column(String(32), nullable=False, index=True)  # One login session
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
+
+    # Naive UTC, like the other timestamps written from Python
+    expires_at = Column(DateTime, nullable=False, index=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    used_at = Column(DateTime, nullable=True)  # Rotated, or revoked at logout / on reuse
+
+    def __repr__(self):
+        return f"<RefreshToken(id={self.id}, user_id={self.user_id}, family_id={self.family_id})>"
@@ -0,0 +1,24 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from datetime import datetime
+from app.database.database import Base
+
+
+class RevokedToken(Base):
+    """
+    Access tokens revoked before their expiry (logout), keyed by JWT ID
+
+    Shared by all workers; each keeps an in-memory copy (see
+    app/core/token_revocation.py) and pulls new rows periodically. Rows can
+    be deleted once expires_at has passed, as the token is dead anyway.
+    """
+    __tablename__ = "revoked_tokens"
+
+    jti = Column(String(64), primary_key=True)
+    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=True, index=True)
+
+    # Naive UTC, like the other timestamps written from Python
+    expires_at = Column(DateTime, nullable=False, index=True)
+    revoked_at = Column(DateTime, nullable=False, default=datetime.utcnow, index=True)
+
+    def __repr__(self):
+        return f"<RevokedToken(jti={self.jti}, user_id={self.user_id}, expires_at={self.expires_at})>"
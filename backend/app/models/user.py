@@ -1,8 +1,9 @@
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
-import bcrypt
 from app.database.database import Base
+from app.core.tracing import tracer
+from app.utils.password_hashing import hash_password, verify_password
 
 
 class User(Base):
@@ -16,12 +17,12 @@ class User(Base):
     
     # Basic user information - ONLY what frontend needs
     employee_id = Column(String(50), unique=True, index=True, nullable=False)
-    name = Column(String(255), nullable=False)
+    name = Column(String(255), nullable=False, index=True)
     password_hash = Column(String(255), nullable=False)
     
     # Role and department
-    role = Column(String(100), nullable=False)  # Doctor, Nurse, Lab Technician, etc.
-    department_id = Column(Integer, ForeignKey("departments.id"), nullable=False)
+    role = Column(String(100), nullable=False, index=True)  # Doctor, Nurse, Lab Technician, etc.
+    department_id = Column(Integer, ForeignKey("departments.id"), nullable=False, index=True)
     
     # Timestamps
     created_at = Column(DateTime, default=datetime.utcnow)
@@ -30,14 +31,23 @@ class User(Base):
     # Relationships
     department = relationship("Department", back_populates="users")
     
+    __table_args__ = (
+        # Staff directory search (MySQL only; see app/services/search_service.py)
+        Index(
+            "ft_users_name_employee_id", "name", "employee_id",
+            mysql_prefix="FULLTEXT", mysql_with_parser="ngram",
+        ).ddl_if(dialect="mysql"),
+    )
+    
     def set_password(self, password: str):
-        """Hash and set password"""
-        salt = bcrypt.gensalt()
-        self.password_hash = bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
+        """Hash and set password (see app/utils/password_hashing.py for the policy)"""
+        with tracer.start_span("password.hash"):
+            self.password_hash = hash_password(password)
     
     def check_password(self, password: str) -> bool:
         """Check if provided password matches hash"""
-        return bcrypt.checkpw(password.encode('utf-8'), self.password_hash.encode('utf-8'))
+        with tracer.start_span("password.verify"):
+            return verify_password(password, self.password_hash)
     
     def to_dict(self):
         """Convert user to dictionary - only fields that exist"""
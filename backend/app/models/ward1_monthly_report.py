@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DECIMAL, Date, DateTime, Enum, ForeignKey, CheckConstraint
+from sqlalchemy import Column, Integer, String, Boolean, DECIMAL, Date, DateTime, Enum, ForeignKey, CheckConstraint, Index
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database.database import Base
@@ -78,8 +78,8 @@ class Ward1MonthlyReport(Base):
     status = Column(Enum(ReportStatus), default=ReportStatus.draft, nullable=False)
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
-    created_by = Column(Integer, ForeignKey("users.id"), nullable=True)
-    last_updated_by = Column(Integer, ForeignKey("users.id"), nullable=True)
+    created_by = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
+    last_updated_by = Column(Integer, ForeignKey("users.id"), nullable=True, index=True)
     
     # === RELATIONSHIPS ===
     creator = relationship("User", foreign_keys=[created_by], back_populates=None)
@@ -96,6 +96,10 @@ class Ward1MonthlyReport(Base):
         CheckConstraint('total_beds_hdu >= 0', name='check_hdu_beds'),
         CheckConstraint('total_beds_ward >= 0', name='check_ward_beds'),
         CheckConstraint('total_beds_isolation >= 0', name='check_isolation_beds'),
+        
+        # === INDEXES ===
+        # Yearly statistics and status counts: WHERE year = ? [AND status = ?]
+        Index('ix_ward1_monthly_reports_year_status', 'year', 'status'),
     )
     
     def __repr__(self):
@@ -5,6 +5,8 @@ from pydantic import BaseModel, Field, validator
 from typing import Optional, Dict, Any
 from datetime import datetime
 
+from app.core.rbac import ROLE_PERMISSIONS  # noqa: F401  (role definitions live with the access control engine)
+
 
 class LoginRequest(BaseModel):
     """Schema for login request"""
@@ -36,11 +38,13 @@ class LoginResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
     expires_in: int  # Token expiration time in seconds
+    refresh_token: str  # Opaque; exchanged at /auth/refresh, single use
+    refresh_expires_in: int
 
 
 class RefreshTokenRequest(BaseModel):
     """Schema for token refresh request"""
-    token: str = Field(..., min_length=1)
+    refresh_token: str = Field(..., min_length=1)
 
 
 class RefreshTokenResponse(BaseModel):
@@ -50,6 +54,13 @@ class RefreshTokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
     expires_in: int
+    refresh_token: str  # Replaces the one sent, which is now used up
+    refresh_expires_in: int
+
+
+class LogoutRequest(BaseModel):
+    """Schema for logout request"""
+    refresh_token: Optional[str] = None  # Also end the refresh token's session
 
 
 class LogoutResponse(BaseModel):
@@ -91,68 +102,3 @@ class DepartmentAccess(BaseModel):
     allowed_roles: list[str]
     restricted_areas: Optional[list[str]] = None
 
-
-# Common role definitions
-ROLE_PERMISSIONS = {
-    "Administrator": {
-        "permissions": [
-            "user.create", "user.read", "user.update", "user.delete",
-            "department.create", "department.read", "department.update", "department.delete",
-            "system.admin", "reports.all"
-        ],
-        "description": "Full system access"
-    },
-    "Doctor": {
-        "permissions": [
-            "patient.create", "patient.read", "patient.update",
-            "medical_record.create", "medical_record.read", "medical_record.update",
-            "prescription.create", "prescription.read", "prescription.update",
-            "department.read", "user.read"
-        ],
-        "description": "Medical staff with patient care access"
-    },
-    "Nurse": {
-        "permissions": [
-            "patient.read", "patient.update",
-            "medical_record.read", "medical_record.update",
-            "prescription.read", "department.read"
-        ],
-        "description": "Nursing staff with patient care access"
-    },
-    "Lab Technician": {
-        "permissions": [
-            "patient.read", "lab_result.create", "lab_result.read", 
-            "lab_result.update", "department.read"
-        ],
-        "description": "Laboratory staff access"
-    },
-    "Pharmacist": {
-        "permissions": [
-            "prescription.read", "prescription.update", "medication.create",
-            "medication.read", "medication.update", "department.read"
-        ],
-        "description": "Pharmacy staff access"
-    },
-    "Receptionist": {
-        "permissions": [
-            "patient.create", "patient.read", "patient.update",
-            "appointment.create", "appointment.read", "appointment.update",
-            "department.read"
-        ],
-        "description": "Front desk and appointment management"
-    },
-    "Radiologist": {
-        "permissions": [
-            "patient.read", "imaging.create", "imaging.read", 
-            "imaging.update", "department.read"
-        ],
-        "description": "Radiology department access"
-    },
-    "Physiotherapist": {
-        "permissions": [
-            "patient.read", "therapy.create", "therapy.read", 
-            "therapy.update", "department.read"
-        ],
-        "description": "Physical therapy access"
-    }
-}
\ No newline at end of file
@@ -0,0 +1,11 @@
+"""
+Helpers for reporting schema validation failures of batch rows
+"""
+from pydantic import ValidationError
+
+
+def validation_error_message(error: ValidationError) -> str:
+    """One line per failed field, e.g. "employee_id: str type expected; password: field required" """
+    return "; ".join(
+        f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in error.errors()
+    )
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional, List
+from typing import Any, Dict, Optional, List
 from datetime import datetime
 import re
 
@@ -131,4 +131,30 @@ class UserLoginResponse(BaseModel):
     success: bool
     message: str
     user: Optional[UserResponse] = None
-    token: Optional[str] = None
\ No newline at end of file
+    token: Optional[str] = None
+
+# Upper bound on rows per bulk request (password hashing dominates its cost)
+MAX_BULK_USERS = 500
+
+
+class BulkUserCreate(BaseModel):
+    """Schema for creating many users at once; rows are validated one by one"""
+    users: List[Dict[str, Any]] = Field(..., min_length=1, max_length=MAX_BULK_USERS)
+
+
+class BulkUserResult(BaseModel):
+    """Outcome for one row of a bulk create"""
+    index: int
+    employee_id: Optional[str] = None
+    success: bool
+    user: Optional[UserResponse] = None
+    error: Optional[str] = None
+
+
+class BulkCreateUsersResponse(BaseModel):
+    """Schema for bulk create response"""
+    success: bool
+    message: str
+    created: int
+    failed: int
+    results: List[BulkUserResult]
@@ -1,5 +1,5 @@
 from pydantic import BaseModel, Field, validator
-from typing import Optional
+from typing import Any, Dict, List, Optional
 from datetime import date, datetime
 from enum import Enum
 
@@ -259,6 +259,34 @@ class Ward1MonthlyReportSubmit(BaseModel):
         }
 
 
+# Upper bound on months per batch save (two years of catch-up)
+MAX_BATCH_REPORTS = 24
+
+
+class Ward1MonthlyReportBatch(BaseModel):
+    """Schema for saving several months at once; each month is validated separately"""
+    reports: List[Dict[str, Any]] = Field(..., min_length=1, max_length=MAX_BATCH_REPORTS)
+
+
+class Ward1BatchItemResult(BaseModel):
+    """Outcome for one month of a batch save"""
+    index: int
+    year: Optional[int] = None
+    month: Optional[int] = None
+    success: bool
+    action: Optional[str] = None  # "created" or "updated"
+    error: Optional[str] = None
+
+
+class Ward1BatchSaveResponse(BaseModel):
+    """Schema for batch save response"""
+    success: bool
+    message: str
+    saved: int
+    failed: int
+    results: List[Ward1BatchItemResult]
+
+
 class MessageResponse(BaseModel):
     """Schema for API success/error messages"""
     success: bool
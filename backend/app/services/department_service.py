@@ -1,13 +1,17 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from app.models.department import Department
+from app.database.database import commit_and_load
+from app.models.department import Department, normalize_department_name
 from app.schemas.department import DepartmentCreate, DepartmentUpdate
+from app.core.cache import department_cache
+from app.core.tracing import traced_service
 from typing import List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+@traced_service
 class DepartmentService:
     """Service layer for department operations"""
     
@@ -23,19 +27,19 @@ class DepartmentService:
             )
             
             db.add(db_department)
-            db.commit()
-            db.refresh(db_department)
+            commit_and_load(db, db_department)
+            department_cache.clear()
             
-            logger.info(f"Department '{db_department.name}' created successfully with ID: {db_department.id}")
+            logger.info("Department '%s' created successfully with ID: %s", db_department.name, db_department.id)
             return db_department
             
         except IntegrityError as e:
             db.rollback()
-            logger.error(f"Failed to create department '{department_data.name}': {str(e)}")
+            logger.error("Failed to create department '%s': %s", department_data.name, e)
             raise ValueError(f"Department with name '{department_data.name}' already exists")
         except Exception as e:
             db.rollback()
-            logger.error(f"Unexpected error creating department: {str(e)}")
+            logger.error("Unexpected error creating department: %s", e)
             raise e
     
     @staticmethod
@@ -45,10 +49,10 @@ class DepartmentService:
         """
         try:
             departments = db.query(Department).order_by(Department.name).all()
-            logger.info(f"Retrieved {len(departments)} departments")
+            logger.info("Retrieved %s departments", len(departments))
             return departments
         except Exception as e:
-            logger.error(f"Error retrieving departments: {str(e)}")
+            logger.error("Error retrieving departments: %s", e)
             raise e
     
     @staticmethod
@@ -59,24 +63,38 @@ class DepartmentService:
         try:
             department = db.query(Department).filter(Department.id == department_id).first()
             if department:
-                logger.info(f"Retrieved department: {department.name}")
+                logger.info("Retrieved department: %s", department.name)
             else:
-                logger.warning(f"Department with ID {department_id} not found")
+                logger.warning("Department with ID %s not found", department_id)
             return department
         except Exception as e:
-            logger.error(f"Error retrieving department by ID {department_id}: {str(e)}")
+            logger.error("Error retrieving department by ID %s: %s", department_id, e)
             raise e
     
     @staticmethod
     def get_department_by_name(db: Session, name: str) -> Optional[Department]:
         """
-        Get department by name
+        Get department by exact name (case and whitespace insensitive)
         """
         try:
-            department = db.query(Department).filter(Department.name.ilike(f"%{name}%")).first()
+            department = db.query(Department).filter(
+                Department.name_normalized == normalize_department_name(name)
+            ).first()
             return department
         except Exception as e:
-            logger.error(f"Error retrieving department by name '{name}': {str(e)}")
+            logger.error("Error retrieving department by name '%s': %s", name, e)
+            raise e
+    
+    @staticmethod
+    def search_departments(db: Session, search_term: str, limit: int = 50) -> List[Department]:
+        """
+        Fuzzy search departments by name
+        """
+        try:
+            from app.services.search_service import SearchService
+            return SearchService.search_departments(db, search_term, limit)
+        except Exception as e:
+            logger.error("Error searching departments: %s", e)
             raise e
     
     @staticmethod
@@ -87,7 +105,7 @@ class DepartmentService:
         try:
             department = db.query(Department).filter(Department.id == department_id).first()
             if not department:
-                logger.warning(f"Department with ID {department_id} not found for update")
+                logger.warning("Department with ID %s not found for update", department_id)
                 return None
             
             # Update only provided fields
@@ -95,19 +113,19 @@ class DepartmentService:
             for field, value in update_data.items():
                 setattr(department, field, value)
             
-            db.commit()
-            db.refresh(department)
+            commit_and_load(db, department)
+            department_cache.clear()
             
-            logger.info(f"Department '{department.name}' updated successfully")
+            logger.info("Department '%s' updated successfully", department.name)
             return department
             
         except IntegrityError as e:
             db.rollback()
-            logger.error(f"Failed to update department: {str(e)}")
+            logger.error("Failed to update department: %s", e)
             raise ValueError("Department name already exists")
         except Exception as e:
             db.rollback()
-            logger.error(f"Unexpected error updating department: {str(e)}")
+            logger.error("Unexpected error updating department: %s", e)
             raise e
     
     @staticmethod
@@ -118,18 +136,19 @@ class DepartmentService:
         try:
             department = db.query(Department).filter(Department.id == department_id).first()
             if not department:
-                logger.warning(f"Department with ID {department_id} not found for deletion")
+                logger.warning("Department with ID %s not found for deletion", department_id)
                 return False
             
             db.delete(department)
             db.commit()
+            department_cache.clear()
             
-            logger.info(f"Department '{department.name}' deleted successfully")
+            logger.info("Department '%s' deleted successfully", department.name)
             return True
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error deleting department: {str(e)}")
+            logger.error("Error deleting department: %s", e)
             raise e
     
     @staticmethod
@@ -142,8 +161,8 @@ class DepartmentService:
                 Department.status == "Active"
             ).order_by(Department.name).all()
             
-            logger.info(f"Retrieved {len(departments)} active departments")
+            logger.info("Retrieved %s active departments", len(departments))
             return departments
         except Exception as e:
-            logger.error(f"Error retrieving active departments: {str(e)}")
+            logger.error("Error retrieving active departments: %s", e)
             raise e
\ No newline at end of file
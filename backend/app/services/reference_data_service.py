@@ -0,0 +1,85 @@
+"""
+Cached reads of reference data (department lists, ward report lists)
+
+Results are cached as response models, so a hit skips both the query and
+the ORM-to-schema conversion. The department and report services clear the
+caches when they write.
+"""
+from datetime import datetime
+from typing import List
+import logging
+
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy.orm import Session
+
+from app.core.cache import department_cache, report_cache
+from app.core.tracing import traced_service
+from app.schemas.department import DepartmentListResponse, DepartmentResponse
+from app.schemas.ward1_monthly_report import Ward1MonthlyReportResponse
+from app.services.department_service import DepartmentService
+from app.services.ward1_monthly_report_service import Ward1MonthlyReportService
+
+logger = logging.getLogger(__name__)
+
+
+@traced_service
+class ReferenceDataService:
+    """Cached department and ward report lists"""
+
+    @staticmethod
+    def get_department_list(db: Session) -> DepartmentListResponse:
+        """
+        All departments, ordered by name
+        """
+        def load():
+            departments = DepartmentService.get_all_departments(db)
+            return DepartmentListResponse(
+                departments=[DepartmentResponse.from_orm(dept) for dept in departments],
+                total=len(departments)
+            )
+        return department_cache.get_or_load("all", load)
+
+    @staticmethod
+    def get_active_departments(db: Session) -> List[DepartmentResponse]:
+        """
+        Active departments, ordered by name
+        """
+        def load():
+            departments = DepartmentService.get_active_departments(db)
+            return [DepartmentResponse.from_orm(dept) for dept in departments]
+        return department_cache.get_or_load("active", load)
+
+    @staticmethod
+    def get_ward1_reports_by_year(db: Session, year: int) -> List[Ward1MonthlyReportResponse]:
+        """
+        Ward 1 monthly reports for a year, ordered by month
+        """
+        def load():
+            reports = Ward1MonthlyReportService.get_reports_by_year(db, year)
+            return [Ward1MonthlyReportResponse.from_orm(report) for report in reports]
+        return report_cache.get_or_load(("ward1", year), load)
+
+    @staticmethod
+    def warm_up(db: Session) -> dict:
+        """
+        Load the department lists and this year's ward reports into the caches,
+        and serialize them once so the JSON encoding paths are exercised too
+        """
+        try:
+            warmed = {
+                "departments": ReferenceDataService.get_department_list(db),
+                "active_departments": ReferenceDataService.get_active_departments(db),
+                "ward1_reports": ReferenceDataService.get_ward1_reports_by_year(db, datetime.now().year),
+            }
+            for value in warmed.values():
+                jsonable_encoder(value)
+            counts = {
+                "departments": warmed["departments"].total,
+                "active_departments": len(warmed["active_departments"]),
+                "ward1_reports": len(warmed["ward1_reports"]),
+            }
+            logger.info("Warmed reference data caches: %s", counts)
+            return counts
+        except Exception as e:
+            logger.error("Error warming reference data caches: %s", e)
+            raise e
@@ -0,0 +1,148 @@
+"""
+Refresh token issue, rotation and revocation
+
+Refresh tokens are random strings; only their SHA-256 hash is stored, so a
+leaked table cannot be replayed. Each refresh marks the presented token used
+and issues a new one in the same family (one family per login). A used token
+presented again means two parties hold it, so the whole family is revoked and
+both must log in again.
+"""
+import hashlib
+import logging
+import secrets
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.tracing import traced_service
+from app.models.refresh_token import RefreshToken
+from app.models.user import User
+
+logger = logging.getLogger(__name__)
+
+
+def _hash_token(token: str) -> str:
+    return hashlib.sha256(token.encode("utf-8")).hexdigest()
+
+
+@traced_service
+class RefreshTokenService:
+    """Service class for refresh token operations"""
+
+    @staticmethod
+    def issue_token(db: Session, user_id: int, family_id: Optional[str] = None) -> str:
+        """
+        Add a new refresh token for the user (the caller commits)
+
+        Returns the plain token; it is not recoverable afterwards.
+        """
+        token = secrets.token_urlsafe(32)
+        db.add(RefreshToken(
+            token_hash=_hash_token(token),
+            family_id=family_id or uuid.uuid4().hex,
+            user_id=user_id,
+            expires_at=datetime.utcnow() + timedelta(days=settings.refresh_token_expire_days),
+        ))
+        return token
+
+    @staticmethod
+    def create_token(db: Session, user_id: int) -> str:
+        """
+        Start a new token family (login) and return its first token
+        """
+        try:
+            token = RefreshTokenService.issue_token(db, user_id)
+            db.commit()
+            return token
+        except Exception as e:
+            db.rollback()
+            logger.error("Error creating refresh token for user_id %s: %s", user_id, e)
+            raise e
+
+    @staticmethod
+    def rotate_token(db: Session, token: str) -> Tuple[User, str]:
+        """
+        Exchange a refresh token for the user and a new refresh token
+
+        Raises ValueError if the token is unknown, expired or already used;
+        a used token also revokes the rest of its family.
+        """
+        try:
+            now = datetime.utcnow()
+            row = db.query(RefreshToken).filter(RefreshToken.token_hash == _hash_token(token)).first()
+            if row is None or row.expires_at <= now:
+                raise ValueError("Invalid or expired refresh token")
+
+            # Conditional update, so of two concurrent refreshes only one wins
+            # and the other is treated as reuse
+            claimed = db.execute(
+                update(RefreshToken)
+                .where(RefreshToken.id == row.id, RefreshToken.used_at.is_(None))
+                .values(used_at=now)
+            ).rowcount
+            if not claimed:
+                revoked = RefreshTokenService._revoke_family(db, row.family_id, now)
+                db.commit()
+                logger.warning(
+                    "Refresh token reuse for user_id %s - revoked %s tokens in family %s",
+                    row.user_id, revoked, row.family_id
+                )
+                raise ValueError("Refresh token has already been used")
+
+            user = db.query(User).filter(User.id == row.user_id).first()
+            if user is None:
+                raise ValueError("User not found")
+
+            new_token = RefreshTokenService.issue_token(db, user.id, row.family_id)
+            db.commit()
+            logger.info("Rotated refresh token for user: %s (%s)", user.name, user.employee_id)
+            return user, new_token
+        except ValueError:
+            db.rollback()
+            raise
+        except Exception as e:
+            db.rollback()
+            logger.error("Error rotating refresh token: %s", e)
+            raise e
+
+    @staticmethod
+    def revoke_token(db: Session, token: str, user_id: int) -> int:
+        """
+        Revoke the family of a refresh token (logout); returns tokens revoked
+
+        Tokens that belong to another user are ignored.
+        """
+        try:
+            row = db.query(RefreshToken).filter(RefreshToken.token_hash == _hash_token(token)).first()
+            if row is None or row.user_id != user_id:
+                return 0
+            revoked = RefreshTokenService._revoke_family(db, row.family_id, datetime.utcnow())
+            db.commit()
+            return revoked
+        except Exception as e:
+            db.rollback()
+            logger.error("Error revoking refresh token for user_id %s: %s", user_id, e)
+            raise e
+
+    @staticmethod
+    def revoke_user_tokens(db: Session, user_id: int) -> int:
+        """
+        Revoke every refresh token of a user (the caller commits)
+        """
+        return db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.user_id == user_id, RefreshToken.used_at.is_(None))
+            .values(used_at=datetime.utcnow())
+        ).rowcount
+
+    @staticmethod
+    def _revoke_family(db: Session, family_id: str, now: datetime) -> int:
+        return db.execute(
+            update(RefreshToken)
+            .where(RefreshToken.family_id == family_id, RefreshToken.used_at.is_(None))
+            .values(used_at=now)
+        ).rowcount
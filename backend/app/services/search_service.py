@@ -0,0 +1,126 @@
+"""
+Search service for staff directory and department lookups
+
+On MySQL, searches use FULLTEXT ngram indexes (users name/employee_id and
+departments name), so substring matching does not scan the table. Terms
+shorter than the ngram token size fall back to prefix matching on the B-tree
+indexes. Other dialects (SQLite for benchmarks and local runs) use LIKE with
+the same ranking.
+
+Users rank by exact employee ID, employee ID prefix, name prefix, then
+full-text relevance, then name. Departments rank by exact name, name prefix,
+relevance, then name.
+"""
+from sqlalchemy.orm import Session
+from sqlalchemy import or_, case
+from sqlalchemy.dialects.mysql import match
+from app.models.user import User
+from app.models.department import Department, normalize_department_name
+from app.database.loading import USER_WITH_DEPARTMENT
+from app.core.tracing import traced_service
+from typing import List
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# MySQL's default ngram_token_size
+NGRAM_TOKEN_SIZE = 2
+
+# Characters with special meaning in MySQL boolean-mode full-text queries
+_BOOLEAN_OPERATORS = re.compile(r'[+\-<>()~*"@]')
+
+
+def escape_like(term: str) -> str:
+    """Escape LIKE wildcards so user input is matched literally"""
+    return term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def build_boolean_query(term: str) -> str:
+    """Turn a free-text term into a boolean-mode query requiring every word"""
+    words = _BOOLEAN_OPERATORS.sub(" ", term).split()
+    return " ".join(f'+"{word}"' for word in words)
+
+
+def _can_use_fulltext(db: Session, term: str, boolean_query: str) -> bool:
+    """Full-text only works on MySQL and for words at least one ngram long"""
+    return (
+        db.get_bind().dialect.name == "mysql"
+        and bool(boolean_query)
+        and min(len(word) for word in term.split()) >= NGRAM_TOKEN_SIZE
+    )
+
+
+@traced_service
+class SearchService:
+    """Service class for ranked directory search"""
+
+    @staticmethod
+    def search_users(db: Session, search_term: str, limit: int = 50) -> List[User]:
+        """
+        Search users by name or employee ID with ranked results
+        """
+        term = search_term.strip()
+        if not term:
+            return []
+
+        prefix = f"{escape_like(term)}%"
+        rank = case(
+            (User.employee_id == term.upper(), 0),
+            (User.employee_id.like(escape_like(term.upper()) + "%", escape="\\"), 1),
+            (User.name.like(prefix, escape="\\"), 2),
+            else_=3,
+        )
+        query = db.query(User).options(*USER_WITH_DEPARTMENT)
+
+        boolean_query = build_boolean_query(term)
+
+        if _can_use_fulltext(db, term, boolean_query):
+            relevance = match(User.name, User.employee_id, against=boolean_query).in_boolean_mode()
+            query = query.filter(relevance).order_by(rank, relevance.desc(), User.name)
+        elif db.get_bind().dialect.name == "mysql":
+            # Too short for ngram tokens: prefix match on the B-tree indexes
+            query = query.filter(
+                or_(User.employee_id.like(prefix, escape="\\"), User.name.like(prefix, escape="\\"))
+            ).order_by(rank, User.name)
+        else:
+            pattern = f"%{escape_like(term)}%"
+            query = query.filter(
+                or_(User.name.ilike(pattern, escape="\\"), User.employee_id.ilike(pattern, escape="\\"))
+            ).order_by(rank, User.name)
+
+        users = query.limit(limit).all()
+        logger.info("Found %s users matching search term: %s", len(users), term)
+        return users
+
+    @staticmethod
+    def search_departments(db: Session, search_term: str, limit: int = 50) -> List[Department]:
+        """
+        Fuzzy search departments by name with ranked results
+        """
+        term = search_term.strip()
+        if not term:
+            return []
+
+        prefix = f"{escape_like(term)}%"
+        rank = case(
+            (Department.name_normalized == normalize_department_name(term), 0),
+            (Department.name.like(prefix, escape="\\"), 1),
+            else_=2,
+        )
+        query = db.query(Department)
+
+        boolean_query = build_boolean_query(term)
+
+        if _can_use_fulltext(db, term, boolean_query):
+            relevance = match(Department.name, against=boolean_query).in_boolean_mode()
+            query = query.filter(relevance).order_by(rank, relevance.desc(), Department.name)
+        elif db.get_bind().dialect.name == "mysql":
+            query = query.filter(Department.name.like(prefix, escape="\\")).order_by(rank, Department.name)
+        else:
+            pattern = f"%{escape_like(term)}%"
+            query = query.filter(Department.name.ilike(pattern, escape="\\")).order_by(rank, Department.name)
+
+        departments = query.limit(limit).all()
+        logger.info("Found %s departments matching search term: %s", len(departments), term)
+        return departments
@@ -4,14 +4,17 @@ Handles automatic creation of default system admin credentials on first startup
 """
 import logging
 from sqlalchemy.orm import Session
-from app.database.database import get_db
+from app.database.database import commit_and_load, get_db
 from app.models.user import User
-from app.models.department import Department
+from app.models.department import Department, normalize_department_name
+from app.core.cache import department_cache
 from app.core.config import settings
+from app.core.tracing import traced_service
 
 logger = logging.getLogger(__name__)
 
 
+@traced_service
 class StartupService:
     """Service for handling system startup tasks"""
     
@@ -19,7 +22,9 @@ class StartupService:
     def create_default_admin_department(db: Session) -> Department:
         """Create default Administration department if it doesn't exist"""
         try:
-            admin_dept = db.query(Department).filter(Department.name == "Administration").first()
+            admin_dept = db.query(Department).filter(
+                Department.name_normalized == normalize_department_name("Administration")
+            ).first()
             
             if not admin_dept:
                 admin_dept = Department(
@@ -27,8 +32,8 @@ class StartupService:
                     status="Active"
                 )
                 db.add(admin_dept)
-                db.commit()
-                db.refresh(admin_dept)
+                commit_and_load(db, admin_dept)
+                department_cache.clear()
                 logger.info("✅ Created default Administration department")
             else:
                 logger.info("ℹ️  Administration department already exists")
@@ -37,7 +42,7 @@ class StartupService:
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Failed to create Administration department: {e}")
+            logger.error("Failed to create Administration department: %s", e)
             raise e
     
     @staticmethod
@@ -75,7 +80,7 @@ class StartupService:
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Failed to create default admin user: {e}")
+            logger.error("Failed to create default admin user: %s", e)
             raise e
     
     @staticmethod
@@ -107,7 +112,7 @@ class StartupService:
                 db.close()
                 
         except Exception as e:
-            logger.error(f"❌ Failed to initialize default credentials: {e}")
+            logger.error("❌ Failed to initialize default credentials: %s", e)
             raise e
 
 
@@ -121,6 +126,6 @@ def run_startup_initialization():
             
         StartupService.initialize_default_credentials()
     except Exception as e:
-        logger.error(f"Startup initialization failed: {e}")
+        logger.error("Startup initialization failed: %s", e)
         # Don't raise the exception to prevent app startup failure
         # Just log the error and continue
\ No newline at end of file
@@ -1,16 +1,28 @@
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import IntegrityError
-from sqlalchemy import and_, or_
+from sqlalchemy import and_, or_, insert
+from pydantic import ValidationError
 from app.models.user import User
 from app.models.department import Department
-from app.schemas.user import UserCreate, UserUpdate, UserPasswordUpdate
-from typing import Optional, List
+from app.database.database import commit_and_load
+from app.database.loading import USER_WITH_DEPARTMENT
+from app.schemas.errors import validation_error_message
+from app.schemas.user import UserCreate, UserUpdate, UserPasswordUpdate, UserResponse
+from app.services.refresh_token_service import RefreshTokenService
+from app.utils.password_hashing import hash_passwords, needs_rehash
+from app.core.tracing import traced_service
+from typing import Any, Dict, Optional, List
 import logging
 from datetime import datetime
 
 logger = logging.getLogger(__name__)
 
 
+class BulkCreateConflictError(ValueError):
+    """A bulk create collided with a concurrent write; nothing from the batch was saved"""
+
+
+@traced_service
 class UserService:
     """Service class for user operations"""
     
@@ -33,7 +45,7 @@ class UserService:
                 employee_id=user_data.employee_id,
                 name=user_data.name,
                 role=user_data.role,
-                department_id=user_data.department_id
+                department=department
             )
             
             # Set password
@@ -41,10 +53,9 @@ class UserService:
             
             # Add to database
             db.add(db_user)
-            db.commit()
-            db.refresh(db_user)
+            commit_and_load(db, db_user)
             
-            logger.info(f"User '{db_user.name}' ({db_user.employee_id}) created successfully")
+            logger.info("User '%s' (%s) created successfully", db_user.name, db_user.employee_id)
             return db_user
             
         except IntegrityError as e:
@@ -56,9 +67,109 @@ class UserService:
                 raise ValueError("Failed to create user due to data constraint violation")
         except Exception as e:
             db.rollback()
-            logger.error(f"Unexpected error creating user: {str(e)}")
+            logger.error("Unexpected error creating user: %s", e)
             raise e
     
+    @staticmethod
+    def bulk_create_users(db: Session, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Create many users in one transaction and return a result per row
+
+        Rows are validated individually, so one bad row does not reject the
+        rest. Departments and existing employee IDs are checked with one IN
+        query each, passwords are hashed on a process pool, and valid rows
+        are inserted with a single executemany.
+        """
+        try:
+            results: List[Dict[str, Any]] = [{"index": index, "success": False} for index in range(len(rows))]
+            valid: Dict[int, UserCreate] = {}
+            seen_employee_ids = set()
+
+            for index, row in enumerate(rows):
+                try:
+                    user_data = UserCreate(**row)
+                except ValidationError as ve:
+                    # Echo the raw value only as text, so any row can be reported back
+                    raw_employee_id = row.get("employee_id")
+                    results[index]["employee_id"] = None if raw_employee_id is None else str(raw_employee_id)
+                    results[index]["error"] = validation_error_message(ve)
+                    continue
+                results[index]["employee_id"] = user_data.employee_id
+                if user_data.employee_id in seen_employee_ids:
+                    results[index]["error"] = f"Employee ID '{user_data.employee_id}' appears more than once in the request"
+                    continue
+                seen_employee_ids.add(user_data.employee_id)
+                valid[index] = user_data
+
+            # One query each for department and uniqueness checks
+            department_ids = {user_data.department_id for user_data in valid.values()}
+            active_departments = set()
+            if department_ids:
+                active_departments = {
+                    department_id for (department_id,) in db.query(Department.id).filter(
+                        and_(Department.id.in_(department_ids), Department.status == "Active")
+                    )
+                }
+            existing_employee_ids = set()
+            if valid:
+                existing_employee_ids = {
+                    employee_id for (employee_id,) in db.query(User.employee_id).filter(
+                        User.employee_id.in_([user_data.employee_id for user_data in valid.values()])
+                    )
+                }
+
+            for index, user_data in list(valid.items()):
+                if user_data.department_id not in active_departments:
+                    results[index]["error"] = f"Department with ID {user_data.department_id} not found or inactive"
+                    del valid[index]
+                elif user_data.employee_id in existing_employee_ids:
+                    results[index]["error"] = f"Employee ID '{user_data.employee_id}' already exists"
+                    del valid[index]
+
+            if valid:
+                password_hashes = hash_passwords([user_data.password for user_data in valid.values()])
+                now = datetime.utcnow()
+                db.execute(insert(User), [
+                    {
+                        "employee_id": user_data.employee_id,
+                        "name": user_data.name,
+                        "role": user_data.role,
+                        "department_id": user_data.department_id,
+                        "password_hash": password_hash,
+                        "created_at": now,
+                        "updated_at": now,
+                    }
+                    for user_data, password_hash in zip(valid.values(), password_hashes)
+                ])
+                db.commit()
+
+                # MySQL has no INSERT ... RETURNING, so read the new rows back in one query
+                created = {
+                    user.employee_id: user for user in db.query(User).options(*USER_WITH_DEPARTMENT).filter(
+                        User.employee_id.in_([user_data.employee_id for user_data in valid.values()])
+                    )
+                }
+                for index, user_data in valid.items():
+                    user = created[user_data.employee_id]
+                    user_response = UserResponse.from_orm(user)
+                    user_response.department_name = user.department.name if user.department else None
+                    results[index].update(success=True, user=user_response)
+
+            logger.info("Bulk user create: %s created, %s rejected", len(valid), len(rows) - len(valid))
+            return results
+
+        except IntegrityError as e:
+            # Another request created one of these employee IDs after the uniqueness check
+            db.rollback()
+            logger.error("Bulk user create conflicted with a concurrent write: %s", e)
+            raise BulkCreateConflictError(
+                "An employee ID in this batch was created concurrently; no users were created, please retry"
+            )
+        except Exception as e:
+            db.rollback()
+            logger.error("Unexpected error in bulk user create: %s", e)
+            raise e
+
     @staticmethod
     def get_all_users(db: Session, skip: int = 0, limit: int = 100) -> List[User]:
         """
@@ -66,14 +177,13 @@ class UserService:
         """
         try:
             # Use LEFT JOIN to include users even if department is missing
-            from sqlalchemy.orm import joinedload
-            query = db.query(User).options(joinedload(User.department))
+            query = db.query(User).options(*USER_WITH_DEPARTMENT)
             users = query.offset(skip).limit(limit).all()
-            logger.info(f"Retrieved {len(users)} users")
+            logger.info("Retrieved %s users", len(users))
             return users
             
         except Exception as e:
-            logger.error(f"Error retrieving users: {str(e)}")
+            logger.error("Error retrieving users: %s", e)
             raise e
     
     @staticmethod
@@ -82,14 +192,14 @@ class UserService:
         Get user by ID
         """
         try:
-            user = db.query(User).filter(User.id == user_id).first()
+            user = db.query(User).options(*USER_WITH_DEPARTMENT).filter(User.id == user_id).first()
             if user:
-                logger.info(f"Retrieved user: {user.name} ({user.employee_id})")
+                logger.info("Retrieved user: %s (%s)", user.name, user.employee_id)
             else:
-                logger.warning(f"User with ID {user_id} not found")
+                logger.warning("User with ID %s not found", user_id)
             return user
         except Exception as e:
-            logger.error(f"Error retrieving user by ID {user_id}: {str(e)}")
+            logger.error("Error retrieving user by ID %s: %s", user_id, e)
             raise e
     
     @staticmethod
@@ -98,10 +208,10 @@ class UserService:
         Get user by employee ID
         """
         try:
-            user = db.query(User).filter(User.employee_id == employee_id).first()
+            user = db.query(User).options(*USER_WITH_DEPARTMENT).filter(User.employee_id == employee_id).first()
             return user
         except Exception as e:
-            logger.error(f"Error retrieving user by employee ID '{employee_id}': {str(e)}")
+            logger.error("Error retrieving user by employee ID '%s': %s", employee_id, e)
             raise e
     
 
@@ -112,9 +222,9 @@ class UserService:
         Update user
         """
         try:
-            user = db.query(User).filter(User.id == user_id).first()
+            user = db.query(User).options(*USER_WITH_DEPARTMENT).filter(User.id == user_id).first()
             if not user:
-                logger.warning(f"User with ID {user_id} not found for update")
+                logger.warning("User with ID %s not found for update", user_id)
                 return None
             
             # Validate department if being updated
@@ -130,13 +240,15 @@ class UserService:
             for field, value in update_data.items():
                 if hasattr(user, field):
                     setattr(user, field, value)
+            if user_data.department_id:
+                # Keep the loaded relationship in step with department_id
+                user.department = department
             
             user.updated_at = datetime.utcnow()
             
-            db.commit()
-            db.refresh(user)
+            commit_and_load(db, user)
             
-            logger.info(f"User '{user.name}' updated successfully")
+            logger.info("User '%s' updated successfully", user.name)
             return user
             
         except IntegrityError as e:
@@ -145,7 +257,7 @@ class UserService:
             raise ValueError("Failed to update user due to data constraint violation")
         except Exception as e:
             db.rollback()
-            logger.error(f"Unexpected error updating user: {str(e)}")
+            logger.error("Unexpected error updating user: %s", e)
             raise e
     
     @staticmethod
@@ -156,7 +268,7 @@ class UserService:
         try:
             user = db.query(User).filter(User.id == user_id).first()
             if not user:
-                logger.warning(f"User with ID {user_id} not found for password update")
+                logger.warning("User with ID %s not found for password update", user_id)
                 return False
             
             # Verify current password
@@ -167,14 +279,17 @@ class UserService:
             user.set_password(password_data.new_password)
             user.updated_at = datetime.utcnow()
             
+            # Sign out other sessions at their next refresh
+            RefreshTokenService.revoke_user_tokens(db, user.id)
+            
             db.commit()
             
-            logger.info(f"Password updated for user '{user.name}'")
+            logger.info("Password updated for user '%s'", user.name)
             return True
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error updating password: {str(e)}")
+            logger.error("Error updating password: %s", e)
             raise e
     
     @staticmethod
@@ -185,19 +300,19 @@ class UserService:
         try:
             user = db.query(User).filter(User.id == user_id).first()
             if not user:
-                logger.warning(f"User with ID {user_id} not found for deletion")
+                logger.warning("User with ID %s not found for deletion", user_id)
                 return False
             
             # Hard delete since we don't have status field
             db.delete(user)
             db.commit()
             
-            logger.info(f"User '{user.name}' deleted successfully")
+            logger.info("User '%s' deleted successfully", user.name)
             return True
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error deleting user: {str(e)}")
+            logger.error("Error deleting user: %s", e)
             raise e
     
     @staticmethod
@@ -208,18 +323,18 @@ class UserService:
         try:
             user = db.query(User).filter(User.id == user_id).first()
             if not user:
-                logger.warning(f"User with ID {user_id} not found for deletion")
+                logger.warning("User with ID %s not found for deletion", user_id)
                 return False
             
             db.delete(user)
             db.commit()
             
-            logger.info(f"User '{user.name}' permanently deleted")
+            logger.info("User '%s' permanently deleted", user.name)
             return True
             
         except Exception as e:
             db.rollback()
-            logger.error(f"Error permanently deleting user: {str(e)}")
+            logger.error("Error permanently deleting user: %s", e)
             raise e
     
     @staticmethod
@@ -230,35 +345,44 @@ class UserService:
         try:
             user = UserService.get_user_by_employee_id(db, employee_id)
             if user and user.check_password(password):
-                logger.info(f"User '{user.name}' authenticated successfully")
+                logger.info("User '%s' authenticated successfully", user.name)
+                if needs_rehash(user.password_hash):
+                    UserService._rehash_password(db, user, password)
                 return user
             
-            logger.warning(f"Authentication failed for employee ID: {employee_id}")
+            logger.warning("Authentication failed for employee ID: %s", employee_id)
             return None
             
         except Exception as e:
-            logger.error(f"Error authenticating user: {str(e)}")
+            logger.error("Error authenticating user: %s", e)
             raise e
     
+    @staticmethod
+    def _rehash_password(db: Session, user: User, password: str):
+        """
+        Re-hash a just-verified password under the current policy (scheme or cost changed)
+        
+        A failure leaves the old hash, which still verifies, and does not fail the login.
+        """
+        try:
+            user.set_password(password)
+            db.commit()
+            logger.info("Rehashed password for user '%s' under the current policy", user.name)
+        except Exception as e:
+            db.rollback()
+            logger.warning("Failed to rehash password for user '%s': %s", user.employee_id, e)
+    
     @staticmethod
     def search_users(db: Session, search_term: str, limit: int = 50) -> List[User]:
         """
-        Search users by name or employee ID
+        Search users by name or employee ID (ranked, index-backed)
         """
         try:
-            search_pattern = f"%{search_term}%"
-            users = db.query(User).filter(
-                or_(
-                    User.name.ilike(search_pattern),
-                    User.employee_id.ilike(search_pattern)
-                )
-            ).limit(limit).all()
-            
-            logger.info(f"Found {len(users)} users matching search term: {search_term}")
-            return users
+            from app.services.search_service import SearchService
+            return SearchService.search_users(db, search_term, limit)
             
         except Exception as e:
-            logger.error(f"Error searching users: {str(e)}")
+            logger.error("Error searching users: %s", e)
             raise e
     
     @staticmethod
@@ -267,13 +391,15 @@ class UserService:
         Get all users in a specific department
         """
         try:
-            users = db.query(User).filter(User.department_id == department_id).all()
+            users = db.query(User).options(*USER_WITH_DEPARTMENT).filter(
+                User.department_id == department_id
+            ).all()
             
-            logger.info(f"Retrieved {len(users)} users from department ID {department_id}")
+            logger.info("Retrieved %s users from department ID %s", len(users), department_id)
             return users
             
         except Exception as e:
-            logger.error(f"Error retrieving users by department: {str(e)}")
+            logger.error("Error retrieving users by department: %s", e)
             raise e
     
     @staticmethod
@@ -282,11 +408,11 @@ class UserService:
         Get all users with a specific role
         """
         try:
-            users = db.query(User).filter(User.role == role).all()
+            users = db.query(User).options(*USER_WITH_DEPARTMENT).filter(User.role == role).all()
             
-            logger.info(f"Retrieved {len(users)} users with role: {role}")
+            logger.info("Retrieved %s users with role: %s", len(users), role)
             return users
             
         except Exception as e:
-            logger.error(f"Error retrieving users by role: {str(e)}")
+            logger.error("Error retrieving users by role: %s", e)
             raise e
\ No newline at end of file
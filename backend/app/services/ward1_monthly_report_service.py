@@ -1,18 +1,29 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from sqlalchemy.exc import IntegrityError
+from pydantic import ValidationError
+from app.database.database import commit_and_load
 from app.models.ward1_monthly_report import Ward1MonthlyReport, ReportStatus
 from app.schemas.ward1_monthly_report import (
     Ward1MonthlyReportCreate, 
     Ward1MonthlyReportUpdate,
     Ward1MonthlyReportSubmit
 )
-from datetime import date, datetime
-from typing import Optional, List
+from app.schemas.errors import validation_error_message
+from app.core.cache import report_cache
+from app.core.tracing import traced_service
+from datetime import date
+from typing import Any, Dict, Optional, List
 import logging
 
 logger = logging.getLogger(__name__)
 
 
+class BatchSaveError(ValueError):
+    """The database rejected a batch save; nothing from the batch was saved"""
+
+
+@traced_service
 class Ward1MonthlyReportService:
     """Service class for Ward1 monthly report operations"""
     
@@ -33,7 +44,7 @@ class Ward1MonthlyReportService:
             
             if existing_report:
                 # Update existing report
-                logger.info(f"Updating existing Ward1 report for {report_data.year}/{report_data.month}")
+                logger.info("Updating existing Ward1 report for %s/%s", report_data.year, report_data.month)
                 
                 # Update all fields from the request
                 for field, value in report_data.dict().items():
@@ -42,17 +53,17 @@ class Ward1MonthlyReportService:
                 
                 # Set metadata
                 existing_report.last_updated_by = user_id
-                existing_report.updated_at = datetime.utcnow()
+                existing_report.updated_at = func.now()
                 
-                db.commit()
-                db.refresh(existing_report)
+                commit_and_load(db, existing_report)
+                report_cache.invalidate(("ward1", report_data.year))
                 
-                logger.info(f"Successfully updated Ward1 report {report_data.year}/{report_data.month}")
+                logger.info("Successfully updated Ward1 report %s/%s", report_data.year, report_data.month)
                 return existing_report
                 
             else:
                 # Create new report
-                logger.info(f"Creating new Ward1 report for {report_data.year}/{report_data.month}")
+                logger.info("Creating new Ward1 report for %s/%s", report_data.year, report_data.month)
                 
                 # Prepare data for new report
                 report_dict = report_data.dict()
@@ -64,21 +75,127 @@ class Ward1MonthlyReportService:
                 new_report = Ward1MonthlyReport(**report_dict)
                 
                 db.add(new_report)
-                db.commit()
-                db.refresh(new_report)
+                commit_and_load(db, new_report)
+                report_cache.invalidate(("ward1", report_data.year))
                 
-                logger.info(f"Successfully created Ward1 report {report_data.year}/{report_data.month}")
+                logger.info("Successfully created Ward1 report %s/%s", report_data.year, report_data.month)
                 return new_report
                 
         except IntegrityError as e:
             db.rollback()
-            logger.error(f"Database integrity error: {str(e)}")
+            logger.error("Database integrity error: %s", e)
             raise ValueError(f"Invalid data provided: {str(e)}")
         except Exception as e:
             db.rollback()
-            logger.error(f"Error creating/updating Ward1 report: {str(e)}")
+            logger.error("Error creating/updating Ward1 report: %s", e)
             raise Exception(f"Failed to save report: {str(e)}")
 
+    @staticmethod
+    def upsert_reports(
+        db: Session,
+        rows: List[Dict[str, Any]],
+        user_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Create or update many months in one transaction and return a result per month
+
+        Months are validated individually. Valid months are written with one
+        multi-row upsert (INSERT ... ON DUPLICATE KEY UPDATE on MySQL,
+        ON CONFLICT DO UPDATE on SQLite), with the same field rules as
+        create_or_update_report: every field is overwritten except year, month
+        and created_by.
+        """
+        try:
+            results: List[Dict[str, Any]] = [{"index": index, "success": False} for index in range(len(rows))]
+            valid: Dict[int, Ward1MonthlyReportCreate] = {}
+            seen_periods = set()
+
+            for index, row in enumerate(rows):
+                try:
+                    report_data = Ward1MonthlyReportCreate(**row)
+                except ValidationError as ve:
+                    # year/month stay unset: the raw values may not be valid periods
+                    results[index]["error"] = validation_error_message(ve)
+                    continue
+                results[index].update(year=report_data.year, month=report_data.month)
+                period = (report_data.year, report_data.month)
+                if period in seen_periods:
+                    results[index]["error"] = f"{report_data.month:02d}/{report_data.year} appears more than once in the request"
+                    continue
+                seen_periods.add(period)
+                valid[index] = report_data
+
+            if valid:
+                # One query to tell creates from updates for the per-month results
+                years = {report_data.year for report_data in valid.values()}
+                existing_periods = set(
+                    db.query(Ward1MonthlyReport.year, Ward1MonthlyReport.month).filter(
+                        Ward1MonthlyReport.year.in_(years)
+                    )
+                )
+
+                values = []
+                for report_data in valid.values():
+                    report_dict = report_data.dict()
+                    report_dict['status'] = ReportStatus(report_data.status.value)
+                    report_dict['report_date'] = date(report_data.year, report_data.month, 1)
+                    report_dict['created_by'] = user_id
+                    report_dict['last_updated_by'] = user_id
+                    values.append(report_dict)
+
+                Ward1MonthlyReportService._execute_upsert(db, values)
+                db.commit()
+                for year in years:
+                    report_cache.invalidate(("ward1", year))
+
+                for index, report_data in valid.items():
+                    action = "updated" if (report_data.year, report_data.month) in existing_periods else "created"
+                    results[index].update(success=True, action=action)
+
+            logger.info("Batch save of Ward1 reports: %s saved, %s rejected", len(valid), len(rows) - len(valid))
+            return results
+
+        except IntegrityError as e:
+            db.rollback()
+            logger.error("Database integrity error in batch save: %s", e)
+            raise BatchSaveError(f"Invalid data provided: {str(e.orig)}")
+        except Exception as e:
+            db.rollback()
+            logger.error("Error in batch save of Ward1 reports: %s", e)
+            raise Exception(f"Failed to save reports: {str(e)}")
+
+    @staticmethod
+    def _execute_upsert(db: Session, values: List[Dict[str, Any]]):
+        """Multi-row upsert keyed on (year, month) in the current dialect"""
+        table = Ward1MonthlyReport.__table__
+        # Everything but the key and the original author is overwritten on conflict;
+        # timestamps come from the database clock like single saves
+        update_columns = [
+            name for name in values[0] if name not in ('year', 'month', 'created_by', 'report_date')
+        ]
+        dialect = db.get_bind().dialect.name
+
+        if dialect == "mysql":
+            from sqlalchemy.dialects.mysql import insert as mysql_insert
+            stmt = mysql_insert(table).values(values)
+            stmt = stmt.on_duplicate_key_update(
+                {**{name: stmt.inserted[name] for name in update_columns}, "updated_at": func.now()}
+            )
+        elif dialect in ("sqlite", "postgresql"):
+            if dialect == "sqlite":
+                from sqlalchemy.dialects.sqlite import insert as dialect_insert
+            else:
+                from sqlalchemy.dialects.postgresql import insert as dialect_insert
+            stmt = dialect_insert(table).values(values)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[table.c.year, table.c.month],
+                set_={**{name: stmt.excluded[name] for name in update_columns}, "updated_at": func.now()},
+            )
+        else:
+            raise ValueError(f"Batch save is not supported on the {dialect} dialect")
+
+        db.execute(stmt)
+
     @staticmethod
     def get_report_by_year_month(
         db: Session, 
@@ -94,11 +211,11 @@ class Ward1MonthlyReportService:
                 Ward1MonthlyReport.month == month
             ).first()
             
-            logger.info(f"Retrieved Ward1 report for {year}/{month}: {'Found' if report else 'Not found'}")
+            logger.info("Retrieved Ward1 report for %s/%s: %s", year, month, 'Found' if report else 'Not found')
             return report
             
         except Exception as e:
-            logger.error(f"Error retrieving Ward1 report for {year}/{month}: {str(e)}")
+            logger.error("Error retrieving Ward1 report for %s/%s: %s", year, month, e)
             raise Exception(f"Failed to retrieve report: {str(e)}")
 
     @staticmethod
@@ -114,11 +231,11 @@ class Ward1MonthlyReportService:
                 Ward1MonthlyReport.year == year
             ).order_by(Ward1MonthlyReport.month).all()
             
-            logger.info(f"Retrieved {len(reports)} Ward1 reports for year {year}")
+            logger.info("Retrieved %s Ward1 reports for year %s", len(reports), year)
             return reports
             
         except Exception as e:
-            logger.error(f"Error retrieving Ward1 reports for year {year}: {str(e)}")
+            logger.error("Error retrieving Ward1 reports for year %s: %s", year, e)
             raise Exception(f"Failed to retrieve reports for year {year}: {str(e)}")
 
     @staticmethod
@@ -136,11 +253,11 @@ class Ward1MonthlyReportService:
                 Ward1MonthlyReport.month.desc()
             ).offset(offset).limit(limit).all()
             
-            logger.info(f"Retrieved {len(reports)} Ward1 reports (limit: {limit}, offset: {offset})")
+            logger.info("Retrieved %s Ward1 reports (limit: %s, offset: %s)", len(reports), limit, offset)
             return reports
             
         except Exception as e:
-            logger.error(f"Error retrieving Ward1 reports: {str(e)}")
+            logger.error("Error retrieving Ward1 reports: %s", e)
             raise Exception(f"Failed to retrieve reports: {str(e)}")
 
     @staticmethod
@@ -166,20 +283,20 @@ class Ward1MonthlyReportService:
             # Update status to submitted
             report.status = ReportStatus.submitted
             report.last_updated_by = user_id or submit_data.submitted_by
-            report.updated_at = datetime.utcnow()
+            report.updated_at = func.now()
             
-            db.commit()
-            db.refresh(report)
+            commit_and_load(db, report)
+            report_cache.invalidate(("ward1", submit_data.year))
             
-            logger.info(f"Successfully submitted Ward1 report {submit_data.year}/{submit_data.month} for approval")
+            logger.info("Successfully submitted Ward1 report %s/%s for approval", submit_data.year, submit_data.month)
             return report
             
         except ValueError as e:
-            logger.warning(f"Validation error submitting report: {str(e)}")
+            logger.warning("Validation error submitting report: %s", e)
             raise e
         except Exception as e:
             db.rollback()
-            logger.error(f"Error submitting Ward1 report: {str(e)}")
+            logger.error("Error submitting Ward1 report: %s", e)
             raise Exception(f"Failed to submit report: {str(e)}")
 
     @staticmethod
@@ -204,20 +321,20 @@ class Ward1MonthlyReportService:
             # Update status to approved
             report.status = ReportStatus.approved
             report.last_updated_by = approver_user_id
-            report.updated_at = datetime.utcnow()
+            report.updated_at = func.now()
             
-            db.commit()
-            db.refresh(report)
+            commit_and_load(db, report)
+            report_cache.invalidate(("ward1", year))
             
-            logger.info(f"Successfully approved Ward1 report {year}/{month}")
+            logger.info("Successfully approved Ward1 report %s/%s", year, month)
             return report
             
         except ValueError as e:
-            logger.warning(f"Validation error approving report: {str(e)}")
+            logger.warning("Validation error approving report: %s", e)
             raise e
         except Exception as e:
             db.rollback()
-            logger.error(f"Error approving Ward1 report: {str(e)}")
+            logger.error("Error approving Ward1 report: %s", e)
             raise Exception(f"Failed to approve report: {str(e)}")
 
     @staticmethod
@@ -240,16 +357,17 @@ class Ward1MonthlyReportService:
             
             db.delete(report)
             db.commit()
+            report_cache.invalidate(("ward1", year))
             
-            logger.info(f"Successfully deleted Ward1 report {year}/{month}")
+            logger.info("Successfully deleted Ward1 report %s/%s", year, month)
             return True
             
         except ValueError as e:
-            logger.warning(f"Validation error deleting report: {str(e)}")
+            logger.warning("Validation error deleting report: %s", e)
             raise e
         except Exception as e:
             db.rollback()
-            logger.error(f"Error deleting Ward1 report: {str(e)}")
+            logger.error("Error deleting Ward1 report: %s", e)
             raise Exception(f"Failed to delete report: {str(e)}")
 
     @staticmethod
@@ -287,5 +405,5 @@ class Ward1MonthlyReportService:
             }
             
         except Exception as e:
-            logger.error(f"Error calculating Ward1 report statistics for {year}: {str(e)}")
+            logger.error("Error calculating Ward1 report statistics for %s: %s", year, e)
             raise Exception(f"Failed to calculate statistics: {str(e)}")
\ No newline at end of file
@@ -1,16 +1,17 @@
 """
 Authentication dependencies for FastAPI routes
 """
-from fastapi import Depends, HTTPException, status
+from dataclasses import dataclass, field
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from sqlalchemy.orm import Session
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 import logging
 
-from app.database.database import get_db
+from app.core.rbac import RoleMasks, is_allowed, permission_bit, role_masks
+from app.core.request_context import bind_user
+from app.core.token_revocation import revocation_list
+from app.core.tracing import traced_dependency
 from app.utils.jwt_handler import JWTHandler
-from app.models.user import User
-from app.services.user_service import UserService
 
 logger = logging.getLogger(__name__)
 
@@ -18,12 +19,48 @@ logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
 
+@dataclass(frozen=True)
+class AuthenticatedUser:
+    """
+    The caller, as described by the claims of their access token
+
+    Access tokens are short-lived and re-issued from the database on every
+    refresh, so the claims are at most ACCESS_TOKEN_EXPIRE_MINUTES old.
+    Endpoints that need more than these fields load the User themselves.
+    permissions holds the role's compiled masks (app/core/rbac.py); token_id
+    and expires_at (the jti and exp claims) identify the token for logout.
+    """
+    id: int
+    employee_id: str
+    name: str
+    role: str
+    department_id: Optional[int]
+    permissions: RoleMasks = field(default=RoleMasks(0, 0), repr=False, compare=False)
+    token_id: Optional[str] = field(default=None, repr=False, compare=False)
+    expires_at: Optional[int] = field(default=None, repr=False, compare=False)
+
+    @classmethod
+    def from_claims(cls, payload: Dict[str, Any]) -> Optional["AuthenticatedUser"]:
+        if not payload.get("user_id") or not payload.get("role") or payload.get("type") != "access_token":
+            return None
+        return cls(
+            id=payload["user_id"],
+            employee_id=payload.get("employee_id", ""),
+            name=payload.get("name", ""),
+            role=payload["role"],
+            department_id=payload.get("department_id"),
+            permissions=role_masks(payload["role"]),
+            token_id=payload.get("jti"),
+            expires_at=payload.get("exp"),
+        )
+
+
+@traced_dependency()
 async def get_current_user(
-    credentials: HTTPAuthorizationCredentials = Depends(security),
-    db: Session = Depends(get_db)
-) -> User:
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> AuthenticatedUser:
     """
-    Get current authenticated user from JWT token
+    Get current authenticated user from the JWT claims (no database query)
     """
     try:
         # Extract token
@@ -38,31 +75,31 @@ async def get_current_user(
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        # Extract user ID
-        user_id = payload.get("user_id")
-        if not user_id:
+        # Revoked at logout (in-memory check, no database query)
+        if revocation_list.is_revoked(payload.get("jti")):
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid token payload",
+                detail="Token has been revoked",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        # Get user from database
-        user = UserService.get_user_by_id(db, user_id)
-        if not user:
+        # Identity, role and department come from the claims
+        user = AuthenticatedUser.from_claims(payload)
+        if user is None:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="User not found",
+                detail="Invalid token payload",
                 headers={"WWW-Authenticate": "Bearer"},
             )
         
-        logger.debug(f"Authenticated user: {user.name} ({user.employee_id})")
+        bind_user(user.id, user.role)
+        logger.debug("Authenticated user: %s (%s)", user.name, user.employee_id)
         return user
         
     except HTTPException:
         raise
     except Exception as e:
-        logger.error(f"Error in get_current_user: {str(e)}")
+        logger.error("Error in get_current_user: %s", e)
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Authentication failed",
@@ -70,46 +107,83 @@ async def get_current_user(
         )
 
 
+def require_permission(permission: str, department_param: Optional[str] = None):
+    """
+    Dependency factory for permission-based access control (see app/core/rbac.py)
+    
+    Args:
+        permission: Permission the endpoint needs, e.g. "ward_report.approve"
+        department_param: Path parameter holding the target department ID;
+            when given, roles holding the permission for their own
+            department only are let in for that department
+        
+    Returns:
+        Dependency function that checks the permission
+    """
+    bit = permission_bit(permission)  # Unknown permission names fail here, at import
+    
+    @traced_dependency(f"require_permission({permission})")
+    def permission_checker(
+        request: Request,
+        current_user: AuthenticatedUser = Depends(get_current_user)
+    ) -> AuthenticatedUser:
+        same_department = (
+            department_param is not None
+            and str(current_user.department_id) == request.path_params.get(department_param)
+        )
+        if not is_allowed(current_user.permissions, bit, same_department):
+            logger.warning(
+                "Access denied for user %s with role %s. Required permission: %s",
+                current_user.name, current_user.role, permission
+            )
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Access denied. Required permission: {permission}"
+            )
+        
+        logger.debug("Permission %s granted for user %s", permission, current_user.name)
+        return current_user
+    
+    return permission_checker
+
+
 def require_roles(allowed_roles: List[str]):
     """
     Dependency factory for role-based access control
     
+    Prefer require_permission(); role lists scatter the policy across routes.
+    
     Args:
         allowed_roles: List of roles that can access the endpoint
         
     Returns:
         Dependency function that checks user role
     """
-    def role_checker(current_user: User = Depends(get_current_user)) -> User:
-        if current_user.role not in allowed_roles:
+    allowed = frozenset(allowed_roles)
+    detail = f"Access denied. Required roles: {', '.join(allowed_roles)}"
+    
+    @traced_dependency(f"require_roles({', '.join(allowed_roles)})")
+    def role_checker(current_user: AuthenticatedUser = Depends(get_current_user)) -> AuthenticatedUser:
+        if current_user.role not in allowed:
             logger.warning(
-                f"Access denied for user {current_user.name} with role {current_user.role}. "
-                f"Required roles: {allowed_roles}"
+                "Access denied for user %s with role %s. "
+                "Required roles: %s",
+                current_user.name, current_user.role, allowed_roles
             )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
-                detail=f"Access denied. Required roles: {', '.join(allowed_roles)}"
+                detail=detail
             )
         
-        logger.debug(f"Role check passed for user {current_user.name} with role {current_user.role}")
+        logger.debug("Role check passed for user %s with role %s", current_user.name, current_user.role)
         return current_user
     
     return role_checker
 
 
-def require_admin(current_user: User = Depends(get_current_user)) -> User:
-    """
-    Dependency that requires admin role
-    """
-    if current_user.role != "Administrator":
-        logger.warning(f"Admin access denied for user {current_user.name} with role {current_user.role}")
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Admin access required"
-        )
-    
-    logger.debug(f"Admin access granted for user {current_user.name}")
-    return current_user
+# Administrators hold "*", so every permission; system.admin is held by nobody else
+require_admin = require_permission("system.admin")
+_SYSTEM_ADMIN = permission_bit("system.admin")
 
 
 def require_department_access(
@@ -126,10 +200,11 @@ def require_department_access(
     Returns:
         Dependency function that checks department access
     """
-    def department_checker(current_user: User = Depends(get_current_user)) -> User:
+    @traced_dependency("require_department_access")
+    def department_checker(current_user: AuthenticatedUser = Depends(get_current_user)) -> AuthenticatedUser:
         # Admin override
-        if allow_admin_override and current_user.role == "Administrator":
-            logger.debug(f"Admin override for department access: {current_user.name}")
+        if allow_admin_override and current_user.permissions.anywhere & _SYSTEM_ADMIN:
+            logger.debug("Admin override for department access: %s", current_user.name)
             return current_user
         
         # Check department access
@@ -137,15 +212,16 @@ def require_department_access(
         
         if current_user.department_id != target_dept_id:
             logger.warning(
-                f"Department access denied for user {current_user.name}. "
-                f"User department: {current_user.department_id}, Required: {target_dept_id}"
+                "Department access denied for user %s. "
+                "User department: %s, Required: %s",
+                current_user.name, current_user.department_id, target_dept_id
             )
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Access denied. Insufficient department permissions"
             )
         
-        logger.debug(f"Department access granted for user {current_user.name}")
+        logger.debug("Department access granted for user %s", current_user.name)
         return current_user
     
     return department_checker
@@ -159,9 +235,8 @@ require_management = require_roles(["Administrator", "Doctor"])
 
 
 async def get_optional_current_user(
-    credentials: Optional[HTTPAuthorizationCredentials] = Depends(security),
-    db: Session = Depends(get_db)
-) -> Optional[User]:
+    credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
+) -> Optional[AuthenticatedUser]:
     """
     Get current user if token is provided, but don't require authentication
     Useful for endpoints that behave differently based on authentication status
@@ -172,16 +247,11 @@ async def get_optional_current_user(
     try:
         token = credentials.credentials
         payload = JWTHandler.verify_token(token)
-        if not payload:
-            return None
-        
-        user_id = payload.get("user_id")
-        if not user_id:
+        if not payload or revocation_list.is_revoked(payload.get("jti")):
             return None
         
-        user = UserService.get_user_by_id(db, user_id)
-        return user
+        return AuthenticatedUser.from_claims(payload)
         
     except Exception as e:
-        logger.debug(f"Optional authentication failed: {str(e)}")
+        logger.debug("Optional authentication failed: %s", e)
         return None
\ No newline at end of file
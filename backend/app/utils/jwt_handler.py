@@ -1,14 +1,75 @@
 """
 JWT Token Handler for authentication and authorization
+
+With JWT_KEYS_DIR set, tokens are signed with RS256 keys from the key ring
+(app/core/jwt_keys.py); otherwise with SECRET_KEY (HS256). Verified payloads
+are cached per token until expiry, so repeat requests skip the signature
+check; a key ring reload invalidates them, so tokens of a key dropped from
+the ring stop verifying on the next check.
 """
 from datetime import datetime, timedelta
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Tuple
 from jose import jwt
+import threading
+import time
+import uuid
 from app.core.config import settings
+from app.core.jwt_keys import ALGORITHM as KEY_RING_ALGORITHM, get_key_ring
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Verified token -> (payload, key ring generation it was verified under);
+# bounded, oldest entries evicted first
+_verified_tokens: Dict[str, Tuple[Dict[str, Any], int]] = {}
+_verified_tokens_lock = threading.Lock()
+
+
+def _key_ring_generation() -> int:
+    key_ring = get_key_ring()
+    return key_ring.current_generation() if key_ring is not None else 0
+
+
+def _cached_payload(token: str) -> Optional[Dict[str, Any]]:
+    """Payload verified earlier under the keys still in use, else None"""
+    entry = _verified_tokens.get(token)
+    if entry is None:
+        return None
+    payload, generation = entry
+    if generation != _key_ring_generation():
+        # The ring was reloaded since; its key may be gone, so verify again
+        with _verified_tokens_lock:
+            _verified_tokens.pop(token, None)
+        return None
+    return payload
+
+
+def _cache_verified(token: str, payload: Dict[str, Any], generation: int):
+    with _verified_tokens_lock:
+        if len(_verified_tokens) >= settings.jwt_verify_cache_size:
+            _verified_tokens.pop(next(iter(_verified_tokens)))
+        _verified_tokens[token] = (payload, generation)
+
+
+def _decode(token: str) -> Dict[str, Any]:
+    """Check the signature with the key the header names and return the claims"""
+    header = jwt.get_unverified_header(token)
+    algorithm = header.get("alg")
+    key_ring = get_key_ring()
+
+    if key_ring is not None and algorithm == KEY_RING_ALGORITHM:
+        key = key_ring.verification_key(header.get("kid"))
+        if key is None:
+            raise jwt.JWTError(f"Unknown signing key {header.get('kid')!r}")
+        return jwt.decode(token, key, algorithms=[KEY_RING_ALGORITHM])
+
+    # Shared-secret tokens: the only kind without a key ring, and accepted
+    # alongside it while JWT_ACCEPT_HS256 is on (switch-over from HS256)
+    if algorithm == settings.algorithm and (key_ring is None or settings.jwt_accept_hs256):
+        return jwt.decode(token, settings.secret_key, algorithms=[settings.algorithm])
+
+    raise jwt.JWTError(f"Unexpected token algorithm {algorithm!r}")
+
 
 class JWTHandler:
     """Handle JWT token creation, validation, and extraction"""
@@ -40,19 +101,31 @@ class JWTHandler:
                 )
             
             to_encode.update({"exp": expire, "iat": datetime.utcnow()})
+            # Unique ID so the token can be revoked (see app/core/token_revocation.py)
+            to_encode.setdefault("jti", uuid.uuid4().hex)
             
             # Create token
-            encoded_jwt = jwt.encode(
-                to_encode, 
-                settings.secret_key, 
-                algorithm=settings.algorithm
-            )
+            key_ring = get_key_ring()
+            if key_ring is not None:
+                kid, signing_key = key_ring.signing_key()
+                encoded_jwt = jwt.encode(
+                    to_encode,
+                    signing_key,
+                    algorithm=KEY_RING_ALGORITHM,
+                    headers={"kid": kid}
+                )
+            else:
+                encoded_jwt = jwt.encode(
+                    to_encode, 
+                    settings.secret_key, 
+                    algorithm=settings.algorithm
+                )
             
-            logger.info(f"JWT token created for user_id: {data.get('user_id')}")
+            logger.info("JWT token created for user_id: %s", data.get('user_id'))
             return encoded_jwt
             
         except Exception as e:
-            logger.error(f"Error creating JWT token: {str(e)}")
+            logger.error("Error creating JWT token: %s", e)
             raise Exception("Failed to create access token")
     
     @staticmethod
@@ -67,29 +140,31 @@ class JWTHandler:
             Decoded token payload or None if invalid
         """
         try:
-            payload = jwt.decode(
-                token, 
-                settings.secret_key, 
-                algorithms=[settings.algorithm]
-            )
+            payload = _cached_payload(token)
+            if payload is None:
+                # Read before decoding, so a reload during the check is not cached as current
+                generation = _key_ring_generation()
+                payload = _decode(token)
+                if payload.get("exp"):
+                    _cache_verified(token, payload, generation)
             
-            # Check if token has expired
+            # Check if token has expired (also for cached payloads)
             exp_timestamp = payload.get("exp")
-            if exp_timestamp and datetime.utcnow() > datetime.fromtimestamp(exp_timestamp):
+            if exp_timestamp and time.time() > exp_timestamp:
                 logger.warning("JWT token has expired")
                 return None
             
-            logger.debug(f"JWT token verified for user_id: {payload.get('user_id')}")
+            logger.debug("JWT token verified for user_id: %s", payload.get('user_id'))
             return payload
             
         except jwt.ExpiredSignatureError:
             logger.warning("JWT token has expired")
             return None
         except jwt.JWTError as e:
-            logger.warning(f"Invalid JWT token: {str(e)}")
+            logger.warning("Invalid JWT token: %s", e)
             return None
         except Exception as e:
-            logger.error(f"Error verifying JWT token: {str(e)}")
+            logger.error("Error verifying JWT token: %s", e)
             return None
     
     @staticmethod
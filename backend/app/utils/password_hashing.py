@@ -0,0 +1,223 @@
+"""
+Password hashing policy
+
+One place decides how passwords are hashed and checked:
+- Scheme: bcrypt (default) or argon2id (PASSWORD_HASH_SCHEME, needs the
+  optional argon2-cffi package). Stored hashes of either scheme verify,
+  whatever the current setting.
+- Cost: fixed (BCRYPT_ROUNDS / ARGON2_TIME_COST) or, when 0, calibrated at
+  startup by timing a cheap hash on this host and scaling up to the largest
+  cost within PASSWORD_HASH_TARGET_MS.
+- Migration: after a successful login, needs_rehash() tells whether the
+  stored hash is of another scheme or a lower cost, and the password is
+  rehashed with the current policy. A cost up to one step above the target
+  is kept, so workers whose calibrations land one step apart do not rehash
+  the same password back and forth.
+
+Bulk hashing spreads work over a process pool: bcrypt and argon2 hold the
+GIL for most of a hash, so threads do not help. The pool uses the "spawn"
+start method, so workers never inherit the server's threads or database
+connections; they import only this module and get the policy with each task.
+"""
+import functools
+import logging
+import math
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import List, Optional
+
+import bcrypt
+
+logger = logging.getLogger(__name__)
+
+# Below this many passwords, pool start-up and IPC cost more than they save
+PARALLEL_THRESHOLD = 4
+
+# Calibration never goes below these (OWASP minimums) or above the maximums
+BCRYPT_MIN_ROUNDS = 10
+BCRYPT_MAX_ROUNDS = 16
+BCRYPT_PROBE_ROUNDS = 8
+ARGON2_MIN_TIME_COST = 2
+ARGON2_MAX_TIME_COST = 20
+
+_pool: Optional[ProcessPoolExecutor] = None
+_pool_lock = threading.Lock()
+_policy: Optional["HashPolicy"] = None
+_policy_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class HashPolicy:
+    """How new password hashes are made"""
+    scheme: str  # "bcrypt" or "argon2id"
+    bcrypt_rounds: int
+    argon2_time_cost: int
+    argon2_memory_kib: int
+    argon2_parallelism: int
+
+
+# === CALIBRATION ===
+
+def _probe_ms(run, repeats: int = 3) -> float:
+    best = math.inf
+    for _ in range(repeats):
+        started = time.perf_counter()
+        run()
+        best = min(best, (time.perf_counter() - started) * 1000)
+    return best
+
+
+def _calibrate_bcrypt_rounds(target_ms: float) -> int:
+    # Each extra round doubles the work
+    probe_ms = _probe_ms(lambda: bcrypt.hashpw(b"calibration", bcrypt.gensalt(BCRYPT_PROBE_ROUNDS)))
+    rounds = BCRYPT_PROBE_ROUNDS + int(math.floor(math.log2(max(target_ms / probe_ms, 1))))
+    return max(BCRYPT_MIN_ROUNDS, min(BCRYPT_MAX_ROUNDS, rounds))
+
+
+def _calibrate_argon2_time_cost(target_ms: float, memory_kib: int, parallelism: int) -> int:
+    from argon2.low_level import Type, hash_secret
+
+    # Work grows linearly with time_cost
+    probe_ms = _probe_ms(lambda: hash_secret(
+        b"calibration", os.urandom(16), time_cost=1, memory_cost=memory_kib,
+        parallelism=parallelism, hash_len=32, type=Type.ID,
+    ))
+    time_cost = int(target_ms // probe_ms)
+    return max(ARGON2_MIN_TIME_COST, min(ARGON2_MAX_TIME_COST, time_cost))
+
+
+def _build_policy() -> HashPolicy:
+    from app.core.config import settings
+
+    scheme = settings.password_hash_scheme.lower()
+    if scheme == "argon2id":
+        try:
+            import argon2  # noqa: F401
+        except ImportError:
+            logger.error("PASSWORD_HASH_SCHEME=argon2id needs the argon2-cffi package - using bcrypt")
+            scheme = "bcrypt"
+    elif scheme != "bcrypt":
+        logger.error("Unknown PASSWORD_HASH_SCHEME %r - using bcrypt", settings.password_hash_scheme)
+        scheme = "bcrypt"
+
+    bcrypt_rounds = settings.bcrypt_rounds
+    argon2_time_cost = settings.argon2_time_cost
+    if scheme == "bcrypt" and not bcrypt_rounds:
+        bcrypt_rounds = _calibrate_bcrypt_rounds(settings.password_hash_target_ms)
+    if scheme == "argon2id" and not argon2_time_cost:
+        argon2_time_cost = _calibrate_argon2_time_cost(
+            settings.password_hash_target_ms, settings.argon2_memory_kib, settings.argon2_parallelism
+        )
+
+    policy = HashPolicy(
+        scheme=scheme,
+        bcrypt_rounds=bcrypt_rounds or BCRYPT_MIN_ROUNDS,
+        argon2_time_cost=argon2_time_cost or ARGON2_MIN_TIME_COST,
+        argon2_memory_kib=settings.argon2_memory_kib,
+        argon2_parallelism=settings.argon2_parallelism,
+    )
+    logger.info("Password hashing policy: %s", policy)
+    return policy
+
+
+def get_policy() -> HashPolicy:
+    """The current policy, calibrating on first use (main.warm_up does it at startup)"""
+    global _policy
+    if _policy is None:
+        with _policy_lock:
+            if _policy is None:
+                _policy = _build_policy()
+    return _policy
+
+
+# === HASHING AND VERIFYING ===
+
+def _argon2_hasher(policy: HashPolicy):
+    from argon2 import PasswordHasher
+
+    return PasswordHasher(
+        time_cost=policy.argon2_time_cost,
+        memory_cost=policy.argon2_memory_kib,
+        parallelism=policy.argon2_parallelism,
+    )
+
+
+def _hash_with(policy: HashPolicy, password: str) -> str:
+    if policy.scheme == "argon2id":
+        return _argon2_hasher(policy).hash(password)
+    return bcrypt.hashpw(password.encode("utf-8"), bcrypt.gensalt(policy.bcrypt_rounds)).decode("utf-8")
+
+
+def hash_password(password: str) -> str:
+    """Hash of one password under the current policy, as stored in users.password_hash"""
+    return _hash_with(get_policy(), password)
+
+
+def verify_password(password: str, password_hash: str) -> bool:
+    """Check a password against a stored hash of any supported scheme"""
+    if password_hash.startswith("$argon2"):
+        from argon2 import PasswordHasher
+        from argon2.exceptions import VerificationError, InvalidHashError
+
+        try:
+            return PasswordHasher().verify(password_hash, password)
+        except (VerificationError, InvalidHashError):
+            return False
+    return bcrypt.checkpw(password.encode("utf-8"), password_hash.encode("utf-8"))
+
+
+def needs_rehash(password_hash: str) -> bool:
+    """True if the stored hash should be replaced with one under the current policy"""
+    policy = get_policy()
+    if password_hash.startswith("$argon2"):
+        if policy.scheme != "argon2id":
+            return True
+        return _argon2_hasher(policy).check_needs_rehash(password_hash)
+    if policy.scheme != "bcrypt":
+        return True
+    try:
+        rounds = int(password_hash.split("$")[2])
+    except (IndexError, ValueError):
+        return True
+    return rounds < policy.bcrypt_rounds or rounds > policy.bcrypt_rounds + 1
+
+
+# === BULK HASHING ===
+
+def _worker_count() -> int:
+    from app.core.config import settings
+
+    return settings.password_hash_workers or os.cpu_count() or 1
+
+
+def _get_pool() -> ProcessPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=_worker_count(), mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def hash_passwords(passwords: List[str]) -> List[str]:
+    """Hashes of the given passwords, in order, computed in parallel when worthwhile"""
+    hash_one = functools.partial(_hash_with, get_policy())
+    workers = _worker_count()
+    if len(passwords) < PARALLEL_THRESHOLD or workers == 1:
+        return [hash_one(password) for password in passwords]
+    chunksize = max(1, len(passwords) // (workers * 4))
+    return list(_get_pool().map(hash_one, passwords, chunksize=chunksize))
+
+
+def shutdown_pool():
+    """Stop the worker processes (called on application shutdown)"""
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+            _pool = None
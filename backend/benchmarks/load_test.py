@@ -0,0 +1,445 @@
+"""
+API load benchmark with recorded baselines
+
+Boots main:app under uvicorn against a throwaway database, seeds it with
+synthetic departments, staff and years of Ward 1 monthly reports, then drives
+each scenario with a pool of closed-loop clients for a fixed duration:
+
+    login_storm        POST /auth/login with random staff credentials
+    dashboard_polling  GET /ward1/monthly-reports/{year} and /ward1/statistics/{year}
+    user_listing       GET /users/ pages as a management user
+    mixed              weighted blend of the three, like a busy morning
+
+Throughput and p50/p95/p99 latencies are compared against a baseline file in
+benchmarks/baselines/ (one per database backend, versioned in git). The run
+fails when throughput drops, or p95/p99 grow, by more than --threshold, or
+when more than 1% of requests fail.
+
+Usage (from the backend directory):
+    python benchmarks/load_test.py                     # SQLite stand-in, compare to baseline
+    python benchmarks/load_test.py --record            # refresh the baseline after an intended change
+    python benchmarks/load_test.py --database-url mysql+pymysql://user:pw@localhost/hms_bench
+
+Never point --database-url at a real database: the benchmark creates and seeds tables.
+Baselines are only comparable on the same machine with the same options.
+"""
+import argparse
+import http.client
+import json
+import os
+import platform
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Settings are read at import time; the harness itself only needs placeholders
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("DB_USER", "benchmark")
+os.environ.setdefault("DB_NAME", "benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+
+from sqlalchemy import create_engine, make_url, select  # noqa: E402
+
+from app.database.migrations import upgrade_database  # noqa: E402
+from app.models.user import User  # noqa: E402
+from scripts.generate_synthetic_data import EMPLOYEE_ID_PREFIX, FIRST_REPORT_YEAR, generate  # noqa: E402
+
+BASELINE_FORMAT_VERSION = 1
+BASELINE_DIR = BACKEND_DIR / "benchmarks" / "baselines"
+API_PREFIX = "/api/v1"
+
+SEED_PASSWORD = "benchmark123"
+MANAGEMENT_ROLES = ["Administrator", "Doctor"]  # require_management
+MAX_ERROR_RATE = 0.01
+
+
+# === SEEDING ===
+
+def seed_database(database_url: str, departments: int, users: int, years: int, seed: int) -> str:
+    """Migrate the throwaway database, bulk-load synthetic data, return a management employee ID"""
+    engine = create_engine(database_url)
+    try:
+        upgrade_database("head", bind=engine)
+        # Production bcrypt cost so the login storm is realistic; a few hashes keep seeding fast
+        generate(
+            engine, departments, users, years, seed=seed, password=SEED_PASSWORD,
+            bcrypt_rounds=12, distinct_hashes=8, log=lambda message: None,
+        )
+        with engine.connect() as connection:
+            return connection.execute(
+                select(User.employee_id).where(User.role.in_(MANAGEMENT_ROLES)).order_by(User.id).limit(1)
+            ).scalar_one()
+    finally:
+        engine.dispose()
+
+
+def report_years(years: int) -> range:
+    return range(FIRST_REPORT_YEAR, FIRST_REPORT_YEAR + years)
+
+
+# === SERVER ===
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Server:
+    """main:app under uvicorn in a child process, the way it runs in production"""
+
+    def __init__(self, database_url: str, port: int, log_path: Path):
+        self.port = port
+        self.log_path = log_path
+        env = dict(os.environ)
+        env.update({
+            "DATABASE_URL": database_url,
+            "DEBUG": "false",  # SQL echo would dominate the measurements
+            "CREATE_DEFAULT_ADMIN": "false",
+            # The clients all log in from 127.0.0.1, often as the same account;
+            # login throttling would turn the scenarios into 429 measurements
+            "LOGIN_RATE_LIMIT_ENABLED": "false",
+        })
+        self._log = open(log_path, "w")
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+             "--port", str(port), "--log-level", "warning", "--no-access-log"],
+            cwd=BACKEND_DIR, env=env, stdout=self._log, stderr=subprocess.STDOUT,
+        )
+
+    def wait_ready(self, timeout: float = 60.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if self.process.poll() is not None:
+                raise RuntimeError(f"Server exited during startup, see {self.log_path}")
+            try:
+                connection = http.client.HTTPConnection("127.0.0.1", self.port, timeout=2)
+                connection.request("GET", "/health/startup")
+                response = connection.getresponse()
+                body = json.loads(response.read() or b"{}")
+                connection.close()
+                if body.get("ready_ms") is not None:
+                    return
+            except (OSError, ValueError):
+                pass
+            time.sleep(0.2)
+        raise RuntimeError(f"Server not ready after {timeout:.0f}s, see {self.log_path}")
+
+    def stop(self):
+        self.process.terminate()
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self._log.close()
+
+
+# === CLIENT ===
+
+class Client:
+    """Keep-alive HTTP client for one simulated user"""
+
+    def __init__(self, port: int):
+        self.connection = http.client.HTTPConnection("127.0.0.1", port, timeout=30)
+        self.token: Optional[str] = None
+
+    def request(self, method: str, path: str, body: Optional[dict] = None) -> Tuple[int, bytes]:
+        headers = {"Content-Type": "application/json"}
+        if self.token:
+            headers["Authorization"] = f"Bearer {self.token}"
+        payload = json.dumps(body) if body is not None else None
+        try:
+            self.connection.request(method, API_PREFIX + path, body=payload, headers=headers)
+            response = self.connection.getresponse()
+            return response.status, response.read()
+        except (OSError, http.client.HTTPException):
+            self.connection.close()  # reconnects on the next request
+            return 0, b""
+
+    def login(self, employee_id: str) -> Tuple[int, bytes]:
+        status, body = self.request("POST", "/auth/login", {"employee_id": employee_id, "password": SEED_PASSWORD})
+        if status == 200:
+            self.token = json.loads(body)["access_token"]
+        return status, body
+
+    def close(self):
+        self.connection.close()
+
+
+# === SCENARIOS ===
+
+@dataclass
+class Workload:
+    users: int
+    years: int
+    rng: random.Random
+
+    def staff_id(self) -> str:
+        return f"{EMPLOYEE_ID_PREFIX}{self.rng.randint(1, self.users):07d}"
+
+    def year(self) -> int:
+        return self.rng.choice(report_years(self.years))
+
+
+def login_storm(client: Client, workload: Workload) -> int:
+    # Throwaway logins: the client keeps the identity it started with
+    return client.request("POST", "/auth/login", {"employee_id": workload.staff_id(), "password": SEED_PASSWORD})[0]
+
+
+def poll_reports(client: Client, workload: Workload) -> int:
+    return client.request("GET", f"/ward1/monthly-reports/{workload.year()}")[0]
+
+
+def poll_statistics(client: Client, workload: Workload) -> int:
+    return client.request("GET", f"/ward1/statistics/{workload.year()}")[0]
+
+
+def list_users(client: Client, workload: Workload) -> int:
+    page = workload.rng.randint(0, max(workload.users // 50 - 1, 0))
+    return client.request("GET", f"/users/?skip={page * 50}&limit=50")[0]
+
+
+Operation = Callable[[Client, Workload], int]
+
+# name -> (operations with weights, identity each client logs in as before the run)
+SCENARIOS: Dict[str, Tuple[List[Tuple[Operation, int]], Optional[str]]] = {
+    "login_storm": ([(login_storm, 1)], None),
+    "dashboard_polling": ([(poll_reports, 1), (poll_statistics, 1)], "staff"),
+    "user_listing": ([(list_users, 1)], "management"),
+    "mixed": ([(poll_reports, 6), (poll_statistics, 6), (list_users, 2), (login_storm, 1)], "management"),
+}
+
+
+@dataclass
+class ScenarioResult:
+    latencies_ms: List[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    def summary(self) -> dict:
+        latencies = sorted(self.latencies_ms)
+        total = len(latencies)
+        return {
+            "requests": total,
+            "errors": self.errors,
+            "throughput_rps": round(total / self.elapsed, 1) if self.elapsed else 0.0,
+            "p50_ms": percentile(latencies, 50),
+            "p95_ms": percentile(latencies, 95),
+            "p99_ms": percentile(latencies, 99),
+        }
+
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values))) - 1, 0)
+    return round(sorted_values[min(rank, len(sorted_values) - 1)], 2)
+
+
+def run_scenario(name: str, port: int, management_id: str, args) -> ScenarioResult:
+    operations, identity = SCENARIOS[name]
+    functions = [operation for operation, _ in operations]
+    weights = [weight for _, weight in operations]
+    result = ScenarioResult()
+    lock = threading.Lock()
+    start_barrier = threading.Barrier(args.concurrency + 1)
+    timing = {}
+
+    def worker(index: int):
+        workload = Workload(args.users, args.years, random.Random(args.seed * 1000 + index))
+        client = Client(port)
+        if identity == "management":
+            client.login(management_id)
+        elif identity == "staff":
+            client.login(workload.staff_id())
+        latencies, errors = [], 0
+        start_barrier.wait()
+        warmup_end = timing["start"] + args.warmup
+        end = warmup_end + args.duration
+        while True:
+            operation = workload.rng.choices(functions, weights)[0]
+            began = time.perf_counter()
+            status = operation(client, workload)
+            finished = time.perf_counter()
+            if finished >= end:
+                break
+            if began < warmup_end:
+                continue
+            latencies.append((finished - began) * 1000)
+            if status >= 400 or status == 0:
+                errors += 1
+        client.close()
+        with lock:
+            result.latencies_ms.extend(latencies)
+            result.errors += errors
+
+    threads = [threading.Thread(target=worker, args=(i,), daemon=True) for i in range(args.concurrency)]
+    for thread in threads:
+        thread.start()
+    timing["start"] = time.perf_counter()
+    start_barrier.wait()
+    for thread in threads:
+        thread.join()
+    result.elapsed = args.duration
+    return result
+
+
+# === BASELINES ===
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_config(args) -> dict:
+    """Options that must match for two runs to be comparable"""
+    return {
+        "concurrency": args.concurrency,
+        "duration_s": args.duration,
+        "departments": args.departments,
+        "users": args.users,
+        "years": args.years,
+        "seed": args.seed,
+    }
+
+
+def compare(baseline: dict, results: Dict[str, dict], threshold: float) -> List[str]:
+    """Return one line per regression beyond the threshold"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline["results"].get(name)
+        if previous is None:
+            continue
+        if current["throughput_rps"] < previous["throughput_rps"] * (1 - threshold):
+            regressions.append(
+                f"{name}: throughput {current['throughput_rps']} rps < baseline {previous['throughput_rps']} rps"
+            )
+        for metric in ("p95_ms", "p99_ms"):
+            if current[metric] > previous[metric] * (1 + threshold):
+                regressions.append(f"{name}: {metric} {current[metric]} > baseline {previous[metric]}")
+    return regressions
+
+
+def print_table(results: Dict[str, dict], baseline: Optional[dict]):
+    print(f"{'scenario':<20}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, summary in results.items():
+        print(
+            f"{name:<20}{summary['requests']:>10}{summary['errors']:>8}{summary['throughput_rps']:>10}"
+            f"{summary['p50_ms']:>10}{summary['p95_ms']:>10}{summary['p99_ms']:>10}"
+        )
+        previous = (baseline or {}).get("results", {}).get(name)
+        if previous:
+            print(
+                f"{'  baseline':<20}{previous['requests']:>10}{previous['errors']:>8}{previous['throughput_rps']:>10}"
+                f"{previous['p50_ms']:>10}{previous['p95_ms']:>10}{previous['p99_ms']:>10}"
+            )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", help="Throwaway database to seed (default: temporary SQLite file)")
+    parser.add_argument("--scenarios", nargs="+", choices=list(SCENARIOS), default=list(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=8, help="Simultaneous clients")
+    parser.add_argument("--duration", type=float, default=15.0, help="Measured seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds before each scenario")
+    parser.add_argument("--departments", type=int, default=50)
+    parser.add_argument("--users", type=int, default=1000)
+    parser.add_argument("--years", type=int, default=11, help=f"Years of reports from {FIRST_REPORT_YEAR}")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--baseline", type=Path, help="Baseline file (default: baselines/<backend>.json)")
+    parser.add_argument("--threshold", type=float, default=0.20, help="Allowed regression, as a fraction")
+    parser.add_argument("--record", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--keep", action="store_true", help="Keep the temporary database and server log")
+    args = parser.parse_args()
+
+    workdir = Path(tempfile.mkdtemp(prefix="hms-bench-"))
+    database_url = args.database_url or f"sqlite:///{workdir / 'benchmark.db'}"
+    backend = make_url(database_url).get_backend_name()
+    baseline_path = args.baseline or BASELINE_DIR / f"{backend}.json"
+
+    print(f"Seeding {backend}: {args.departments} departments, {args.users} users, {args.years} years of reports")
+    management_id = seed_database(database_url, args.departments, args.users, args.years, args.seed)
+
+    server = Server(database_url, free_port(), workdir / "server.log")
+    results: Dict[str, dict] = {}
+    try:
+        server.wait_ready()
+        for name in args.scenarios:
+            print(f"Running {name} for {args.duration:.0f}s with {args.concurrency} clients...")
+            results[name] = run_scenario(name, server.port, management_id, args).summary()
+    finally:
+        server.stop()
+        if not args.keep:
+            for path in workdir.iterdir():
+                path.unlink()
+            workdir.rmdir()
+
+    baseline = None
+    if baseline_path.exists():
+        baseline = json.loads(baseline_path.read_text())
+    print()
+    print_table(results, baseline)
+    print()
+
+    failures = [
+        f"{name}: {summary['errors']} of {summary['requests']} requests failed"
+        for name, summary in results.items()
+        if summary["requests"] == 0 or summary["errors"] > summary["requests"] * MAX_ERROR_RATE
+    ]
+
+    if args.record:
+        if failures:
+            print("Not recording a baseline from a failing run:")
+            print("\n".join(f"  {line}" for line in failures))
+            return 1
+        baseline_path.parent.mkdir(parents=True, exist_ok=True)
+        baseline_path.write_text(json.dumps({
+            "format_version": BASELINE_FORMAT_VERSION,
+            "recorded_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_commit": git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "database": backend,
+            "config": run_config(args),
+            "results": results,
+        }, indent=2) + "\n")
+        print(f"Recorded baseline {baseline_path}")
+        return 0
+
+    if baseline is None:
+        print(f"No baseline at {baseline_path}; run with --record to create one")
+    elif baseline.get("format_version") != BASELINE_FORMAT_VERSION:
+        print(f"Baseline {baseline_path} uses format {baseline.get('format_version')}; re-record it")
+        return 1
+    elif baseline["config"] != run_config(args):
+        print(f"Baseline {baseline_path} was recorded with different options: {baseline['config']}")
+        return 1
+    else:
+        failures += compare(baseline, results, args.threshold)
+
+    if failures:
+        print(f"FAILED ({len(failures)}):")
+        print("\n".join(f"  {line}" for line in failures))
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
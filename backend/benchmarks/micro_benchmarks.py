@@ -0,0 +1,236 @@
+"""
+Micro-benchmarks for service-layer hot paths
+
+Times individual functions in isolation against an in-memory SQLite database,
+so a change to one of them can be measured without the noise of a full HTTP
+load run (see load_test.py for that). Each benchmark is calibrated so one
+batch of calls takes at least --min-time, then repeated --repeat times; the
+fastest batch is the headline number, the median shows the spread.
+
+Usage (from the backend directory):
+    python benchmarks/micro_benchmarks.py                          # everything
+    python benchmarks/micro_benchmarks.py -k jwt -k statistics     # name filters
+    python benchmarks/micro_benchmarks.py --json before.json       # save results
+    python benchmarks/micro_benchmarks.py --compare before.json    # show the change against a saved run
+"""
+import argparse
+import json
+import os
+import statistics
+import sys
+import time
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+BACKEND_DIR = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(BACKEND_DIR))
+
+# Settings are read at import time; an in-memory database needs no real values
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("DB_USER", "benchmark")
+os.environ.setdefault("DB_NAME", "benchmark")
+os.environ.setdefault("SECRET_KEY", "benchmark-secret-key")
+os.environ["DEBUG"] = "false"
+
+import bcrypt  # noqa: E402
+from sqlalchemy import create_engine, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.database.database import Base  # noqa: E402
+from app.models.department import Department  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.ward1_monthly_report import Ward1MonthlyReport, ReportStatus  # noqa: E402
+from app.schemas.ward1_monthly_report import Ward1MonthlyReportResponse  # noqa: E402
+from app.services.user_service import UserService  # noqa: E402
+from app.services.ward1_monthly_report_service import Ward1MonthlyReportService  # noqa: E402
+from app.utils.jwt_handler import JWTHandler  # noqa: E402
+
+DEFAULT_USER_TABLE_SIZES = [100, 1000, 10000]
+REPORT_YEARS = range(2020, 2031)
+TOKEN_DATA = {
+    "user_id": 42,
+    "employee_id": "EMP000042",
+    "name": "Staff Member 42",
+    "role": "Doctor",
+    "department_id": 7,
+    "type": "access",
+}
+
+
+# === FIXTURES ===
+
+def in_memory_engine(users: int = 0):
+    """Fresh in-memory database with the full schema and `users` seeded staff"""
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as connection:
+        connection.execute(insert(Department), [
+            {"name": f"Department {i:03d}", "status": "Active"} for i in range(1, 51)
+        ])
+        if users:
+            connection.execute(insert(User), [
+                {
+                    "employee_id": f"EMP{i:06d}",
+                    "name": f"Staff Member {i}",
+                    "password_hash": "x",
+                    "role": "Nurse",
+                    "department_id": i % 50 + 1,
+                }
+                for i in range(1, users + 1)
+            ])
+        connection.execute(insert(Ward1MonthlyReport), [
+            {
+                "year": year,
+                "month": month,
+                "report_date": date(year, month, 1),
+                "total_beds": 30,
+                "admissions_male": 20 + month,
+                "admissions_female": 25 + month,
+                "discharges": 40 + month,
+                "midnight_total": 18 + month,
+                "number_of_death": month % 3,
+                "status": ReportStatus.approved,
+            }
+            for year in REPORT_YEARS
+            for month in range(1, 13)
+        ])
+    return engine
+
+
+def load_report(engine) -> Ward1MonthlyReport:
+    with Session(bind=engine) as db:
+        report = Ward1MonthlyReportService.get_report_by_year_month(db, 2024, 6)
+        db.expunge(report)
+    return report
+
+
+# === BENCHMARKS ===
+
+Benchmark = Callable[[], object]
+
+
+def build_benchmarks(user_table_sizes: List[int]) -> Dict[str, Benchmark]:
+    """Name -> zero-argument callable; shared setup happens here, outside the timing"""
+    engine = in_memory_engine()
+    report = load_report(engine)
+    token = JWTHandler.create_access_token(TOKEN_DATA)
+    user = User(employee_id="EMP000042", name="Staff Member 42", role="Doctor")
+    user.password_hash = bcrypt.hashpw(b"benchmark123", bcrypt.gensalt()).decode("utf-8")
+
+    def with_session(target_engine, fn):
+        def run():
+            with Session(bind=target_engine) as db:
+                return fn(db)
+        return run
+
+    benchmarks: Dict[str, Benchmark] = {
+        "JWTHandler.create_access_token": lambda: JWTHandler.create_access_token(TOKEN_DATA),
+        "JWTHandler.verify_token": lambda: JWTHandler.verify_token(token),
+        "User.check_password": lambda: user.check_password("benchmark123"),
+        "Ward1MonthlyReport.to_dict": report.to_dict,
+        "Ward1MonthlyReportResponse.from_orm": lambda: Ward1MonthlyReportResponse.from_orm(report),
+        "Ward1MonthlyReportService.get_report_statistics": with_session(
+            engine, lambda db: Ward1MonthlyReportService.get_report_statistics(db, 2024)
+        ),
+    }
+
+    for size in user_table_sizes:
+        sized_engine = in_memory_engine(users=size)
+        benchmarks[f"UserService.get_all_users[{size} users, page of 50]"] = with_session(
+            sized_engine, lambda db: UserService.get_all_users(db, skip=0, limit=50)
+        )
+        # The /users/ endpoint counts the table by loading up to 10000 rows
+        benchmarks[f"UserService.get_all_users[{size} users, limit 10000]"] = with_session(
+            sized_engine, lambda db: UserService.get_all_users(db, skip=0, limit=10000)
+        )
+    return benchmarks
+
+
+# === TIMING ===
+
+@dataclass
+class Timing:
+    calls_per_batch: int
+    per_call_seconds: List[float]
+
+    @property
+    def best(self) -> float:
+        return min(self.per_call_seconds)
+
+    @property
+    def median(self) -> float:
+        return statistics.median(self.per_call_seconds)
+
+    def as_dict(self) -> dict:
+        return {"calls_per_batch": self.calls_per_batch, "best_s": self.best, "median_s": self.median}
+
+
+def run_batch(fn: Benchmark, calls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(calls):
+        fn()
+    return time.perf_counter() - start
+
+
+def measure(fn: Benchmark, repeat: int, min_time: float) -> Timing:
+    """Calibrate the batch size like timeit.autorange, then time `repeat` batches"""
+    fn()  # warm caches (compiled queries, imports) before timing
+    calls = 1
+    while True:
+        elapsed = run_batch(fn, calls)
+        if elapsed >= min_time:
+            break
+        calls = max(calls * 2, int(calls * min_time / max(elapsed, 1e-9)))
+    return Timing(calls, [run_batch(fn, calls) / calls for _ in range(repeat)])
+
+
+def format_duration(seconds: float) -> str:
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.2f} us"
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-k", dest="filters", action="append", default=[],
+                        help="Only run benchmarks whose name contains this (repeatable)")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_USER_TABLE_SIZES,
+                        help="User table sizes for the get_all_users benchmarks")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed batches per benchmark")
+    parser.add_argument("--min-time", type=float, default=0.2, help="Minimum seconds per batch")
+    parser.add_argument("--json", type=Path, help="Write results to this file")
+    parser.add_argument("--compare", type=Path, help="Saved results to compare against")
+    args = parser.parse_args()
+
+    previous: Dict[str, dict] = {}
+    if args.compare:
+        previous = json.loads(args.compare.read_text())["results"]
+
+    benchmarks = build_benchmarks(args.sizes)
+    results: Dict[str, dict] = {}
+    width = max(len(name) for name in benchmarks) + 2
+    header = f"{'benchmark':<{width}}{'best':>12}{'median':>12}{'calls':>8}"
+    print(header + ("   change" if previous else ""))
+
+    for name, fn in benchmarks.items():
+        if args.filters and not any(f.lower() in name.lower() for f in args.filters):
+            continue
+        timing = measure(fn, args.repeat, args.min_time)
+        results[name] = timing.as_dict()
+        line = f"{name:<{width}}{format_duration(timing.best):>12}{format_duration(timing.median):>12}{timing.calls_per_batch:>8}"
+        before: Optional[dict] = previous.get(name)
+        if before:
+            line += f"   {(timing.best / before['best_s'] - 1) * 100:+.1f}%"
+        print(line, flush=True)
+
+    if args.json:
+        args.json.write_text(json.dumps({"results": results}, indent=2) + "\n")
+        print(f"Wrote {args.json}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
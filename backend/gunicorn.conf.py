@@ -0,0 +1,74 @@
+"""
+Gunicorn configuration for production (used by serve.py)
+
+Gunicorn manages uvicorn workers:
+- The app is imported once in the master (preload_app), and the database is
+  bootstrapped there before forking, so workers start fast and migrations
+  run exactly once
+- Each worker drops the connections it inherited; its lifespan warm-up
+  (main.warm_up) opens its own pool before it takes traffic
+- Signals to the master (pid in SERVER_PIDFILE when set):
+    HUP         re-read this config and replace workers gracefully. The app
+                is preloaded, so this does not pick up new code.
+    USR2        start a new master with new code next to the old one; then
+                WINCH to the old master to stop its workers, and QUIT to
+                retire it. This is the zero-downtime rolling deploy.
+    TERM        graceful shutdown (workers get SERVER_GRACEFUL_TIMEOUT)
+    TTIN / TTOU add / remove a worker
+"""
+import os
+
+from app.core.config import settings
+
+
+def default_workers() -> int:
+    """One async worker per CPU this process may run on"""
+    if hasattr(os, "sched_getaffinity"):
+        return max(len(os.sched_getaffinity(0)), 1)
+    return os.cpu_count() or 1
+
+
+# === SERVER SOCKET ===
+bind = f"{settings.server_host}:{settings.server_port}"
+backlog = settings.server_backlog
+
+# === WORKERS ===
+workers = settings.server_workers or default_workers()
+worker_class = "uvicorn.workers.UvicornWorker"
+keepalive = settings.server_keepalive
+timeout = settings.server_timeout
+graceful_timeout = settings.server_graceful_timeout
+max_requests = settings.server_max_requests
+max_requests_jitter = settings.server_max_requests_jitter
+preload_app = True
+pidfile = settings.server_pidfile or None
+# Uvicorn workers take the client address from X-Forwarded-For only when the
+# peer is one of these proxies (login throttling is keyed on it)
+forwarded_allow_ips = settings.server_forwarded_allow_ips
+
+# === LOGGING ===
+# Access lines are left to the app's structured logs; errors go to stderr
+accesslog = None
+errorlog = "-"
+loglevel = settings.log_level.lower()
+
+
+# === SERVER HOOKS ===
+
+def on_starting(server):
+    """Bootstrap the database once, in the master, before any worker exists"""
+    import main
+    from app.database.database import engine
+
+    main.bootstrap_database()
+    main.database_bootstrapped = True
+    # Connections must not be shared across fork
+    engine.dispose()
+
+
+def post_fork(server, worker):
+    """Drop inherited connections; the worker's lifespan warm-up opens its own pool"""
+    from app.database.database import engine
+
+    # Forget inherited connections without closing them under another process
+    engine.dispose(close=False)
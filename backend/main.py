@@ -1,49 +1,166 @@
-from fastapi import FastAPI
+from app.core.startup_profiler import startup_profiler
+
+# Time application imports for the startup report
+startup_profiler.install_import_hook()
+
+from fastapi import FastAPI, Request, Response
+from fastapi.encoders import jsonable_encoder
+from fastapi.exceptions import RequestValidationError
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse
+from starlette.exceptions import HTTPException as StarletteHTTPException
 from contextlib import asynccontextmanager
+from app.core.cache import cache_stats
+from app.core.jwt_keys import get_key_ring
 from app.core.config import settings
+from app.core.logging_config import configure_logging, logging_stats
+from app.core.metrics import metrics, CONTENT_TYPE as METRICS_CONTENT_TYPE, http_request_duration, http_slow_requests
+from app.core.request_context import REQUEST_ID_HEADER, RequestContext, request_context_var, resolve_request_id
+from app.core.request_profiler import request_profiler, PROFILE_ID_HEADER
+from app.core.token_revocation import revocation_list
+from app.core.tracing import tracer
 from app.database.connection import test_database_connection, create_database_if_not_exists
-from app.database.database import create_tables
+from app.database.migrations import ensure_schema_current, is_schema_current
 from app.api.v1.api import api_router
+from app.database.database import engine, replica_engines, replica_router, SessionLocal, warm_connection_pool
+from app.database import sql_context
+from app.database.loading import install_strict_loading
 from app.services.startup_service import run_startup_initialization
+from app.services.reference_data_service import ReferenceDataService
+from app.utils.password_hashing import get_policy as get_password_policy, shutdown_pool as shutdown_hash_pool
+import asyncio
 import logging
 
-# Configure logging
-logging.basicConfig(level=logging.INFO)
+startup_profiler.uninstall_import_hook()
+
+# Configure logging (queued JSON records written by a background thread)
+configure_logging()
 logger = logging.getLogger(__name__)
 
 
+# Set by gunicorn.conf.py once the master process has bootstrapped the
+# database, so forked workers do not all run migrations at once
+database_bootstrapped = False
+
+
+def bootstrap_database():
+    """
+    Run database bootstrap steps
+
+    In fast-start mode the steps are skipped when the Alembic revision stamp
+    shows the database is already at the head revision.
+    """
+    if settings.fast_start:
+        with startup_profiler.step("check_schema_revision"):
+            schema_current = is_schema_current()
+
+        if schema_current:
+            for step_name in ("create_database", "test_connection", "migrate_schema", "startup_initialization"):
+                startup_profiler.skip(step_name, "schema revision is current")
+            logger.info("Schema revision is current - skipping database bootstrap")
+            return
+
+    # Create database if it doesn't exist
+    with startup_profiler.step("create_database"):
+        create_database_if_not_exists()
+
+    # Test database connection (the migration check already proves it in fast-start mode)
+    if settings.fast_start:
+        startup_profiler.skip("test_connection", "covered by migrate_schema")
+    else:
+        with startup_profiler.step("test_connection"):
+            connected = test_database_connection()
+
+        if not connected:
+            logger.error("Failed to establish database connection")
+            return
+
+        logger.info("Database connection established successfully")
+
+    # Apply pending migrations (a single revision query when already current)
+    with startup_profiler.step("migrate_schema"):
+        schema_ready = ensure_schema_current()
+
+    if not schema_ready:
+        return
+
+    # Initialize default admin credentials
+    with startup_profiler.step("startup_initialization"):
+        run_startup_initialization()
+
+
+def warm_up():
+    """
+    Pay first-request costs before reporting ready
+
+    Opens the full connection pool, calibrates password hashing, loads the
+    JWT key ring, revoked tokens and reference data into memory and builds
+    the OpenAPI schema. Failures are logged; the app
+    still starts, fills the caches on demand and retries the revocation
+    load on its next background sync.
+    """
+    steps = (
+        ("warm_connection_pool", lambda: warm_connection_pool(settings.db_pool_size)),
+        ("calibrate_password_hashing", get_password_policy),
+        ("load_signing_keys", get_key_ring),
+        ("load_revocations", _load_revocations),
+        ("warm_caches", _warm_caches),
+        ("warm_serializers", app.openapi),
+    )
+    for step_name, run_step in steps:
+        try:
+            with startup_profiler.step(step_name):
+                run_step()
+        except Exception as e:
+            logger.warning("Warm-up step %s failed: %s", step_name, e)
+
+
+def _load_revocations():
+    db = SessionLocal()
+    try:
+        revocation_list.sync(db)
+    finally:
+        db.close()
+
+
+def _warm_caches():
+    db = SessionLocal()
+    try:
+        ReferenceDataService.warm_up(db)
+    finally:
+        db.close()
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Lifespan event handler for startup and shutdown"""
     # Startup
     logger.info("Starting Hospital Management System API...")
     
-    # Create database if it doesn't exist
     try:
-        create_database_if_not_exists()
-        
-        # Test database connection
-        if test_database_connection():
-            logger.info("Database connection established successfully")
-            
-            # Create database tables
-            create_tables()
-            logger.info("Database tables created successfully")
-            
-            # Initialize default admin credentials
-            run_startup_initialization()
-            
+        if database_bootstrapped:
+            logger.info("Database bootstrapped by the server master process - skipping")
         else:
-            logger.error("Failed to establish database connection")
-            
+            # Keep the event loop free while blocking bootstrap I/O runs
+            await asyncio.to_thread(bootstrap_database)
     except Exception as e:
-        logger.error(f"Startup error: {e}")
+        logger.error("Startup error: %s", e)
+
+    await asyncio.to_thread(warm_up)
+    revocation_list.start_background_sync(SessionLocal)
+    replica_router.start_monitor()
+
+    # /ready reports ready from here on
+    startup_profiler.mark_ready()
+    startup_profiler.log_report()
     
     yield
     
     # Shutdown
     logger.info("Shutting down Hospital Management System API...")
+    revocation_list.stop_background_sync()
+    replica_router.stop_monitor()
+    shutdown_hash_pool()
 
 
 app = FastAPI(
@@ -64,6 +181,130 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Per-request profiling for admins (X-Profile header) and sampled traffic
+for db_engine in (engine, *replica_engines):
+    request_profiler.instrument_engine(db_engine)
+
+
+@app.middleware("http")
+async def profile_request(request: Request, call_next):
+    profile = request_profiler.start(request)
+    if profile is None:
+        return await call_next(request)
+
+    status_code = None
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+        response.headers[PROFILE_ID_HEADER] = profile.id
+        return response
+    finally:
+        # Stopping the sampler and writing the profile block; keep them off the event loop
+        await asyncio.to_thread(request_profiler.finish, profile, status_code)
+
+
+# Request tracing (wraps profiling and CORS, so the route span covers them; the
+# request context middleware below is registered last and is the outermost layer)
+for db_engine in (engine, *replica_engines):
+    tracer.instrument_engine(db_engine)
+tracer.instrument_serialization()
+
+
+@app.middleware("http")
+async def trace_request(request: Request, call_next):
+    attributes = {"http.method": request.method, "http.target": request.url.path}
+    with tracer.start_request_span(
+        f"{request.method} {request.url.path}", request.headers.get("traceparent"), attributes
+    ) as span:
+        response = await call_next(request)
+        if span is not None:
+            route = request.scope.get("route")
+            if route is not None:
+                # Name by route template so /users/1 and /users/2 group together
+                span.name = f"{request.method} {route.path}"
+                span.set_attribute("http.route", route.path)
+            span.set_attribute("http.status_code", response.status_code)
+        return response
+
+
+# Request correlation: SQL comments, query latency metrics and slow-query log
+for db_engine in (engine, *replica_engines):
+    sql_context.instrument_engine(db_engine)
+
+# Unplanned lazy relationship loads fail fast outside production
+install_strict_loading(SessionLocal)
+
+
+# Request context (outermost, so every layer sees it and the latency covers everything)
+@app.middleware("http")
+async def bind_request_context(request: Request, call_next):
+    context = RequestContext(
+        request_id=resolve_request_id(request.headers.get(REQUEST_ID_HEADER)),
+        method=request.method,
+        path=request.url.path,
+        scope=request.scope,
+    )
+    # Exception handlers run outside this middleware, so they read it from request.state
+    request.state.request_context = context
+    token = request_context_var.set(context)
+    status_code = 500
+    try:
+        response = await call_next(request)
+        status_code = response.status_code
+    except Exception:
+        logger.exception("Unhandled error in %s %s", request.method, request.url.path)
+        raise
+    finally:
+        elapsed_ms = context.elapsed_ms()
+        http_request_duration.observe(
+            elapsed_ms / 1000, method=request.method, route=context.route, status=status_code
+        )
+        if elapsed_ms >= settings.slow_request_ms:
+            http_slow_requests.inc(method=request.method, route=context.route)
+            logger.warning(
+                "Slow request (%.1f ms): %s %s -> %s",
+                elapsed_ms, request.method, context.route, status_code,
+                extra={"duration_ms": round(elapsed_ms, 1), "status_code": status_code},
+            )
+        request_context_var.reset(token)
+    response.headers[REQUEST_ID_HEADER] = context.request_id
+    return response
+
+
+# Error responses carry the request ID so users can quote it in bug reports
+def _request_id_of(request: Request):
+    context = getattr(request.state, "request_context", None)
+    return context.request_id if context is not None else None
+
+
+@app.exception_handler(StarletteHTTPException)
+async def http_exception_handler(request: Request, exc: StarletteHTTPException):
+    return JSONResponse(
+        status_code=exc.status_code,
+        content={"detail": exc.detail, "request_id": _request_id_of(request)},
+        headers=getattr(exc, "headers", None),
+    )
+
+
+@app.exception_handler(RequestValidationError)
+async def validation_exception_handler(request: Request, exc: RequestValidationError):
+    return JSONResponse(
+        status_code=422,
+        content={"detail": jsonable_encoder(exc.errors()), "request_id": _request_id_of(request)},
+    )
+
+
+@app.exception_handler(Exception)
+async def unhandled_exception_handler(request: Request, exc: Exception):
+    # Already logged with its traceback by bind_request_context
+    request_id = _request_id_of(request)
+    return JSONResponse(
+        status_code=500,
+        content={"detail": "Internal server error", "request_id": request_id},
+        headers={REQUEST_ID_HEADER: request_id} if request_id else None,
+    )
+
+
 # Include API routes
 app.include_router(api_router, prefix="/api/v1")
 
@@ -79,16 +320,50 @@ async def root():
 
 
 @app.get("/health")
-async def health_check():
-    """Health check endpoint"""
+def health_check():
+    """Health check endpoint (a plain def: the database probe blocks, so it runs in the threadpool)"""
     db_status = test_database_connection()
     return {
         "status": "healthy" if db_status else "unhealthy",
         "database": "connected" if db_status else "disconnected",
-        "environment": settings.environment
+        "environment": settings.environment,
+        "logging": logging_stats(),
+        "revocations": revocation_list.stats(),
+        "read_replicas": replica_router.stats()
     }
 
 
+if settings.metrics_enabled:
+    @app.get("/metrics", include_in_schema=False)
+    async def metrics_endpoint():
+        """Request and SQL latency histograms with request ID exemplars (OpenMetrics text)"""
+        return Response(content=metrics.render(), media_type=METRICS_CONTENT_TYPE)
+
+
+@app.get("/.well-known/jwks.json", include_in_schema=False)
+async def jwks():
+    """Public keys that verify access tokens (empty when tokens are signed with SECRET_KEY)"""
+    key_ring = get_key_ring()
+    return JSONResponse(
+        content=key_ring.jwks() if key_ring is not None else {"keys": []},
+        headers={"Cache-Control": f"public, max-age={int(settings.jwt_keys_reload_seconds)}"},
+    )
+
+
+@app.get("/ready")
+async def readiness_check():
+    """Readiness probe: 503 until bootstrap and warm-up have finished"""
+    if startup_profiler.ready_ms is None:
+        return JSONResponse(status_code=503, content={"ready": False})
+    return {"ready": True, "ready_ms": startup_profiler.ready_ms, "caches": cache_stats()}
+
+
+@app.get("/health/startup")
+async def startup_report():
+    """Startup report with import and bootstrap step timings"""
+    return startup_profiler.report()
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(
@@ -96,5 +371,6 @@ if __name__ == "__main__":
         host="0.0.0.0",
         port=8000,
         reload=settings.debug,
+        forwarded_allow_ips=settings.server_forwarded_allow_ips,
         log_level="info"
     )
\ No newline at end of file
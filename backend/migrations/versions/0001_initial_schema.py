@@ -0,0 +1,147 @@
+"""initial schema: departments, users, ward1_monthly_reports
+
+Matches the tables previously created by Base.metadata.create_all, so an
+existing database can be stamped at this revision without changes.
+
+Revision ID: 0001
+Revises:
+Create Date: 2025-01-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0001"
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _count_column(name: str) -> sa.Column:
+    # Defaults for report counters are applied by the ORM, not the database
+    return sa.Column(name, sa.Integer(), nullable=False)
+
+
+def upgrade() -> None:
+    # === DEPARTMENTS ===
+    op.create_table(
+        "departments",
+        sa.Column("id", sa.Integer(), autoincrement=True, nullable=False),
+        sa.Column("name", sa.String(length=100), nullable=False),
+        sa.Column("status", sa.String(length=20), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=True),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_departments_id", "departments", ["id"], unique=False)
+    op.create_index("ix_departments_name", "departments", ["name"], unique=True)
+
+    # === USERS ===
+    op.create_table(
+        "users",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("employee_id", sa.String(length=50), nullable=False),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("password_hash", sa.String(length=255), nullable=False),
+        sa.Column("role", sa.String(length=100), nullable=False),
+        sa.Column("department_id", sa.Integer(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["department_id"], ["departments.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index("ix_users_id", "users", ["id"], unique=False)
+    op.create_index("ix_users_employee_id", "users", ["employee_id"], unique=True)
+
+    # === WARD 1 MONTHLY REPORTS ===
+    op.create_table(
+        "ward1_monthly_reports",
+        sa.Column("year", sa.Integer(), nullable=False),
+        sa.Column("month", sa.Integer(), nullable=False),
+        sa.Column("report_date", sa.Date(), nullable=False),
+        # Admissions
+        _count_column("total_beds"),
+        _count_column("total_beds_hdu"),
+        _count_column("total_beds_ward"),
+        _count_column("total_beds_isolation"),
+        _count_column("admissions_male"),
+        _count_column("admissions_female"),
+        _count_column("admissions_ah"),
+        _count_column("admissions_amca"),
+        _count_column("admissions_sama"),
+        _count_column("admissions_ku"),
+        _count_column("admissions_munt"),
+        _count_column("admissions_ward02"),
+        _count_column("admissions_isolation"),
+        _count_column("admissions_hdu_unit"),
+        # Discharges & flow
+        sa.Column("bed_occupancy_rate", sa.DECIMAL(precision=5, scale=2), nullable=False),
+        sa.Column("avg_length_of_stay", sa.DECIMAL(precision=5, scale=2), nullable=False),
+        _count_column("midnight_total"),
+        _count_column("discharges"),
+        _count_column("lama"),
+        _count_column("re_admissions"),
+        _count_column("discharge_same_day"),
+        _count_column("transfer_to_other_hospitals"),
+        _count_column("transfer_from_other_hospitals"),
+        _count_column("weekday_transfers_in"),
+        _count_column("weekday_transfers_out"),
+        _count_column("weekend_transfers_in"),
+        _count_column("weekend_transfers_out"),
+        _count_column("missing"),
+        _count_column("number_of_death"),
+        _count_column("death_within_24hrs"),
+        _count_column("death_within_48hrs"),
+        sa.Column("death_rate", sa.DECIMAL(precision=5, scale=2), nullable=False),
+        # Diagnostics
+        _count_column("no_of_hd"),
+        _count_column("xray_inward"),
+        _count_column("xray_departmental"),
+        _count_column("ecg_inward"),
+        _count_column("ecg_departmental"),
+        _count_column("abg"),
+        sa.Column("wit_meetings", sa.Boolean(), nullable=False),
+        # Referrals
+        _count_column("referrals_cardiology"),
+        _count_column("referrals_chest_physician"),
+        _count_column("referrals_radiodiagnosis"),
+        _count_column("referrals_heumatology"),
+        _count_column("referrals_others"),
+        _count_column("total_referrals"),
+        # Metadata
+        sa.Column(
+            "status",
+            sa.Enum("draft", "submitted", "approved", name="reportstatus"),
+            nullable=False,
+        ),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now(), nullable=False),
+        sa.Column("created_by", sa.Integer(), nullable=True),
+        sa.Column("last_updated_by", sa.Integer(), nullable=True),
+        sa.CheckConstraint("month >= 1 AND month <= 12", name="check_valid_month"),
+        sa.CheckConstraint("year >= 2020", name="check_valid_year"),
+        sa.CheckConstraint("bed_occupancy_rate >= 0 AND bed_occupancy_rate <= 100", name="check_occupancy_rate"),
+        sa.CheckConstraint("death_rate >= 0 AND death_rate <= 100", name="check_death_rate"),
+        sa.CheckConstraint("avg_length_of_stay >= 0", name="check_length_of_stay"),
+        sa.CheckConstraint("total_beds > 0", name="check_total_beds"),
+        sa.CheckConstraint("total_beds_hdu >= 0", name="check_hdu_beds"),
+        sa.CheckConstraint("total_beds_ward >= 0", name="check_ward_beds"),
+        sa.CheckConstraint("total_beds_isolation >= 0", name="check_isolation_beds"),
+        sa.ForeignKeyConstraint(["created_by"], ["users.id"]),
+        sa.ForeignKeyConstraint(["last_updated_by"], ["users.id"]),
+        sa.PrimaryKeyConstraint("year", "month"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("ward1_monthly_reports")
+    op.drop_index("ix_users_employee_id", table_name="users")
+    op.drop_index("ix_users_id", table_name="users")
+    op.drop_table("users")
+    op.drop_index("ix_departments_name", table_name="departments")
+    op.drop_index("ix_departments_id", table_name="departments")
+    op.drop_table("departments")
@@ -0,0 +1,43 @@
+"""secondary indexes for report and user query shapes
+
+Indexes are added online (ALGORITHM=INPLACE, LOCK=NONE on MySQL).
+
+- users.role, users.department_id: get_users_by_role / get_users_by_department
+- departments (status, name): get_active_departments filter + ordering
+- ward1_monthly_reports (year, status): yearly statistics and status counts
+- ward1_monthly_reports created_by / last_updated_by: foreign key lookups
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2025-01-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from app.database.migration_ops import create_index_online, drop_index_online
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0002"
+down_revision: Union[str, None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+INDEXES = [
+    ("ix_users_role", "users", ["role"]),
+    ("ix_users_department_id", "users", ["department_id"]),
+    ("ix_departments_status_name", "departments", ["status", "name"]),
+    ("ix_ward1_monthly_reports_year_status", "ward1_monthly_reports", ["year", "status"]),
+    ("ix_ward1_monthly_reports_created_by", "ward1_monthly_reports", ["created_by"]),
+    ("ix_ward1_monthly_reports_last_updated_by", "ward1_monthly_reports", ["last_updated_by"]),
+]
+
+
+def upgrade() -> None:
+    for index_name, table_name, columns in INDEXES:
+        create_index_online(index_name, table_name, columns)
+
+
+def downgrade() -> None:
+    for index_name, table_name, _ in reversed(INDEXES):
+        drop_index_online(index_name, table_name)
@@ -0,0 +1,35 @@
+"""user search indexes: FULLTEXT ngram on users (name, employee_id)
+
+- ft_users_name_employee_id: substring search without full scans (MySQL only)
+- ix_users_name: prefix matches and ordering for short search terms
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2025-02-01 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from app.database.migration_ops import (
+    create_index_online,
+    drop_index_online,
+    create_fulltext_index,
+    drop_fulltext_index,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0003"
+down_revision: Union[str, None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    create_index_online("ix_users_name", "users", ["name"])
+    create_fulltext_index("ft_users_name_employee_id", "users", ["name", "employee_id"])
+
+
+def downgrade() -> None:
+    drop_fulltext_index("ft_users_name_employee_id", "users")
+    drop_index_online("ix_users_name", "users")
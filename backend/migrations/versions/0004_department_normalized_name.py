@@ -0,0 +1,69 @@
+"""departments.name_normalized for exact duplicate checks, FULLTEXT for fuzzy search
+
+- name_normalized: trimmed, single-spaced, case-folded name with a unique index,
+  so duplicate checks are one index probe
+- ft_departments_name: FULLTEXT ngram index for fuzzy department search (MySQL only)
+
+The backfill fails on the unique index if two existing names normalize to the
+same value. Rename one of them and rerun the migration.
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2025-02-15 00:00:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+from app.database.migration_ops import (
+    create_index_online,
+    drop_index_online,
+    create_fulltext_index,
+    drop_fulltext_index,
+)
+
+
+# revision identifiers, used by Alembic.
+revision: str = "0004"
+down_revision: Union[str, None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _normalize(name: str) -> str:
+    # Frozen copy of app.models.department.normalize_department_name
+    return " ".join(name.split()).casefold()
+
+
+def upgrade() -> None:
+    op.add_column("departments", sa.Column("name_normalized", sa.String(length=100), nullable=True))
+
+    departments = sa.table(
+        "departments",
+        sa.column("id", sa.Integer),
+        sa.column("name", sa.String),
+        sa.column("name_normalized", sa.String),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(departments.c.id, departments.c.name)).fetchall()
+    for department_id, name in rows:
+        connection.execute(
+            departments.update()
+            .where(departments.c.id == department_id)
+            .values(name_normalized=_normalize(name))
+        )
+
+    with op.batch_alter_table("departments") as batch_op:
+        batch_op.alter_column("name_normalized", existing_type=sa.String(length=100), nullable=False)
+
+    create_index_online("ix_departments_name_normalized", "departments", ["name_normalized"], unique=True)
+    create_fulltext_index("ft_departments_name", "departments", ["name"])
+
+
+def downgrade() -> None:
+    drop_fulltext_index("ft_departments_name", "departments")
+    drop_index_online("ix_departments_name_normalized", "departments")
+    with op.batch_alter_table("departments") as batch_op:
+        batch_op.drop_column("name_normalized")
@@ -0,0 +1,255 @@
+"""
+Query plan regression check
+
+Builds a throwaway database from the Alembic migrations, seeds it, runs every
+service method, captures each SELECT it emits, and EXPLAINs it. The check
+fails when a query scans a whole table unless that scenario is listed in
+ALLOWED_FULL_SCANS with a reason.
+
+Usage (from the backend directory):
+    python scripts/check_query_plans.py                          # in-memory SQLite
+    python scripts/check_query_plans.py --database-url mysql+pymysql://user:pw@host/hms_plan_check
+
+Never point --database-url at a real database: the check creates and seeds tables.
+"""
+import argparse
+import os
+import re
+import sys
+from contextlib import contextmanager
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Settings are read at import time; the check builds its own engine, so placeholders do
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("DB_USER", "plan_check")
+os.environ.setdefault("DB_NAME", "plan_check")
+os.environ.setdefault("SECRET_KEY", "plan-check-secret-key")
+
+from sqlalchemy import create_engine, event, insert  # noqa: E402
+from sqlalchemy.orm import Session  # noqa: E402
+from sqlalchemy.pool import StaticPool  # noqa: E402
+
+from app.database.migrations import upgrade_database  # noqa: E402
+from app.models.department import Department  # noqa: E402
+from app.models.refresh_token import RefreshToken  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.ward1_monthly_report import Ward1MonthlyReport, ReportStatus  # noqa: E402
+from app.services.department_service import DepartmentService  # noqa: E402
+from app.services.refresh_token_service import RefreshTokenService, _hash_token  # noqa: E402
+from app.services.user_service import UserService  # noqa: E402
+from app.services.startup_service import StartupService  # noqa: E402
+from app.services.ward1_monthly_report_service import Ward1MonthlyReportService  # noqa: E402
+from app.schemas.user import UserCreate  # noqa: E402
+from app.schemas.ward1_monthly_report import Ward1MonthlyReportCreate, Ward1MonthlyReportSubmit  # noqa: E402
+
+# Scenarios whose full scans are expected, with the reason
+ALLOWED_FULL_SCANS: Dict[str, str] = {
+    "DepartmentService.search_departments": "LIKE fallback off MySQL (MySQL uses the FULLTEXT ngram index)",
+    "UserService.get_all_users": "unfiltered pagination over all users",
+    "UserService.search_users": "LIKE fallback off MySQL (MySQL uses the FULLTEXT ngram index)",
+}
+
+SEED_DEPARTMENTS = 200
+SEED_USERS = 2000
+SEED_YEARS = range(2020, 2031)
+ROLES = ["Doctor", "Nurse", "Lab Technician", "Pharmacist", "Receptionist"]
+SEED_REFRESH_TOKENS = 2000
+REFRESH_TOKEN = "plan-check-refresh-token"
+
+
+def build_engine(database_url: str):
+    if database_url.startswith("sqlite"):
+        return create_engine(
+            database_url,
+            connect_args={"check_same_thread": False},
+            poolclass=StaticPool,
+        )
+    return create_engine(database_url)
+
+
+def seed(engine):
+    """Seed enough rows that the optimizer prefers indexes where they exist"""
+    with engine.begin() as connection:
+        connection.execute(insert(Department), [
+            {"name": f"Department {i:04d}", "status": "Active" if i % 4 else "Inactive"}
+            for i in range(1, SEED_DEPARTMENTS + 1)
+        ])
+        connection.execute(insert(User), [
+            {
+                "employee_id": f"EMP{i:06d}",
+                "name": f"Staff Member {i}",
+                "password_hash": "x",
+                "role": ROLES[i % len(ROLES)],
+                "department_id": (i % SEED_DEPARTMENTS) + 1,
+            }
+            for i in range(1, SEED_USERS + 1)
+        ])
+        connection.execute(insert(Ward1MonthlyReport), [
+            {
+                "year": year,
+                "month": month,
+                "report_date": date(year, month, 1),
+                "status": ReportStatus.approved if year < 2030 else ReportStatus.draft,
+                "created_by": (year * 12 + month) % SEED_USERS + 1,
+                "last_updated_by": (year * 12 + month) % SEED_USERS + 1,
+            }
+            for year in SEED_YEARS
+            for month in range(1, 13)
+            if not (year == 2030 and month > 6)
+        ])
+        expires_at = datetime.utcnow() + timedelta(days=7)
+        connection.execute(insert(RefreshToken), [
+            {
+                "token_hash": _hash_token(REFRESH_TOKEN if i == 1 else f"token-{i}"),
+                "family_id": f"family{i:06d}",
+                "user_id": i % SEED_USERS + 1,
+                "expires_at": expires_at,
+            }
+            for i in range(1, SEED_REFRESH_TOKENS + 1)
+        ])
+
+    # Refresh optimizer statistics after the bulk load
+    with engine.begin() as connection:
+        if engine.dialect.name == "mysql":
+            connection.exec_driver_sql("ANALYZE TABLE departments, users, ward1_monthly_reports, refresh_tokens")
+        elif engine.dialect.name == "sqlite":
+            connection.exec_driver_sql("ANALYZE")
+
+
+def scenarios() -> List[Tuple[str, Callable[[Session], object]]]:
+    """Every service method that reads from the database, with representative arguments"""
+    report = Ward1MonthlyReportCreate(year=2030, month=9, admissions_male=10)
+    new_user = UserCreate(
+        employee_id="NEW000001", name="New Staff", role="Nurse", department_id=3, password="secret123"
+    )
+    bulk_users = [
+        {"employee_id": f"BULK{i:05d}", "name": f"Bulk Staff {i}", "role": "Nurse",
+         "department_id": i + 10, "password": "secret123"}
+        for i in range(1, 6)
+    ] + [{"employee_id": "EMP000042", "name": "Existing", "role": "Nurse", "department_id": 3,
+          "password": "secret123"}]
+    batch_reports = [{"year": 2030, "month": month, "admissions_male": month} for month in range(5, 11)]
+    return [
+        ("DepartmentService.get_all_departments", lambda db: DepartmentService.get_all_departments(db)),
+        ("DepartmentService.get_department_by_id", lambda db: DepartmentService.get_department_by_id(db, 7)),
+        ("DepartmentService.get_department_by_name",
+         lambda db: DepartmentService.get_department_by_name(db, "department 0042")),
+        ("DepartmentService.search_departments", lambda db: DepartmentService.search_departments(db, "0042")),
+        ("DepartmentService.get_active_departments", lambda db: DepartmentService.get_active_departments(db)),
+        ("UserService.get_all_users", lambda db: UserService.get_all_users(db, skip=100, limit=50)),
+        ("UserService.get_user_by_id", lambda db: UserService.get_user_by_id(db, 42)),
+        ("UserService.get_user_by_employee_id", lambda db: UserService.get_user_by_employee_id(db, "EMP000042")),
+        ("UserService.search_users", lambda db: UserService.search_users(db, "Member 4", 20)),
+        ("UserService.get_users_by_department", lambda db: UserService.get_users_by_department(db, 7)),
+        ("UserService.get_users_by_role", lambda db: UserService.get_users_by_role(db, "Nurse")),
+        ("UserService.create_user", lambda db: UserService.create_user(db, new_user)),
+        ("UserService.bulk_create_users", lambda db: UserService.bulk_create_users(db, bulk_users)),
+        ("StartupService.create_default_admin_department",
+         lambda db: StartupService.create_default_admin_department(db)),
+        ("Ward1MonthlyReportService.get_report_by_year_month",
+         lambda db: Ward1MonthlyReportService.get_report_by_year_month(db, 2024, 5)),
+        ("Ward1MonthlyReportService.get_reports_by_year",
+         lambda db: Ward1MonthlyReportService.get_reports_by_year(db, 2024)),
+        ("Ward1MonthlyReportService.get_all_reports",
+         lambda db: Ward1MonthlyReportService.get_all_reports(db, limit=12, offset=24)),
+        ("Ward1MonthlyReportService.get_report_statistics",
+         lambda db: Ward1MonthlyReportService.get_report_statistics(db, 2024)),
+        ("Ward1MonthlyReportService.create_or_update_report",
+         lambda db: Ward1MonthlyReportService.create_or_update_report(db, report, user_id=1)),
+        ("Ward1MonthlyReportService.upsert_reports",
+         lambda db: Ward1MonthlyReportService.upsert_reports(db, batch_reports, user_id=1)),
+        ("Ward1MonthlyReportService.submit_report_for_approval",
+         lambda db: Ward1MonthlyReportService.submit_report_for_approval(
+             db, Ward1MonthlyReportSubmit(year=2030, month=9), user_id=1)),
+        ("Ward1MonthlyReportService.approve_report",
+         lambda db: Ward1MonthlyReportService.approve_report(db, 2030, 9, approver_user_id=1)),
+        ("RefreshTokenService.rotate_token", lambda db: RefreshTokenService.rotate_token(db, REFRESH_TOKEN)),
+        ("RefreshTokenService.revoke_token",
+         lambda db: RefreshTokenService.revoke_token(db, REFRESH_TOKEN, user_id=2)),
+    ]
+
+
+@contextmanager
+def capture_selects(engine, sink: List[Tuple[str, object]]):
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            sink.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def explain(engine, statement: str, parameters) -> Tuple[List[str], List[str]]:
+    """Return (plan lines, full-scan findings) for one statement"""
+    findings = []
+    lines = []
+    with engine.connect() as connection:
+        if engine.dialect.name == "sqlite":
+            rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            for row in rows:
+                detail = row[-1]
+                lines.append(detail)
+                match = re.match(r"SCAN (\w+)(.*)", detail)
+                if match and "USING" not in match.group(2):
+                    findings.append(f"full scan of {match.group(1)}")
+        else:
+            result = connection.exec_driver_sql(f"EXPLAIN {statement}", parameters)
+            columns = list(result.keys())
+            for row in result.fetchall():
+                info = dict(zip(columns, row))
+                lines.append(
+                    f"{info.get('table')}: type={info.get('type')} key={info.get('key')} "
+                    f"rows={info.get('rows')} extra={info.get('Extra')}"
+                )
+                if info.get("type") == "ALL":
+                    findings.append(f"full scan of {info.get('table')}")
+    return lines, findings
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", default="sqlite://", help="Throwaway database to build and check")
+    parser.add_argument("--verbose", action="store_true", help="Print every plan, not only failures")
+    args = parser.parse_args()
+
+    engine = build_engine(args.database_url)
+    upgrade_database("head", bind=engine)
+    seed(engine)
+
+    failures = 0
+    for name, run in scenarios():
+        statements: List[Tuple[str, object]] = []
+        with Session(bind=engine) as db, capture_selects(engine, statements):
+            run(db)
+
+        for statement, parameters in statements:
+            lines, findings = explain(engine, statement, parameters)
+            allowed = ALLOWED_FULL_SCANS.get(name)
+            status = "ok"
+            if findings and allowed:
+                status = f"allowed ({allowed})"
+            elif findings:
+                status = "FULL SCAN"
+                failures += 1
+
+            if args.verbose or status == "FULL SCAN":
+                print(f"[{status}] {name}")
+                print(f"    {' '.join(statement.split())[:160]}")
+                for line in lines:
+                    print(f"      {line}")
+            else:
+                print(f"[{status}] {name}")
+
+    print(f"\n{failures} unexpected full scan(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
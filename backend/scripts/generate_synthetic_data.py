@@ -0,0 +1,334 @@
+"""
+Synthetic data generator for scale testing
+
+Bulk-loads a throwaway database with plausible hospital data:
+
+- departments: specialty/unit names, about 90% Active
+- users: realistic role mix, skewed department sizes, a real bcrypt hash
+  per user (hashed in parallel worker processes; --distinct-hashes reuses
+  a smaller set when per-user salts don't matter)
+- monthly ward reports: seasonal admissions with a slow upward trend,
+  discharges, deaths and occupancy derived from them; past years approved,
+  the latest year a mix of approved, submitted and draft
+
+Output is deterministic for a given --seed, apart from bcrypt salts. Every
+generated account uses --password, so any employee ID can log in. Rows go in
+with batched executemany, so a million users load in minutes at
+--bcrypt-rounds 4 (production cost is 12; use it when login timing matters).
+
+Ward 1 is currently the only ward with a reports table, and its table
+rejects years before 2020, so reports run from 2020 for --years years.
+Register new ward models in WARD_REPORT_MODELS to generate them too.
+
+Usage (from the backend directory):
+    python scripts/generate_synthetic_data.py --database-url sqlite:///scale.db
+    python scripts/generate_synthetic_data.py --database-url mysql+pymysql://user:pw@localhost/hms_scale \\
+        --departments 5000 --users 1000000 --years 30 --bcrypt-rounds 4
+
+Never point --database-url at a real database.
+"""
+import argparse
+import math
+import os
+import random
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple, Type
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
+
+# Settings are read at import time; the generator only uses --database-url
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("DB_USER", "generator")
+os.environ.setdefault("DB_NAME", "generator")
+os.environ.setdefault("SECRET_KEY", "generator-secret-key")
+
+import bcrypt  # noqa: E402
+from sqlalchemy import create_engine, insert, select  # noqa: E402
+
+from app.database.migrations import upgrade_database  # noqa: E402
+from app.models.department import Department  # noqa: E402
+from app.models.user import User  # noqa: E402
+from app.models.ward1_monthly_report import Ward1MonthlyReport, ReportStatus  # noqa: E402
+
+FIRST_REPORT_YEAR = 2020  # check_valid_year on the report tables
+EMPLOYEE_ID_PREFIX = "SYN"  # keeps clear of ADMIN001 and hand-made accounts
+DEFAULT_PASSWORD = "password123"
+
+WARD_REPORT_MODELS: Dict[str, Type] = {
+    "ward1": Ward1MonthlyReport,
+}
+
+SPECIALTIES = [
+    "Cardiology", "Neurology", "Oncology", "Orthopaedics", "Paediatrics", "Obstetrics", "Gynaecology",
+    "Dermatology", "Nephrology", "Urology", "Gastroenterology", "Endocrinology", "Haematology",
+    "Pulmonology", "Rheumatology", "Ophthalmology", "ENT", "Psychiatry", "Radiology", "Pathology",
+    "Anaesthesia", "Emergency Medicine", "General Surgery", "Neurosurgery", "Cardiothoracic Surgery",
+    "Plastic Surgery", "Vascular Surgery", "Geriatrics", "Neonatology", "Infectious Diseases",
+    "Physiotherapy", "Pharmacy", "Laboratory", "Nutrition", "Dental", "Intensive Care",
+]
+UNIT_KINDS = ["Ward", "Clinic", "Unit", "Outpatients", "Theatre", "Day Care"]
+
+# Role -> relative headcount
+ROLE_MIX = {
+    "Nurse": 40,
+    "Doctor": 20,
+    "Receptionist": 12,
+    "Lab Technician": 10,
+    "Pharmacist": 8,
+    "Administrator": 2,
+}
+FIRST_NAMES = [
+    "Amal", "Kasun", "Nimali", "Dilini", "Ruwan", "Sahan", "Tharindu", "Ishara", "Chamari", "Nuwan",
+    "Priya", "Arjun", "Fathima", "Mohamed", "Sarah", "James", "Anjali", "Ravi", "Meera", "Sunil",
+    "Kavindi", "Lahiru", "Shanika", "Pradeep", "Hiruni", "Dinesh", "Maya", "Roshan", "Thilini", "Ashan",
+]
+LAST_NAMES = [
+    "Perera", "Fernando", "Silva", "Jayasinghe", "Wickramasinghe", "Bandara", "Dissanayake", "Gunawardena",
+    "Rathnayake", "Herath", "Kumara", "Rajapaksa", "Senanayake", "Abeysekera", "Weerasinghe", "Mendis",
+    "Karunaratne", "Ekanayake", "Samarasinghe", "Nanayakkara", "Hassan", "Iyer", "Nair", "Smith",
+]
+
+
+# === HASHING ===
+
+def _hash_passwords(task: Tuple[bytes, int, int]) -> List[str]:
+    """Worker: `count` independent bcrypt hashes of one password"""
+    password, rounds, count = task
+    return [bcrypt.hashpw(password, bcrypt.gensalt(rounds)).decode("utf-8") for _ in range(count)]
+
+
+def password_hashes(
+    pool: ProcessPoolExecutor, total: int, password: str, rounds: int, distinct: Optional[int] = None,
+    chunk: int = 200,
+) -> Iterator[str]:
+    """
+    Yield `total` hashes in order while the pool keeps hashing ahead of the caller
+
+    With `distinct`, only that many hashes are computed and then reused in
+    turn: login cost stays at `rounds` without paying it for every row.
+    """
+    distinct = min(distinct or total, total)
+    tasks = [(password.encode("utf-8"), rounds, min(chunk, distinct - start)) for start in range(0, distinct, chunk)]
+    computed = []
+    for hashes in pool.map(_hash_passwords, tasks):
+        computed.extend(hashes)
+        yield from hashes
+    for i in range(total - distinct):
+        yield computed[i % distinct]
+
+
+# === GENERATORS ===
+
+def batches(rows: Iterator[dict], size: int) -> Iterator[List[dict]]:
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) == size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def department_rows(rng: random.Random, count: int) -> Iterator[dict]:
+    combinations = len(SPECIALTIES) * len(UNIT_KINDS)
+    for i in range(count):
+        specialty = SPECIALTIES[i % len(SPECIALTIES)]
+        kind = UNIT_KINDS[(i // len(SPECIALTIES)) % len(UNIT_KINDS)]
+        series = i // combinations
+        name = f"{specialty} {kind}" + (f" {series + 1}" if series else "")
+        yield {"name": name, "status": "Active" if rng.random() < 0.9 else "Inactive"}
+
+
+def user_rows(
+    rng: random.Random, count: int, department_ids: Sequence[int], hashes: Iterator[str]
+) -> Iterator[dict]:
+    roles = list(ROLE_MIX)
+    role_weights = list(ROLE_MIX.values())
+    # Zipf-like department sizes: a few large departments, a long tail of small ones
+    department_weights = [1 / (rank + 1) ** 0.8 for rank in range(len(department_ids))]
+    cumulative = list(_accumulate(department_weights))
+    for i in range(1, count + 1):
+        yield {
+            "employee_id": f"{EMPLOYEE_ID_PREFIX}{i:07d}",
+            "name": f"{rng.choice(FIRST_NAMES)} {rng.choice(LAST_NAMES)}",
+            "password_hash": next(hashes),
+            "role": rng.choices(roles, role_weights)[0],
+            "department_id": rng.choices(department_ids, cum_weights=cumulative)[0],
+        }
+
+
+def _accumulate(values: Sequence[float]) -> Iterator[float]:
+    total = 0.0
+    for value in values:
+        total += value
+        yield total
+
+
+def report_rows(
+    rng: random.Random, years: int, author_ids: Sequence[int], skip: set
+) -> Iterator[dict]:
+    last_year = FIRST_REPORT_YEAR + years - 1
+    for year in range(FIRST_REPORT_YEAR, last_year + 1):
+        for month in range(1, 13):
+            if (year, month) in skip:
+                continue
+            yield _report_row(rng, year, month, last_year, author_ids)
+
+
+def _report_row(rng: random.Random, year: int, month: int, last_year: int, author_ids: Sequence[int]) -> dict:
+    total_beds = 30
+    # Winter peak, 2% yearly growth, day-to-day noise
+    seasonal = 1 + 0.15 * math.cos((month - 1) / 12 * 2 * math.pi)
+    trend = 1.02 ** (year - FIRST_REPORT_YEAR)
+    admissions = max(int(rng.gauss(90 * seasonal * trend, 8)), 0)
+    admissions_male = int(admissions * rng.uniform(0.45, 0.55))
+    discharges = max(int(admissions * rng.uniform(0.88, 1.0)), 0)
+    deaths = min(sum(rng.random() < 0.025 for _ in range(admissions)), discharges)
+    midnight_total = min(max(int(rng.gauss(total_beds * 0.82 * seasonal, 2)), 0), total_beds)
+    transfers = [rng.randint(0, 6) for _ in range(6)]
+
+    if year < last_year:
+        status = ReportStatus.approved
+    else:
+        status = rng.choices(
+            [ReportStatus.approved, ReportStatus.submitted, ReportStatus.draft], [5, 3, 2]
+        )[0]
+    author = rng.choice(author_ids) if author_ids else None
+
+    return {
+        "year": year,
+        "month": month,
+        "report_date": date(year, month, 1),
+        "total_beds": total_beds,
+        "total_beds_hdu": 2,
+        "total_beds_ward": 24,
+        "total_beds_isolation": 4,
+        "admissions_male": admissions_male,
+        "admissions_female": admissions - admissions_male,
+        "bed_occupancy_rate": Decimal(midnight_total * 100 / total_beds).quantize(Decimal("0.01")),
+        "avg_length_of_stay": Decimal(rng.uniform(2.5, 6.5)).quantize(Decimal("0.01")),
+        "midnight_total": midnight_total,
+        "discharges": discharges,
+        "lama": rng.randint(0, 3),
+        "re_admissions": rng.randint(0, 5),
+        "discharge_same_day": rng.randint(0, 8),
+        "transfer_to_other_hospitals": transfers[0],
+        "transfer_from_other_hospitals": transfers[1],
+        "weekday_transfers_in": transfers[2],
+        "weekday_transfers_out": transfers[3],
+        "weekend_transfers_in": transfers[4],
+        "weekend_transfers_out": transfers[5],
+        "number_of_death": deaths,
+        "death_within_24hrs": min(deaths, rng.randint(0, 1)),
+        "death_rate": Decimal(deaths * 100 / discharges if discharges else 0).quantize(Decimal("0.01")),
+        "xray_inward": rng.randint(10, 40),
+        "xray_departmental": rng.randint(5, 20),
+        "ecg_inward": rng.randint(10, 35),
+        "ecg_departmental": rng.randint(5, 15),
+        "abg": rng.randint(0, 20),
+        "status": status,
+        "created_by": author,
+        "last_updated_by": author,
+    }
+
+
+# === LOADING ===
+
+def generate(
+    engine,
+    departments: int,
+    users: int,
+    years: int,
+    seed: int = 42,
+    password: str = DEFAULT_PASSWORD,
+    bcrypt_rounds: int = 12,
+    distinct_hashes: Optional[int] = None,
+    workers: Optional[int] = None,
+    batch_size: int = 5000,
+    wards: Sequence[str] = tuple(WARD_REPORT_MODELS),
+    log=print,
+):
+    """Bulk-load departments, users and monthly reports into an already migrated database"""
+    rng = random.Random(seed)
+
+    started = time.perf_counter()
+    with engine.begin() as connection:
+        for batch in batches(department_rows(rng, departments), batch_size):
+            connection.execute(insert(Department), batch)
+        department_ids = connection.execute(select(Department.id).order_by(Department.id)).scalars().all()
+    log(f"departments: {departments} rows in {time.perf_counter() - started:.1f}s")
+
+    started = time.perf_counter()
+    loaded = 0
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        hashes = password_hashes(pool, users, password, bcrypt_rounds, distinct_hashes)
+        for batch in batches(user_rows(rng, users, department_ids, hashes), batch_size):
+            with engine.begin() as connection:
+                connection.execute(insert(User), batch)
+            loaded += len(batch)
+            rate = loaded / (time.perf_counter() - started)
+            log(f"users: {loaded}/{users} ({rate:.0f} rows/s)")
+
+    with engine.connect() as connection:
+        author_ids = connection.execute(
+            select(User.id).where(User.employee_id.like(f"{EMPLOYEE_ID_PREFIX}%"), User.role == "Nurse")
+            .order_by(User.id).limit(200)
+        ).scalars().all()
+
+    for ward in wards:
+        model = WARD_REPORT_MODELS[ward]
+        started = time.perf_counter()
+        with engine.begin() as connection:
+            existing = set(connection.execute(select(model.year, model.month)).all())
+            rows = list(report_rows(rng, years, author_ids, existing))
+            for batch in batches(iter(rows), batch_size):
+                connection.execute(insert(model), batch)
+        log(f"{ward} reports: {len(rows)} rows in {time.perf_counter() - started:.1f}s")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--database-url", required=True, help="Throwaway database to migrate and fill")
+    parser.add_argument("--departments", type=int, default=2000)
+    parser.add_argument("--users", type=int, default=200000)
+    parser.add_argument("--years", type=int, default=11, help=f"Years of reports from {FIRST_REPORT_YEAR}")
+    parser.add_argument("--wards", nargs="+", choices=list(WARD_REPORT_MODELS), default=list(WARD_REPORT_MODELS))
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--password", default=DEFAULT_PASSWORD, help="Password for every generated account")
+    parser.add_argument("--bcrypt-rounds", type=int, default=12, help="bcrypt cost (production uses 12)")
+    parser.add_argument("--distinct-hashes", type=int, help="Compute only this many hashes and reuse them")
+    parser.add_argument("--workers", type=int, help="Hashing processes (default: CPU count)")
+    parser.add_argument("--batch-size", type=int, default=5000, help="Rows per executemany")
+    args = parser.parse_args()
+
+    engine = create_engine(args.database_url)
+    try:
+        upgrade_database("head", bind=engine)
+        started = time.perf_counter()
+        generate(
+            engine,
+            departments=args.departments,
+            users=args.users,
+            years=args.years,
+            seed=args.seed,
+            password=args.password,
+            bcrypt_rounds=args.bcrypt_rounds,
+            distinct_hashes=args.distinct_hashes,
+            workers=args.workers,
+            batch_size=args.batch_size,
+            wards=args.wards,
+        )
+        print(f"Done in {time.perf_counter() - started:.1f}s")
+    finally:
+        engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,169 @@
+"""
+JWT signing key rotation
+
+Manages the RS256 key ring read by app/core/jwt_keys.py: one PEM private key
+per kid plus a keyring.json manifest naming the active key.
+
+Usage (from the backend directory):
+    python scripts/rotate_jwt_keys.py init jwt_keys          # first key, active
+    python scripts/rotate_jwt_keys.py rotate jwt_keys        # add a key and sign with it
+    python scripts/rotate_jwt_keys.py prune jwt_keys         # drop keys whose tokens have expired
+    python scripts/rotate_jwt_keys.py list jwt_keys
+
+With several nodes holding their own copy of the ring, split the rotation so
+every node can verify the new key before any node signs with it:
+    python scripts/rotate_jwt_keys.py add jwt_keys           # publish; copy the ring to all nodes
+    python scripts/rotate_jwt_keys.py activate jwt_keys KID  # then switch signing; copy again
+
+Retired keys keep verifying until prune removes them, which it does only once
+ACCESS_TOKEN_EXPIRE_MINUTES (plus --grace-minutes) have passed since they
+stopped signing. Running workers pick up changes within
+JWT_KEYS_RELOAD_SECONDS; no restart is needed.
+"""
+import argparse
+import json
+import os
+import secrets
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Dict
+
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+
+MANIFEST_NAME = "keyring.json"  # Must match app/core/jwt_keys.py
+KEY_SIZE = 2048
+DEFAULT_ACCESS_TOKEN_MINUTES = 15
+
+
+def load_manifest(directory: Path) -> Dict[str, Any]:
+    path = directory / MANIFEST_NAME
+    if not path.exists():
+        return {"active": None, "keys": []}
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def save_manifest(directory: Path, manifest: Dict[str, Any]):
+    # Write then rename, so workers never read a half-written manifest
+    path = directory / MANIFEST_NAME
+    temp = directory / f".{MANIFEST_NAME}.tmp"
+    temp.write_text(json.dumps(manifest, indent=2) + "\n", encoding="utf-8")
+    os.replace(temp, path)
+
+
+def now() -> str:
+    return datetime.utcnow().replace(microsecond=0).isoformat()
+
+
+def add_key(directory: Path, manifest: Dict[str, Any]) -> str:
+    """Generate a key and add it to the ring (verifying, not yet signing)"""
+    kid = f"{datetime.utcnow():%Y%m%d}-{secrets.token_hex(4)}"
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=KEY_SIZE)
+    pem = private_key.private_bytes(
+        encoding=serialization.Encoding.PEM,
+        format=serialization.PrivateFormat.PKCS8,
+        encryption_algorithm=serialization.NoEncryption(),
+    )
+    key_path = directory / f"{kid}.pem"
+    fd = os.open(key_path, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    with os.fdopen(fd, "wb") as f:
+        f.write(pem)
+    manifest["keys"].append({"kid": kid, "created": now(), "retired": None})
+    return kid
+
+
+def activate_key(manifest: Dict[str, Any], kid: str):
+    """Sign with kid from now on; the previous active key is retired"""
+    entries = {entry["kid"]: entry for entry in manifest["keys"]}
+    if kid not in entries:
+        raise SystemExit(f"Unknown kid {kid!r}")
+    previous = manifest.get("active")
+    if previous == kid:
+        return
+    if previous in entries:
+        entries[previous]["retired"] = now()
+    entries[kid]["retired"] = None
+    manifest["active"] = kid
+
+
+def prune_keys(directory: Path, manifest: Dict[str, Any], retention: timedelta) -> list:
+    """Remove retired keys whose last tokens have expired"""
+    cutoff = datetime.utcnow() - retention
+    kept, removed = [], []
+    for entry in manifest["keys"]:
+        retired = entry.get("retired")
+        if entry["kid"] != manifest.get("active") and retired and datetime.fromisoformat(retired) <= cutoff:
+            removed.append(entry["kid"])
+        else:
+            kept.append(entry)
+    manifest["keys"] = kept
+    return removed
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Manage the JWT signing key ring")
+    parser.add_argument("command", choices=["init", "add", "activate", "rotate", "prune", "list"])
+    parser.add_argument("directory", type=Path, help="Key ring directory (JWT_KEYS_DIR)")
+    parser.add_argument("kid", nargs="?", help="Key to activate (activate only)")
+    parser.add_argument(
+        "--access-token-minutes", type=int,
+        default=int(os.environ.get("ACCESS_TOKEN_EXPIRE_MINUTES", DEFAULT_ACCESS_TOKEN_MINUTES)),
+        help="Access token lifetime (default: ACCESS_TOKEN_EXPIRE_MINUTES)",
+    )
+    parser.add_argument("--grace-minutes", type=int, default=5, help="Extra time before pruning (clock skew)")
+    args = parser.parse_args()
+
+    directory: Path = args.directory
+    manifest = load_manifest(directory)
+
+    if args.command == "init":
+        if manifest["keys"]:
+            raise SystemExit(f"{directory} already holds a key ring")
+        directory.mkdir(mode=0o700, parents=True, exist_ok=True)
+        kid = add_key(directory, manifest)
+        activate_key(manifest, kid)
+        save_manifest(directory, manifest)
+        print(f"Created key ring in {directory}, active kid {kid}")
+
+    elif args.command == "add":
+        kid = add_key(directory, manifest)
+        save_manifest(directory, manifest)
+        print(f"Added kid {kid} (verifying only; activate it once every node has it)")
+
+    elif args.command == "activate":
+        if not args.kid:
+            raise SystemExit("activate needs a kid")
+        activate_key(manifest, args.kid)
+        save_manifest(directory, manifest)
+        print(f"Active kid is now {args.kid}")
+
+    elif args.command == "rotate":
+        if not manifest["keys"]:
+            raise SystemExit(f"No key ring in {directory}; run init first")
+        kid = add_key(directory, manifest)
+        activate_key(manifest, kid)
+        save_manifest(directory, manifest)
+        print(f"Rotated: active kid is now {kid}")
+
+    elif args.command == "prune":
+        retention = timedelta(minutes=args.access_token_minutes + args.grace_minutes)
+        removed = prune_keys(directory, manifest, retention)
+        # Update the manifest before deleting keys it no longer names
+        save_manifest(directory, manifest)
+        for kid in removed:
+            (directory / f"{kid}.pem").unlink(missing_ok=True)
+        print(f"Pruned {len(removed)} keys: {', '.join(removed) or '-'}")
+
+    else:
+        for entry in manifest["keys"]:
+            state = "active" if entry["kid"] == manifest.get("active") else (
+                f"retired {entry['retired']}" if entry.get("retired") else "published"
+            )
+            print(f"{entry['kid']}  created {entry['created']}  {state}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+"""
+Production entry point for the Hospital Management System API
+
+Runs gunicorn with uvicorn workers, configured by gunicorn.conf.py from the
+SERVER_* settings. `python main.py` stays the single-process development
+server.
+
+Gunicorn does not run on Windows; there this falls back to uvicorn's own
+multi-process mode, which has no preloading or graceful reloads.
+
+Usage (from the backend directory):
+    python serve.py
+    python serve.py --check-config   # print the resolved gunicorn settings
+"""
+import os
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIG_FILE = os.path.join(BACKEND_DIR, "gunicorn.conf.py")
+
+
+def run_gunicorn(extra_args) -> int:
+    from gunicorn.app.wsgiapp import run
+
+    sys.argv = ["gunicorn", "--config", CONFIG_FILE, *extra_args, "main:app"]
+    return run()
+
+
+def run_uvicorn() -> int:
+    import uvicorn
+
+    from app.core.config import settings
+
+    workers = settings.server_workers or os.cpu_count() or 1
+    uvicorn.run(
+        "main:app",
+        host=settings.server_host,
+        port=settings.server_port,
+        workers=workers,
+        backlog=settings.server_backlog,
+        timeout_keep_alive=settings.server_keepalive,
+        timeout_graceful_shutdown=settings.server_graceful_timeout,
+        limit_max_requests=settings.server_max_requests or None,
+        forwarded_allow_ips=settings.server_forwarded_allow_ips,
+        log_level="info",
+    )
+    return 0
+
+
+def main() -> int:
+    os.chdir(BACKEND_DIR)
+    sys.path.insert(0, BACKEND_DIR)
+    if sys.platform == "win32":
+        return run_uvicorn()
+    return run_gunicorn(sys.argv[1:])
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,15 +1,55 @@
 import React, { createContext, useState, useEffect, useCallback, useRef } from 'react';
 import apiClient from '../services/apiClient';
+import authApi from '../services/authApi';
 
 const AuthContext = createContext();
 
+// Access tokens are refreshed this long before they expire
+const REFRESH_MARGIN_MS = 30000;
+
+// Milliseconds until a token expires (-Infinity if it cannot be read)
+const msUntilExpiry = (token) => {
+  try {
+    const payload = JSON.parse(atob(token.split('.')[1]));
+    return payload.exp * 1000 - Date.now();
+  } catch {
+    return -Infinity;
+  }
+};
+
+// Refresh tokens are single use, and every tab shares them through
+// localStorage; presenting one another tab already used ends the session
+// everywhere. So tabs refresh one at a time (Web Locks where available), and
+// a tab that finds a fresh access token stored by another adopts it instead
+// of refreshing again.
+const refreshSession = () => {
+  const run = async () => {
+    const storedToken = localStorage.getItem('access_token');
+    if (storedToken && msUntilExpiry(storedToken) > 2 * REFRESH_MARGIN_MS) {
+      return storedToken;
+    }
+
+    const storedRefreshToken = localStorage.getItem('refresh_token');
+    if (!storedRefreshToken) {
+      throw new Error('No refresh token');
+    }
+    const response = await authApi.refreshToken(storedRefreshToken);
+    // The old refresh token is used up; keep the new one
+    localStorage.setItem('access_token', response.access_token);
+    localStorage.setItem('refresh_token', response.refresh_token);
+    return response.access_token;
+  };
+
+  return navigator.locks ? navigator.locks.request('auth-token-refresh', run) : run();
+};
+
 function AuthProvider({ children }) {
   const [user, setUser] = useState(null);
   const [isAuthenticated, setIsAuthenticated] = useState(false);
   const [token, setToken] = useState(null);
   const [loading, setLoading] = useState(true);
   
-  // Auto-logout timer ref
+  // Token refresh / auto-logout timer ref
   const logoutTimerRef = useRef(null);
 
   // Check if token is valid (not expired)
@@ -26,6 +66,7 @@ function AuthProvider({ children }) {
   // Clear authentication data
   const clearAuthData = useCallback(() => {
     localStorage.removeItem('access_token');
+    localStorage.removeItem('refresh_token');
     localStorage.removeItem('user');
     setToken(null);
     setUser(null);
@@ -38,43 +79,48 @@ function AuthProvider({ children }) {
     }
   }, []);
 
-  // Set up automatic logout timer based on token expiration
+  // Set up a timer to refresh the token before it expires (logout if the session has ended)
   const setupAutoLogout = useCallback((token) => {
-    // Clear existing timer
-    if (logoutTimerRef.current) {
-      clearTimeout(logoutTimerRef.current);
-    }
+    const schedule = (currentToken) => {
+      // Clear existing timer
+      if (logoutTimerRef.current) {
+        clearTimeout(logoutTimerRef.current);
+      }
 
-    if (!token) return;
+      if (!currentToken) return;
 
-    try {
-      const payload = JSON.parse(atob(token.split('.')[1]));
-      const expirationTime = payload.exp * 1000; // Convert to milliseconds
-      const currentTime = Date.now();
-      const timeUntilExpiration = expirationTime - currentTime;
-
-      // Set timer to logout 30 seconds before expiration
-      const logoutTime = Math.max(timeUntilExpiration - 30000, 0);
-
-      if (logoutTime > 0) {
-        logoutTimerRef.current = setTimeout(() => {
-          console.log('Token expired - automatic logout');
-          clearAuthData();
-        }, logoutTime);
-      } else {
-        // Token already expired
+      const timeUntilExpiration = msUntilExpiry(currentToken);
+      if (timeUntilExpiration === -Infinity) {
+        console.error('Error setting up token refresh: unreadable token');
+        return;
+      }
+
+      // Set timer to refresh 30 seconds before expiration
+      const refreshTime = Math.max(timeUntilExpiration - REFRESH_MARGIN_MS, 0);
+      logoutTimerRef.current = setTimeout(refresh, refreshTime);
+    };
+
+    const refresh = async () => {
+      logoutTimerRef.current = null;
+      try {
+        const accessToken = await refreshSession();
+        setToken(accessToken);
+        schedule(accessToken);
+      } catch (error) {
+        console.log('Session ended - automatic logout');
         clearAuthData();
       }
-    } catch (error) {
-      console.error('Error setting up auto-logout:', error);
-    }
+    };
+
+    schedule(token);
   }, [clearAuthData]);
 
   // Initialize auth state from localStorage on mount
   useEffect(() => {
-    const initializeAuth = () => {
+    const initializeAuth = async () => {
       try {
         const storedToken = localStorage.getItem('access_token');
+        const storedRefreshToken = localStorage.getItem('refresh_token');
         const storedUser = localStorage.getItem('user');
         
         if (storedToken && storedUser) {
@@ -86,8 +132,15 @@ function AuthProvider({ children }) {
             setUser(parsedUser);
             setIsAuthenticated(true);
             
-            // Setup automatic logout timer for existing session
+            // Setup automatic refresh timer for existing session
             setupAutoLogout(storedToken);
+          } else if (storedRefreshToken) {
+            // Access token expired while away; resume the session if it is still live
+            const accessToken = await refreshSession();
+            setToken(accessToken);
+            setUser(parsedUser);
+            setIsAuthenticated(true);
+            setupAutoLogout(accessToken);
           } else {
             // Token expired, clear storage
             clearAuthData();
@@ -105,7 +158,7 @@ function AuthProvider({ children }) {
   }, [clearAuthData, setupAutoLogout]);
 
   // Login function
-  const login = (userData, accessToken) => {
+  const login = (userData, accessToken, refreshToken) => {
     try {
       setUser(userData);
       setToken(accessToken);
@@ -114,8 +167,11 @@ function AuthProvider({ children }) {
       // Store in localStorage
       localStorage.setItem('access_token', accessToken);
       localStorage.setItem('user', JSON.stringify(userData));
+      if (refreshToken) {
+        localStorage.setItem('refresh_token', refreshToken);
+      }
       
-      // Setup automatic logout timer
+      // Setup automatic refresh timer
       setupAutoLogout(accessToken);
     } catch (error) {
       console.error('Error during login:', error);
@@ -125,7 +181,14 @@ function AuthProvider({ children }) {
   // Logout function
   const logout = useCallback(() => {
     console.log('User logged out');
+    const storedToken = localStorage.getItem('access_token');
+    const storedRefreshToken = localStorage.getItem('refresh_token');
     clearAuthData();
+
+    // End the session on the server too (best effort; local state is already cleared)
+    if (storedToken && storedRefreshToken) {
+      authApi.logout(storedRefreshToken, storedToken);
+    }
   }, [clearAuthData]);
 
   // Register logout callback with apiClient
@@ -133,6 +196,24 @@ function AuthProvider({ children }) {
     apiClient.setLogoutCallback(logout);
   }, [logout]);
 
+  // Follow other tabs: adopt the tokens they refresh, and log out with them
+  useEffect(() => {
+    const handleStorage = (event) => {
+      if (!isAuthenticated || (event.key !== 'access_token' && event.key !== null)) return;
+
+      const storedToken = localStorage.getItem('access_token');
+      if (storedToken) {
+        setToken(storedToken);
+        setupAutoLogout(storedToken);
+      } else {
+        clearAuthData();
+      }
+    };
+
+    window.addEventListener('storage', handleStorage);
+    return () => window.removeEventListener('storage', handleStorage);
+  }, [isAuthenticated, setupAutoLogout, clearAuthData]);
+
   // Clean up timer on unmount
   useEffect(() => {
     return () => {
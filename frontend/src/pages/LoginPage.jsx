@@ -102,8 +102,8 @@ export default function LoginPage() {
         setSuccessMessage(`Welcome ${response.user.name}!`);
         success('Login successful!');
         
-        // Login user with JWT token
-        login(response.user, response.access_token);
+        // Login user with JWT access token and refresh token
+        login(response.user, response.access_token, response.refresh_token);
         
         // Navigate to appropriate dashboard based on role
         const dashboardRoute = authApi.getDepartmentDashboard(response.user);
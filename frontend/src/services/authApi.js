@@ -25,11 +25,15 @@ const authApi = {
 
   /**
    * Logout current user
+   * @param {string} [refreshToken] - Refresh token of this session, revoked as well
+   * @param {string} [accessToken] - Token to log out, if no longer in storage
    * @returns {Promise} Logout response
    */
-  async logout() {
+  async logout(refreshToken, accessToken) {
     try {
-      const response = await apiClient.post('/auth/logout');
+      const response = await apiClient.post('/auth/logout', {
+        refresh_token: refreshToken || null
+      }, accessToken ? { headers: { Authorization: `Bearer ${accessToken}` } } : undefined);
       return response.data;
     } catch (error) {
       console.error('Logout error:', error);
@@ -39,14 +43,16 @@ const authApi = {
   },
 
   /**
-   * Refresh access token
-   * @param {string} token - Current access token
-   * @returns {Promise} Refresh response with new token
+   * Exchange a refresh token for a new access token
+   * Refresh tokens are single use: store the refresh_token from the response,
+   * as reusing the old one ends the session
+   * @param {string} refreshToken - Refresh token from login or the previous refresh
+   * @returns {Promise} Refresh response with new access and refresh tokens
    */
-  async refreshToken(token) {
+  async refreshToken(refreshToken) {
     try {
       const response = await apiClient.post('/auth/refresh', {
-        token: token
+        refresh_token: refreshToken
       });
       return response.data;
     } catch (error) {
@@ -85,6 +91,12 @@ const authApi = {
           return new Error(data?.detail || 'Access denied. Insufficient permissions');
         case 422:
           return new Error('Invalid input data. Please check your credentials');
+        case 429: {
+          const retryAfter = Number(error.response.headers?.['retry-after']);
+          return new Error(retryAfter
+            ? `Too many login attempts. Please try again in ${retryAfter} seconds`
+            : 'Too many login attempts. Please try again later');
+        }
         case 500:
           return new Error('Server error. Please try again later');
         default:
@@ -17,6 +17,23 @@ class Ward1ReportsApi {
     }
   }
 
+  /**
+   * Create or update several monthly reports in one request
+   *
+   * Takes a list of reports in API format (see transformToApiFormat) and
+   * resolves to { success, saved, failed, results } with one result per
+   * month: { index, year, month, success, action, error }.
+   */
+  static async saveMonthlyReportsBatch(reports) {
+    try {
+      const response = await apiClient.post('/ward1/monthly-reports/batch', { reports });
+      return response.data;
+    } catch (error) {
+      console.error('Error saving Ward 1 monthly reports batch:', error);
+      throw error;
+    }
+  }
+
   /**
    * Get monthly report for specific year and month
    */